@@ -0,0 +1,312 @@
+# batch.py
+# Wsadowe przetwarzanie zamówień STOLARZPRO (CLI, pula procesów)
+#
+#   python batch.py zamowienia/            -> wszystkie *.json z katalogu
+#   python batch.py tydzien.jsonl --pdf    -> jeden projekt w każdej linii
+#   cat tydzien.jsonl | python batch.py -  -> JSONL ze stdin
+#   python batch.py tydzien.jsonl --cnc csv,gcode,wsad  -> też pliki dla CNC (wyniki/cnc)
+#   (plik z kluczem 'szafki' to zlecenie wielu szafek – jedna wspólna lista, patrz zlecenie.py)
+#   python batch.py tydzien.jsonl --pomiary czasy.json  -> czasy etapów (.prom: format Prometheus)
+#   python batch.py tydzien.jsonl --kosztorys  -> ilości i koszt każdego projektu (kosztorys.csv, patrz kosztorys.py)
+#   python batch.py tydzien.jsonl --kosztorys --magazyn resztki.sqlite  -> rozkrój najpierw z resztek (patrz magazyn.py)
+#   python batch.py miesiac.jsonl --zapotrzebowanie  -> płyta, arkusze, okleina i okucia całego wsadu (zapotrzebowanie.csv)
+#   python batch.py tydzien.jsonl --kontrola   -> kolizje otworów, otwory przy krawędzi, okucia (kolizje.csv, patrz kolizje.py)
+#   PDF-y zapisywane są też w cache.dysk (STOLARZPRO_CACHE, domyślnie ~/.cache/stolarzpro) – powtórzony projekt to kopia pliku
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from cache import dysk
+from export_cnc import FORMATY as FORMATY_CNC, EksporterCNC, fragmenty_zbiorcze
+from generator import generuj_instrukcje_tekst, normalizuj_projekt, okucia, run_generator, run_generator_wsadowo
+from kolizje import KOLUMNY as KOLUMNY_KONTROLI
+from kosztorys import ILOSCI, ilosci, wektor_cen
+import pomiary
+from pomiary import etap
+from zapotrzebowanie import KOLUMNY_CSV as KOLUMNY_ZAPOTRZEBOWANIA, Zapotrzebowanie, zapotrzebowanie_listy
+from zlecenie import instrukcja_zlecenia, jest_zleceniem, lista_zlecenia, normalizuj_zlecenie, okucia_zlecenia, rozkroj_zlecenia
+
+
+KOLUMNY_PODSUMOWANIA = ["nr", "zrodlo", "projekt", "elementy", "plyta_korpus_m2", "csv", "pdf", "blad"]
+KOLUMNY_KOSZTORYSU = ["nr", "projekt", *ILOSCI, "koszt"]
+KOLUMNY_KOLIZJI = ["nr", "projekt", *KOLUMNY_KONTROLI]
+
+# Zadań w jednej paczce dla procesu roboczego – wiercenia paczki liczone jednym przebiegiem
+PACZKA = 16
+
+
+# ======================================================
+# WEJŚCIE (STRUMIENIOWO)
+# ======================================================
+
+def czytaj_zadania(wejscie):
+    """
+    Generator zadań (nr, źródło, tekst JSON). Pliki czytane są dopiero
+    w chwili pobrania zadania, więc pamięć nie rośnie z liczbą projektów.
+    """
+    if wejscie == "-":
+        yield from _czytaj_jsonl(sys.stdin, "<stdin>")
+    elif os.path.isdir(wejscie):
+        nr = 0
+        for wpis in sorted(os.scandir(wejscie), key=lambda e: e.name):
+            if wpis.is_file() and wpis.name.lower().endswith(".json"):
+                with open(wpis.path, encoding="utf-8") as f:
+                    yield nr, wpis.name, f.read()
+                nr += 1
+    else:
+        with open(wejscie, encoding="utf-8") as f:
+            yield from _czytaj_jsonl(f, os.path.basename(wejscie))
+
+
+def _czytaj_jsonl(strumien, nazwa):
+    nr = 0
+    for nr_linii, linia in enumerate(strumien, 1):
+        if linia.strip():
+            yield nr, f"{nazwa}:{nr_linii}", linia
+            nr += 1
+
+
+# ======================================================
+# PRACA W PROCESIE ROBOCZYM
+# ======================================================
+
+def _bezpieczna_nazwa(tekst):
+    return re.sub(r"[^\w\-]+", "_", tekst).strip("_") or "PROJEKT"
+
+
+def przetworz_projekt(zadanie, katalog_wyj, z_pdf, cnc=(), kosztorys=False, kontrola=False, magazyn=None, zapotrzebowanie=False,
+                      _gotowy=None):
+    """
+    Generuje listę elementów jednego projektu i zapisuje CSV (i PDF, i pliki CNC).
+    Teksty formatów zbiorczych CNC wracają w wierszu ('_cnc') do procesu głównego,
+    ilości i koszt – w '_kosztorys', zapotrzebowanie materiałowe – w '_zapotrzebowanie',
+    a przy włączonych pomiarach także czasy etapów projektu ('_pomiary').
+    magazyn – plik magazynu resztek dla rozkroju kosztorysu.
+    _gotowy – (projekt, lista, czas [s]) wygenerowane już w paczce (przetworz_paczke).
+    """
+    nr, zrodlo, tekst = zadanie
+    wiersz = dict.fromkeys(KOLUMNY_PODSUMOWANIA, "")
+    wiersz.update(nr=nr, zrodlo=zrodlo)
+    przebieg = pomiary.nowy_przebieg() if pomiary.wlaczone() else None
+    t = time.perf_counter() - (_gotowy[2] if _gotowy else 0.0)
+    try:
+        if _gotowy:
+            projekt, lista, _ = _gotowy; zl = None
+        else:
+            with etap("batch.wczytanie"): dane = json.loads(tekst)
+            zl = normalizuj_zlecenie(dane) if jest_zleceniem(dane) else None
+            if zl is None: projekt = normalizuj_projekt(dane); lista = run_generator(projekt)
+        if zl is not None:
+            projekt = {'kod_pro': zl['kod_zlecenia']}
+            lista = lista_zlecenia(zl); instrukcja = lambda: instrukcja_zlecenia(zl)
+            ceny = zl['ceny']; okucia_szt = lambda: okucia_zlecenia(zl)
+        else:
+            instrukcja = lambda: generuj_instrukcje_tekst(projekt)
+            ceny = projekt['ceny']; okucia_szt = lambda: okucia(projekt)
+        baza = os.path.join(katalog_wyj, f"{nr:05d}_{_bezpieczna_nazwa(projekt['kod_pro'])}")
+
+        with etap("batch.csv"), open(baza + ".csv", "w", newline="", encoding="utf-8-sig") as f:
+            lista.do_csv(f)
+        wiersz["csv"] = baza + ".csv"
+
+        if z_pdf:
+            from wektor import klucz_pdf, zbuduj_pdf
+            # Powtórzone zamówienie – plik z cache.dysk (wspólny katalog procesów roboczych)
+            tekst_instr = instrukcja()
+            if dysk.do_pliku(klucz_pdf(lista, tekst_instr), lambda f: zbuduj_pdf(lista, tekst_instr, f), baza + ".pdf"): pomiary.licznik("pdf.z_dysku")
+            wiersz["pdf"] = baza + ".pdf"
+
+        if cnc:
+            nazwa = os.path.basename(baza)
+            with EksporterCNC(os.path.join(katalog_wyj, "cnc"), [f for f in cnc if not FORMATY_CNC[f].zbiorczy]) as eks:
+                eks.projekt(nazwa, lista)
+            wiersz["_cnc"] = fragmenty_zbiorcze(nazwa, lista, cnc)
+
+        rozkroje = None
+        if kosztorys:
+            with etap("batch.kosztorys"):
+                if magazyn:
+                    from magazyn import MagazynResztek
+                    with MagazynResztek(magazyn) as mag: rozkroje = rozkroj_zlecenia(lista, magazyn=mag, zrodlo=projekt['kod_pro'])
+                else:
+                    rozkroje = rozkroj_zlecenia(lista)
+                q = ilosci(lista, rozkroje, okucia_szt())
+            wiersz["_kosztorys"] = {"nr": nr, "projekt": projekt['kod_pro'], **dict(zip(ILOSCI, q.round(3).tolist())),
+                                    "koszt": round(float(q @ wektor_cen(ceny)), 2)}
+
+        if zapotrzebowanie:
+            # Rozkrój z kosztorysu (także z resztkami), jeśli był liczony
+            with etap("batch.zapotrzebowanie"): wiersz["_zapotrzebowanie"] = zapotrzebowanie_listy(lista, okucia_szt(), rozkroje)
+
+        if kontrola:
+            from kolizje import sprawdz, tabela
+            wiersz["_kolizje"] = [{"nr": nr, "projekt": projekt['kod_pro'], **k} for k in tabela([lista], sprawdz(lista))]
+
+        wiersz.update(
+            projekt=projekt['kod_pro'],
+            elementy=len(lista),
+            plyta_korpus_m2=round(lista.pole_m2('KORPUS'), 3),
+        )
+    except Exception as e:
+        wiersz["blad"] = f"{type(e).__name__}: {e}"
+    if przebieg is not None:
+        pomiary.zapisz_czas("batch.projekt", time.perf_counter() - t)
+        wiersz["_pomiary"] = przebieg.stan()
+    return wiersz
+
+
+def przetworz_paczke(zadania, katalog_wyj, z_pdf, cnc=(), kosztorys=False, kontrola=False, magazyn=None, zapotrzebowanie=False):
+    """
+    przetworz_projekt dla paczki zadań; zwraca listę wierszy. Listy zwykłych
+    projektów paczki generowane są razem (run_generator_wsadowo), jak części
+    zlecenia w zlecenie.generuj_szafki. Czas wczytania i generowania dzielony
+    jest po równo na projekty paczki; jego etapy trafiają do pomiarów pierwszego
+    wiersza. Zlecenia i zadania, których nie da się wczytać, przetwarzane są
+    osobno – błąd trafia do ich wiersza; tak samo cała paczka, gdy
+    run_generator_wsadowo zgłosi błąd.
+    """
+    przebieg = pomiary.nowy_przebieg() if pomiary.wlaczone() else None
+    t = time.perf_counter(); projekty = {}
+    for nr, _, tekst in zadania:
+        try:
+            with etap("batch.wczytanie"): dane = json.loads(tekst)
+            if not jest_zleceniem(dane): projekty[nr] = normalizuj_projekt(dane)
+        except Exception:
+            pass
+    try: listy = dict(zip(projekty, run_generator_wsadowo(list(projekty.values()))))
+    except Exception: listy = {}
+    czas = (time.perf_counter() - t) / len(zadania)
+    stan = przebieg.stan() if przebieg is not None else None
+
+    opcje = (katalog_wyj, z_pdf, cnc, kosztorys, kontrola, magazyn, zapotrzebowanie)
+    wiersze = [przetworz_projekt(z, *opcje, _gotowy=(projekty[z[0]], listy[z[0]], czas) if z[0] in listy else None) for z in zadania]
+    if stan is not None:
+        razem = pomiary.Rejestr(); razem.dolacz(wiersze[0]["_pomiary"]); razem.dolacz(stan)
+        wiersze[0]["_pomiary"] = razem.stan()
+    return wiersze
+
+
+# ======================================================
+# PULA PROCESÓW
+# ======================================================
+
+def przetworz_wsadowo(zadania, katalog_wyj, z_pdf=False, procesy=None, na_wynik=None, cnc=(), kosztorys=False, kontrola=False, magazyn=None,
+                      zapotrzebowanie=False):
+    """
+    Rozdziela zadania na pulę procesów w paczkach po PACZKA (przetworz_paczke).
+    Gdy któryś proces nie ma pracy, paczka wysyłana jest od razu, niepełna –
+    mały wsad też zajmuje wszystkie procesy. W locie są najwyżej dwie paczki
+    na proces, więc wejście jest czytane w tempie przetwarzania.
+    Wyniki (wiersze podsumowania) przekazywane są do `na_wynik` w kolejności ukończenia.
+    """
+    procesy = procesy or os.cpu_count() or 1
+    na_wynik = na_wynik or (lambda wiersz: None)
+    limit = procesy * 2
+    with ProcessPoolExecutor(max_workers=procesy) as pool:
+        w_locie = set(); paczka = []
+        for zadanie in zadania:
+            paczka.append(zadanie)
+            if len(paczka) < PACZKA and len(w_locie) >= procesy: continue
+            w_locie.add(pool.submit(przetworz_paczke, paczka, katalog_wyj, z_pdf, cnc, kosztorys, kontrola, magazyn, zapotrzebowanie))
+            paczka = []
+            # Odbiór ukończonych bez czekania; przy pełnej kolejce – czekanie na pierwszą
+            gotowe, w_locie = wait(w_locie, timeout=None if len(w_locie) >= limit else 0, return_when=FIRST_COMPLETED)
+            for fut in gotowe:
+                for wiersz in fut.result(): na_wynik(wiersz)
+        if paczka: w_locie.add(pool.submit(przetworz_paczke, paczka, katalog_wyj, z_pdf, cnc, kosztorys, kontrola, magazyn, zapotrzebowanie))
+        for fut in wait(w_locie).done:
+            for wiersz in fut.result(): na_wynik(wiersz)
+
+
+def _zapisz_pomiary(plik, stan, czasy_projektow):
+    """Suma etapów wsadu; w JSON także czasy każdego projektu, od najwolniejszego."""
+    if plik.endswith(".prom"):
+        tekst = pomiary.do_prometheus(stan)
+    else:
+        tekst = pomiary.do_json(stan, projekty=sorted(czasy_projektow, key=lambda p: -p["czas_s"]))
+    with open(plik, "w", encoding="utf-8") as f: f.write(tekst)
+    print(f"Pomiary: {plik}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STOLARZPRO – wsadowe generowanie list elementów")
+    parser.add_argument("wejscie", help="katalog z plikami .json, plik .jsonl lub '-' (stdin)")
+    parser.add_argument("-o", "--wyjscie", default="wyniki", help="katalog wyjściowy (domyślnie: wyniki)")
+    parser.add_argument("--pdf", action="store_true", help="generuj też dokumentację PDF")
+    parser.add_argument("--cnc", default="", help=f"formaty CNC po przecinku: {', '.join(FORMATY_CNC)}")
+    parser.add_argument("--kosztorys", action="store_true", help="zapisz ilości (płyta z rozkroju, okleina, okucia) i koszt projektów do kosztorys.csv")
+    parser.add_argument("--magazyn", default=None, help="plik SQLite magazynu resztek (magazyn.py): rozkrój kosztorysu najpierw z resztek, odpady wracają do magazynu")
+    parser.add_argument("--zapotrzebowanie", action="store_true", help="zapotrzebowanie całego wsadu (płyta m2, arkusze, okleina, okucia) do zapotrzebowanie.csv")
+    parser.add_argument("--kontrola", action="store_true", help="kontrola wierceń (kolizje otworów, krawędzie, okucia) do kolizje.csv")
+    parser.add_argument("-j", "--procesy", type=int, default=None, help="liczba procesów (domyślnie: wszystkie rdzenie)")
+    parser.add_argument("--pomiary", default=None, help="plik z czasami etapów: .json albo .prom (Prometheus); "
+                        f"domyślnie <wyjscie>/pomiary.json, gdy {pomiary.ZMIENNA}=1")
+    args = parser.parse_args(argv)
+    cnc = tuple(f for f in args.cnc.split(",") if f)
+    if any(f not in FORMATY_CNC for f in cnc): parser.error(f"nieznany format CNC (dostępne: {', '.join(FORMATY_CNC)})")
+    if args.magazyn and not args.kosztorys: parser.error("--magazyn wymaga --kosztorys")
+
+    os.makedirs(args.wyjscie, exist_ok=True)
+    if args.pomiary or pomiary.wlaczone():
+        pomiary.wlacz()   # przed startem puli – procesy robocze dziedziczą zmienną
+        args.pomiary = args.pomiary or os.path.join(args.wyjscie, "pomiary.json")
+    czasy = pomiary.Rejestr(); czasy_projektow = []; start = time.perf_counter()
+    suma_zap = Zapotrzebowanie()
+    razem = {"projekty": 0, "bledy": 0, "elementy": 0, "m2": 0.0, "koszt": 0.0, "kolizje": 0}
+    with open(os.path.join(args.wyjscie, "podsumowanie.csv"), "w", newline="", encoding="utf-8-sig") as f, \
+            open(os.path.join(args.wyjscie, "kosztorys.csv") if args.kosztorys else os.devnull, "w", newline="", encoding="utf-8-sig") as f_koszt, \
+            open(os.path.join(args.wyjscie, "kolizje.csv") if args.kontrola else os.devnull, "w", newline="", encoding="utf-8-sig") as f_kol, \
+            EksporterCNC(os.path.join(args.wyjscie, "cnc"), cnc) as eks_cnc:
+        writer = csv.DictWriter(f, fieldnames=KOLUMNY_PODSUMOWANIA)
+        writer.writeheader()
+        writer_koszt = csv.DictWriter(f_koszt, fieldnames=KOLUMNY_KOSZTORYSU)
+        if args.kosztorys: writer_koszt.writeheader()
+        writer_kol = csv.DictWriter(f_kol, fieldnames=KOLUMNY_KOLIZJI)
+        if args.kontrola: writer_kol.writeheader()
+
+        def na_wynik(wiersz):
+            for nazwa, sciezka, tekst in wiersz.pop("_cnc", ()): eks_cnc.zapisz(sciezka, tekst, FORMATY_CNC[nazwa])
+            zap = wiersz.pop("_zapotrzebowanie", None)
+            if zap: suma_zap.dolacz(zap)
+            koszt = wiersz.pop("_kosztorys", None)
+            if koszt: writer_koszt.writerow(koszt); razem["koszt"] += koszt["koszt"]
+            kolizje = wiersz.pop("_kolizje", ())
+            writer_kol.writerows(kolizje); razem["kolizje"] += len(kolizje)
+            stan = wiersz.pop("_pomiary", None)
+            if stan:
+                czasy.dolacz(stan)
+                czasy_projektow.append({"nr": wiersz["nr"], "zrodlo": wiersz["zrodlo"], "czas_s": stan["etapy"]["batch.projekt"]["suma_s"],
+                                        "etapy": {k: e["suma_s"] for k, e in stan["etapy"].items()}})
+            writer.writerow(wiersz)
+            razem["projekty"] += 1
+            if wiersz["blad"]:
+                razem["bledy"] += 1
+                print(f"❌ {wiersz['zrodlo']}: {wiersz['blad']}", file=sys.stderr)
+            else:
+                razem["elementy"] += wiersz["elementy"]; razem["m2"] += wiersz["plyta_korpus_m2"]
+
+        przetworz_wsadowo(czytaj_zadania(args.wejscie), args.wyjscie, args.pdf, args.procesy, na_wynik, cnc, args.kosztorys, args.kontrola, args.magazyn, args.zapotrzebowanie)
+
+    print(f"Projekty: {razem['projekty']} (błędy: {razem['bledy']}), elementy: {razem['elementy']}, płyta korpus: {razem['m2']:.2f} m2")
+    if args.kosztorys: print(f"Kosztorys: {os.path.join(args.wyjscie, 'kosztorys.csv')} (razem {razem['koszt']:.2f} zł)")
+    if args.zapotrzebowanie:
+        plik_zap = os.path.join(args.wyjscie, "zapotrzebowanie.csv")
+        with open(plik_zap, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=KOLUMNY_ZAPOTRZEBOWANIA); writer.writeheader(); writer.writerows(suma_zap.wiersze())
+        arkusze = sum(int(v[2]) for v in suma_zap.materialy.values())
+        print(f"Zapotrzebowanie: {plik_zap} ({suma_zap.projekty} projektów, {arkusze} arkuszy)")
+    if args.kontrola: print(f"Kontrola wierceń: {razem['kolizje']} uwag ({os.path.join(args.wyjscie, 'kolizje.csv')})")
+    if args.pomiary:
+        czasy.dolacz(pomiary.GLOBALNY.stan()); czasy.czas("batch.razem", time.perf_counter() - start)
+        _zapisz_pomiary(args.pomiary, czasy.stan(), czasy_projektow)
+    return 1 if razem["bledy"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
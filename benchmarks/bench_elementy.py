@@ -0,0 +1,72 @@
+# benchmarks/bench_elementy.py
+# Pamięć i czas: lista słowników + DataFrame (do V20.3) vs ListaElementow
+#
+#   python benchmarks/bench_elementy.py [liczba_projektow]
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from elementy import KOLUMNY_TABELI, ListaElementow  # noqa: E402
+from generator import normalizuj_projekt, run_generator  # noqa: E402
+
+
+def szafa(i):
+    moduly = [{'typ': "Szuflady" if j % 2 else "Półki", 'wys_mode': 'auto', 'wys_mm': 0,
+               'detale': {'ilosc': 2 + (i + j) % 4, 'drzwi': j % 3 == 0, 'fixed': j % 4 == 0}} for j in range(2 + i % 5)]
+    return normalizuj_projekt({'kod_pro': f"P{i}", 'h_mebla': 2000 + i % 600, 'w_mebla': 1800, 'd_mebla': 580,
+                               'il_przegrod': 2, 'moduly_sekcji': {s: moduly for s in range(3)}})
+
+
+def jako_slowniki(lista):
+    """Stary format: słownik na formatkę (z kopią tablicy otworów)."""
+    return [{**dict(el), "wiercenia": el["wiercenia"].copy()} for el in lista]
+
+
+def pomiar(funkcja):
+    tracemalloc.start(); t = time.perf_counter()
+    wynik = funkcja()
+    czas = time.perf_counter() - t; pamiec = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return wynik, czas, pamiec
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    listy = [run_generator(szafa(i)) for i in range(n)]
+    formatki = sum(map(len, listy))
+
+    slowniki, _, pam_slowniki = pomiar(lambda: [jako_slowniki(lista) for lista in listy])
+    _, t_df_stary, pam_df_stary = pomiar(lambda: [pd.DataFrame(s).drop(columns=['wiercenia', 'orientacja']) for s in slowniki])
+    del slowniki
+
+    kolumny, _, pam_kolumny = pomiar(lambda: [run_generator(szafa(i)) for i in range(n)])
+    _, t_df_nowy, pam_df_nowy = pomiar(lambda: [lista.do_pandas() for lista in kolumny])
+    assert list(kolumny[0].do_pandas().columns) == list(KOLUMNY_TABELI)
+
+    # Jedna lista ze wszystkimi formatkami (wsad), bez wierceń – same dane tabeli
+    wiersze = [dict(el) for lista in listy for el in lista]
+    _, _, pam_jedna_slowniki = pomiar(lambda: [{k: w[k] for k in KOLUMNY_TABELI + ("orientacja",)} for w in wiersze])
+    def jedna():
+        wsad = ListaElementow()
+        for w in wiersze: wsad.dodaj(w["ID"], w["Nazwa"], w["Szerokość [mm]"], w["Wysokość [mm]"], w["Grubość [mm]"], w["Materiał"], w["Oklejanie"], orientacja=w["orientacja"])
+        return wsad
+    wsad, _, pam_jedna_kolumny = pomiar(jedna)
+    _, t_df_wsad, pam_df_wsad = pomiar(wsad.do_pandas)
+
+    print(f"{n} projektów, {formatki} formatek")
+    print(f"{'':<28}{'słowniki':>14}{'kolumny':>14}")
+    print(f"{'pamięć listy [B/formatkę]':<28}{pam_slowniki/formatki:>14.0f}{pam_kolumny/formatki:>14.0f}")
+    print(f"{'DataFrame: pamięć [B/form.]':<28}{pam_df_stary/formatki:>14.0f}{pam_df_nowy/formatki:>14.0f}")
+    print(f"{'DataFrame: czas [ms]':<28}{t_df_stary*1e3:>14.1f}{t_df_nowy*1e3:>14.1f}")
+    print(f"{'wsad bez wierceń [B/form.]':<28}{pam_jedna_slowniki/formatki:>14.0f}{pam_jedna_kolumny/formatki:>14.0f}")
+    print(f"wsad -> DataFrame: {t_df_wsad*1e3:.1f} ms, {pam_df_wsad/formatki:.0f} B/formatkę (poza kolumną ID – bez kopii)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_przyrostowy.py
+# Edycja jednej sekcji regału: pełne przeliczenie vs GeneratorPrzyrostowy
+#
+#   python benchmarks/bench_przyrostowy.py [liczba_sekcji]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generator import GeneratorPrzyrostowy, normalizuj_projekt, run_generator  # noqa: E402
+
+
+def regal(n_sekcji):
+    moduly = lambda s: [{'typ': "Szuflady" if (s + j) % 2 else "Półki", 'wys_mode': 'auto', 'wys_mm': 0,
+                         'detale': {'ilosc': 3 + (s + j) % 3, 'drzwi': j == 0, 'fixed': s % 2 == 0}} for j in range(3)]
+    return normalizuj_projekt({'kod_pro': "REGAL", 'h_mebla': 2400, 'w_mebla': 450 * n_sekcji, 'd_mebla': 580,
+                               'il_przegrod': n_sekcji - 1, 'typ_konstrukcji': "Wieńce Wpuszczane",
+                               'moduly_sekcji': {s: moduly(s) for s in range(n_sekcji)}})
+
+
+def edycje(projekt, n):
+    """Kolejne wersje projektu: w sekcji (k mod N) na zmianę dodajemy i usuwamy półkę."""
+    n_sekcji = projekt['il_przegrod'] + 1
+    for k in range(n):
+        s = k % n_sekcji; ms = dict(projekt['moduly_sekcji'])
+        if k // n_sekcji % 2 == 0: ms[s] = ms[s] + [{'typ': "Półki", 'wys_mode': 'auto', 'wys_mm': 0, 'detale': {'ilosc': 2, 'drzwi': False, 'fixed': False}}]
+        else: ms[s] = ms[s][:-1]
+        projekt = {**projekt, 'moduly_sekcji': ms}
+        yield projekt
+
+
+def main():
+    n_sekcji = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    projekt = regal(n_sekcji); wersje = list(edycje(projekt, 4 * n_sekcji))
+
+    t = time.perf_counter()
+    for p in wersje: run_generator(p)
+    t_pelne = (time.perf_counter() - t) / len(wersje)
+
+    gen = GeneratorPrzyrostowy(); gen.generuj(projekt); sekcje = plyty = 0
+    t = time.perf_counter()
+    for p in wersje: gen.generuj(p); sekcje += gen.przeliczone["sekcje"]; plyty += gen.przeliczone["plyty"]
+    t_przyr = (time.perf_counter() - t) / len(wersje)
+
+    print(f"{n_sekcji} sekcji, {len(run_generator(projekt))} elementów, {len(wersje)} edycji")
+    print(f"lista elementów: pełna {t_pelne*1e3:.2f} ms, przyrostowa {t_przyr*1e3:.2f} ms ({t_pelne/t_przyr:.1f}x); "
+          f"średnio przeliczone: {sekcje/len(wersje):.1f} sekcji, {plyty/len(wersje):.1f} płyt")
+
+
+if __name__ == "__main__":
+    main()
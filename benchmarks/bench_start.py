@@ -0,0 +1,98 @@
+# benchmarks/bench_start.py
+# Zimny start aplikacji: czas importu i pierwszego renderu (każdy pomiar w nowym procesie)
+#
+#   python benchmarks/bench_start.py                      -> JSON na stdout
+#   python benchmarks/bench_start.py --historia start.jsonl --limit 3.0
+#
+# Zwraca kod 1, jeśli pierwszy render przekroczy limit albo przy starcie
+# załadowano moduł, który ma być ładowany dopiero w zakładce (CIEZKIE).
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+KATALOG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(KATALOG, "app.py")
+
+# Moduły, których nie może być po pierwszym renderze (zakładka LISTA)
+CIEZKIE = ("matplotlib", "reportlab")
+
+# Importy z nagłówka app.py
+MODULY_APLIKACJI = "streamlit, constants, generator, cache, nesting"
+
+_POMIAR_IMPORTU = f"""
+import sys, time, json
+sys.path.insert(0, {KATALOG!r})
+t = time.perf_counter()
+import {MODULY_APLIKACJI}
+print(json.dumps({{"import_s": time.perf_counter() - t}}))
+"""
+
+_POMIAR_RENDERU = f"""
+import sys, time, json, logging
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({APP!r}, default_timeout=120)
+t1 = time.perf_counter()
+at.run()
+t2 = time.perf_counter()
+print(json.dumps({{
+    "streamlit_import_s": t1 - t0, "pierwszy_render_s": t2 - t1, "razem_s": t2 - t0,
+    "bledy": [str(e.value) for e in at.exception],
+    "zaladowane_ciezkie": [m for m in {CIEZKIE!r} if m in sys.modules],
+}}))
+"""
+
+
+def _uruchom(kod):
+    t = time.perf_counter()
+    wynik = subprocess.run([sys.executable, "-c", kod], cwd=KATALOG, capture_output=True, text=True, check=True)
+    dane = json.loads(wynik.stdout.strip().splitlines()[-1])
+    dane["proces_s"] = time.perf_counter() - t
+    return dane
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=KATALOG, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def zmierz(powtorzenia=5):
+    importy = [_uruchom(_POMIAR_IMPORTU) for _ in range(powtorzenia)]
+    rendery = [_uruchom(_POMIAR_RENDERU) for _ in range(powtorzenia)]
+    med = lambda lista, k: round(statistics.median(x[k] for x in lista), 4)
+    return {
+        "czas": time.strftime("%Y-%m-%dT%H:%M:%S"), "rev": _git_rev(), "python": sys.version.split()[0], "powtorzenia": powtorzenia,
+        "import_s": med(importy, "import_s"),
+        "streamlit_import_s": med(rendery, "streamlit_import_s"),
+        "pierwszy_render_s": med(rendery, "pierwszy_render_s"),
+        "zimny_start_s": med(rendery, "proces_s"),
+        "zaladowane_ciezkie": sorted({m for r in rendery for m in r["zaladowane_ciezkie"]}),
+        "bledy": sorted({b for r in rendery for b in r["bledy"]}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STOLARZPRO – pomiar zimnego startu aplikacji")
+    parser.add_argument("-n", "--powtorzenia", type=int, default=5)
+    parser.add_argument("--historia", help="plik JSONL, do którego dopisywany jest wynik")
+    parser.add_argument("--limit", type=float, default=None, help="maks. czas pierwszego renderu [s]")
+    args = parser.parse_args(argv)
+
+    wynik = zmierz(args.powtorzenia)
+    print(json.dumps(wynik, ensure_ascii=False, indent=2))
+    if args.historia:
+        with open(args.historia, "a", encoding="utf-8") as f: f.write(json.dumps(wynik, ensure_ascii=False) + "\n")
+
+    regresja = bool(wynik["bledy"] or wynik["zaladowane_ciezkie"]) or (args.limit is not None and wynik["pierwszy_render_s"] > args.limit)
+    return 1 if regresja else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
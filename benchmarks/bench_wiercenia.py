@@ -0,0 +1,112 @@
+# benchmarks/bench_wiercenia.py
+# Porównanie: wiercenia jako listy krotek (do V20.3) vs tablice NumPy
+#
+#   python benchmarks/bench_wiercenia.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generator import normalizuj_projekt, wiercenia_plyt, oblicz_wymiary, wysokosc_auto  # noqa: E402
+from wiercenia import linie, sortuj  # noqa: E402
+
+
+# ======================================================
+# WERSJA REFERENCYJNA (listy krotek, jak przed wektoryzacją)
+# ======================================================
+
+def gen_wiercenia_boku_lista(moduly, wym, is_mirror=False):
+    D_MEBLA = wym.d; H_MEBLA = wym.h; GR_PLYTY = wym.gr; GR_PLECOW = wym.gr_plecow
+    otwory = []
+    if is_mirror: x_f = D_MEBLA-37.0; x_b = D_MEBLA-(37.0+224.0); x_plecy_ref = GR_PLECOW/2
+    else: x_f = 37.0; x_b = 37.0+224.0; x_plecy_ref = D_MEBLA-(GR_PLECOW/2)
+    if "Wpuszczane" in wym.typ_konstrukcji: xt = 50.0 if is_mirror else D_MEBLA-50.0; otwory += [(x_f, GR_PLYTY/2, 'blue'), (xt, GR_PLYTY/2, 'blue'), (x_f, H_MEBLA-GR_PLYTY/2, 'blue'), (xt, H_MEBLA-GR_PLYTY/2, 'blue')]
+    if GR_PLECOW > 0:
+        for k in range(int(H_MEBLA/400)+2):
+            yp = 50 + k*((H_MEBLA-100)/(int(H_MEBLA/400)+1))
+            if yp>GR_PLYTY and yp<H_MEBLA-GR_PLYTY: otwory.append((x_plecy_ref, yp, 'blue'))
+    curr_y = GR_PLYTY; ha = wysokosc_auto(moduly, wym.wys_wew)
+    for idx, m in enumerate(moduly):
+        hm = m['wys_mm'] if m['wys_mode'] == 'fixed' else ha
+        det = m['detale']
+        if idx > 0: yw=curr_y+GR_PLYTY/2; xt=50.0 if is_mirror else D_MEBLA-50.0; otwory+=[(x_f, yw, 'blue'), (xt, yw, 'blue')]; curr_y+=GR_PLYTY
+        if det.get('drzwi'): otwory+=[(x_f, curr_y+100, 'green'), (x_f, curr_y+hm-100, 'green')]
+        if m['typ'] == "Szuflady":
+            for k in range(det.get('ilosc', 2)): ys=curr_y+k*((hm-(det.get('ilosc')-1)*3)/det.get('ilosc')+3)+3+wym.params_szuflad["offset_prowadnica"]; otwory+=[(x_f, ys, 'red'), (x_b, ys, 'red')]
+        elif m['typ'] == "Półki":
+            for k in range(det.get('ilosc', 1)): yp=curr_y+(k+1)*(hm/(det.get('ilosc')+1)); xb=(50.0 if is_mirror else D_MEBLA-50.0) if det.get('fixed') else (50.0 if is_mirror else D_MEBLA-GR_PLECOW-50.0); otwory+=[(x_f, yp, 'blue' if det.get('fixed') else 'green'), (xb, yp, 'blue' if det.get('fixed') else 'green')]
+        curr_y += hm
+    return otwory
+
+
+def przygotuj_rysunek_lista(otwory):
+    ux = sorted(list(set([o[0] for o in otwory]))); uy = sorted(list(set([o[1] for o in otwory])))
+    return ux, uy, sorted(otwory, key=lambda k: (k[1], k[0]))
+
+
+def przygotuj_rysunek_numpy(otwory):
+    ux, uy = linie(otwory)
+    return ux, uy, sortuj(otwory)
+
+
+# ======================================================
+# PRZYPADEK TESTOWY: WYSOKA SZAFA
+# ======================================================
+
+def szafa(n_modulow=8, ilosc=10):
+    moduly = []
+    for j in range(n_modulow):
+        typ = "Szuflady" if j % 2 else "Półki"
+        moduly.append({'typ': typ, 'wys_mode': 'auto', 'wys_mm': 0,
+                       'detale': {'ilosc': ilosc, 'drzwi': j % 3 == 0, 'fixed': j % 4 == 0}})
+    return normalizuj_projekt({
+        'h_mebla': 2600, 'w_mebla': 3000, 'd_mebla': 600, 'il_przegrod': 3,
+        'typ_konstrukcji': "Wieńce Wpuszczane", 'typ_plecow': "Płyta 18mm (Wpuszczana)",
+        'moduly_sekcji': {i: moduly for i in range(4)},
+    })
+
+
+def plyty_pionowe_lista(projekt, wym):
+    ms = projekt['moduly_sekcji']; n = wym.n_sekcji
+    wynik = [gen_wiercenia_boku_lista(ms.get(0, []), wym, False), gen_wiercenia_boku_lista(ms.get(n-1, []), wym, True)]
+    for i in range(wym.il_przegrod):
+        wynik.append(gen_wiercenia_boku_lista(ms.get(i, []), wym, True) + gen_wiercenia_boku_lista(ms.get(i+1, []), wym, False))
+    return wynik
+
+
+def plyty_pionowe_numpy(projekt, wym):
+    return wiercenia_plyt([(projekt['moduly_sekcji'], wym)])[0]
+
+
+def _czas(funkcja, powtorzenia):
+    return min(timeit.repeat(funkcja, number=powtorzenia, repeat=5)) / powtorzenia
+
+
+def main():
+    print(f"{'przypadek':<34}{'etap':<22}{'listy [us]':>12}{'numpy [us]':>12}{'przysp.':>9}")
+    for n_modulow, ilosc in ((2, 2), (4, 5), (8, 10)):
+        projekt = szafa(n_modulow, ilosc); wym = oblicz_wymiary(projekt)
+        listy = plyty_pionowe_lista(projekt, wym); tablice = plyty_pionowe_numpy(projekt, wym)
+        assert [len(x) for x in listy] == [len(x) for x in tablice]
+        nazwa = f"{n_modulow} mod. x {ilosc} szt. ({sum(map(len, tablice))} otw.)"
+        for etap, f_lista, f_np in (
+            ("generowanie", lambda: plyty_pionowe_lista(projekt, wym), lambda: plyty_pionowe_numpy(projekt, wym)),
+            ("sortowanie + linie", lambda: [przygotuj_rysunek_lista(o) for o in listy], lambda: [przygotuj_rysunek_numpy(o) for o in tablice]),
+        ):
+            t_lista = _czas(f_lista, 200); t_np = _czas(f_np, 200)
+            print(f"{nazwa:<34}{etap:<22}{t_lista*1e6:>12.1f}{t_np*1e6:>12.1f}{t_lista/t_np:>8.1f}x")
+
+    # Wsad: wiele różnych projektów, wiercenia jednym przebiegiem
+    for n_proj in (100, 1000):
+        projekty = [szafa(2 + i % 7, 1 + i % 6) for i in range(n_proj)]
+        wymiary = [oblicz_wymiary(p) for p in projekty]
+        pary = [(p['moduly_sekcji'], w) for p, w in zip(projekty, wymiary)]
+        t_lista = _czas(lambda: [plyty_pionowe_lista(p, w) for p, w in zip(projekty, wymiary)], 3)
+        t_np = _czas(lambda: wiercenia_plyt(pary), 3)
+        print(f"{f'wsad {n_proj} projektów':<34}{'generowanie [ms]':<22}{t_lista*1e3:>12.1f}{t_np*1e3:>12.1f}{t_lista/t_np:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
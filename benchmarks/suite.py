@@ -0,0 +1,292 @@
+# benchmarks/suite.py
+# Zestaw pomiarów wydajności STOLARZPRO (czas, szczyt pamięci, przepustowość) – wynik w JSON
+#
+#   python benchmarks/suite.py -o wyniki.json                 -> wszystkie przypadki
+#   python benchmarks/suite.py -k generator -k nesting        -> tylko pasujące nazwy
+#   python benchmarks/suite.py -o nowe.json --porownaj stare.json --prog 1.2
+#
+# Projekty testowe są syntetyczne i deterministyczne (bez losowości), więc
+# wyniki z różnych commitów można porównywać wprost.
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+KATALOG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KATALOG)
+
+from generator import (  # noqa: E402
+    gen_wiercenia_boku, generuj_instrukcje_tekst, normalizuj_projekt, oblicz_wymiary, okucia, run_generator, run_generator_wsadowo,
+)
+
+
+# ======================================================
+# PROJEKTY SYNTETYCZNE
+# ======================================================
+
+def _modul(typ, ilosc, drzwi=False, fixed=False, wys_mm=0):
+    return {'typ': typ, 'wys_mode': 'fixed' if wys_mm else 'auto', 'wys_mm': wys_mm,
+            'detale': {'ilosc': ilosc, 'drzwi': drzwi, 'fixed': fixed}}
+
+
+def szafka():
+    """Mała szafka: jedna sekcja, szuflady + półka za drzwiami."""
+    return normalizuj_projekt({
+        'kod_pro': "SZAFKA", 'h_mebla': 720, 'w_mebla': 600, 'd_mebla': 510, 'il_przegrod': 0,
+        'typ_konstrukcji': "Wieńce Nakładane", 'typ_plecow': "HDF 3mm (Nakładane)",
+        'moduly_sekcji': {0: [_modul("Szuflady", 2, wys_mm=300), _modul("Półki", 1, drzwi=True)]},
+    })
+
+
+def szafa(n_sekcji=6, nr=0):
+    """Szafa / zabudowa: n sekcji na zmianę szuflady, półki stałe i ruchome, płyta z tyłu."""
+    sekcje = {}
+    for s in range(n_sekcji):
+        k = (s + nr) % 3
+        sekcje[s] = [_modul("Szuflady", 3 + k, wys_mm=500 + 50 * k), _modul("Półki", 2 + k, drzwi=s % 2 == 0, fixed=k == 0),
+                     _modul("Półki", 1 + k, fixed=k == 1)]
+    return normalizuj_projekt({
+        'kod_pro': f"SZAFA_{nr}", 'h_mebla': 2400 + 10 * (nr % 20), 'w_mebla': 500 * n_sekcji, 'd_mebla': 600, 'il_przegrod': n_sekcji - 1,
+        'typ_konstrukcji': "Wieńce Wpuszczane", 'typ_plecow': "Płyta 18mm (Wpuszczana)", 'moduly_sekcji': sekcje,
+    })
+
+
+def wsad(n=1000):
+    """Tygodniowy wsad: mieszanka szafek i szaf 2–6 sekcji."""
+    return [szafka() if i % 4 == 0 else szafa(2 + i % 5, i) for i in range(n)]
+
+
+# ======================================================
+# PRZYPADKI
+# ======================================================
+# Przypadek: nazwa -> funkcja zwracająca (przygotowanie, pomiar, jednostka);
+# przygotowanie() liczone poza pomiarem, pomiar(dane) -> liczba jednostek.
+
+def _formatki(lista, material="KORPUS"):
+    return [{"w": x['Szerokość [mm]'], "h": x['Wysokość [mm]'], "nazwa": x['ID']} for x in lista if material in x['Materiał']]
+
+
+def _przypadki():
+    from export_cnc import eksportuj_cnc
+    from export_pdf import export_pdf
+    from kosztorys import ilosci, wyceny_wsadowo
+    from zlecenie import rozkroj_zlecenia
+    from model import Korpus
+    from nesting import rozkroj
+    from rysunki import fig_png, rysuj_element, rysuj_nesting, rysuj_podglad_mebla
+    import wektor
+
+    def gen(projekt):
+        return lambda: projekt, lambda p: len(run_generator(p)), "elementy"
+
+    def boki():
+        p = szafa(6); w = oblicz_wymiary(p); ms = p['moduly_sekcji']
+        return (lambda: None, lambda _: sum(len(gen_wiercenia_boku(ms[s], w, lustro)) for s in ms for lustro in (False, True)), "otwory")
+
+    def rysunek():
+        el = max(run_generator(szafa(6)), key=lambda e: len(e['wiercenia']))
+        return (lambda: el, lambda e: (fig_png(rysuj_element(e['Szerokość [mm]'], e['Wysokość [mm]'], e['ID'], e['Nazwa'], e['wiercenia'], e['orientacja'])), 1)[1], "rysunki")
+
+    def svg():
+        el = max(run_generator(szafa(6)), key=lambda e: len(e['wiercenia']))
+        return lambda: el, lambda e: (wektor.element_svg(e), 1)[1], "rysunki"
+
+    def podglad(projekt, svg):
+        w = oblicz_wymiary(projekt)
+        args = (w.w, w.h, w.gr, w.il_przegrod, projekt['moduly_sekcji'], w.szer_wneki, w.typ_konstrukcji)
+        if svg: return lambda: args, lambda a: (wektor._warstwa_korpusu.cache_clear(), wektor._warstwa_sekcji.cache_clear(), wektor.podglad_mebla_svg(*a), 1)[-1], "rysunki"
+        return lambda: args, lambda a: (fig_png(rysuj_podglad_mebla(*a)), 1)[1], "rysunki"
+
+    def pdf(projekt):
+        return pdf_listy(run_generator(projekt), generuj_instrukcje_tekst(projekt))
+
+    def pdf_zlecenia(projekty):
+        from zlecenie import instrukcja_zlecenia, lista_zlecenia, normalizuj_zlecenie
+        zl = normalizuj_zlecenie({"kod_zlecenia": "ZLECENIE", "szafki": projekty})
+        return pdf_listy(lista_zlecenia(zl), instrukcja_zlecenia(zl))
+
+    def pdf_listy(lista, tekst):
+        def pomiar(_):
+            buf = io.BytesIO(); wektor.zbuduj_pdf(lista, tekst, buf); return len(lista)
+        return lambda: None, pomiar, "elementy"
+
+    def nesting(projekty, metoda):
+        formatki = [f for p in projekty for f in _formatki(run_generator(p))]
+        return lambda: formatki, lambda f: (rozkroj(f, metoda=metoda), len(f))[1], "formatki"
+
+    def rysunek_nestingu():
+        wynik = rozkroj(_formatki(run_generator(szafa(6))))
+        return lambda: wynik, lambda w: sum((fig_png(rysuj_nesting(a, i, w.liczba_arkuszy)), 1)[1] for i, a in enumerate(w.arkusze)), "arkusze"
+
+    def cnc(projekty):
+        listy = [(p['kod_pro'] + f"_{i}", l) for i, (p, l) in enumerate(zip(projekty, run_generator_wsadowo(projekty)))]
+        def pomiar(_):
+            with tempfile.TemporaryDirectory() as kat: eksportuj_cnc(iter(listy), kat)
+            return len(listy)
+        return lambda: None, pomiar, "projekty"
+
+    def pdf_korpusu():
+        k = Korpus("K", 1800, 2400, 600, 18, 3); k.buduj_korpus()
+        k.buduj_wnetrze([{"typ": "Szuflady", "ilosc": 4}, {"typ": "Półka", "ilosc": 5}, {"typ": "Pusta"}, {"typ": "Półka", "ilosc": 3}])
+        def pomiar(_):
+            with tempfile.TemporaryDirectory() as kat: export_pdf(k, os.path.join(kat, "lista.pdf"))
+            return len(k.elementy)
+        return lambda: None, pomiar, "elementy"
+
+    def kosztorys_wsadu(projekty):
+        listy = run_generator_wsadowo(projekty)
+        return lambda: None, lambda _: sum((ilosci(l, rozkroj_zlecenia(l), okucia(p)), 1)[1] for p, l in zip(projekty, listy)), "projekty"
+
+    def ponowna_wycena(n, cenniki):
+        import numpy as np
+        Q = np.random.default_rng(0).uniform(0, 50, (n, 8)); ceny = [{"korpus": 50 + i} for i in range(cenniki)]
+        return lambda: Q, lambda q: (wyceny_wsadowo(q, ceny), n * cenniki)[1], "wyceny"
+
+    def zapotrzebowanie_wsadu(projekty):
+        from zapotrzebowanie import zapotrzebowanie
+        listy = run_generator_wsadowo(projekty); okucia_szt = [okucia(p) for p in projekty]
+        return lambda: listy, lambda ls: (zapotrzebowanie(ls, okucia_szt), len(ls))[1], "projekty"
+
+    def przeglad_wariantow():
+        from warianty import przeglad
+        zakresy = {'w_mebla': range(400, 1201, 50), 'h_mebla': [720, 820, 900], 'd_mebla': [510, 560], 'il_przegrod': [0, 1]}
+        return lambda: None, lambda _: (przeglad(szafka(), zakresy, ("koszt",), najlepsze=10, procesy=1), 204)[1], "warianty"
+
+    def pdf_z_dysku(projekt):
+        from cache import CacheDyskowy
+        lista = run_generator(projekt); tekst = generuj_instrukcje_tekst(projekt); kat = tempfile.mkdtemp()
+        dysk = CacheDyskowy(os.path.join(kat, "cache")); cel = os.path.join(kat, "projekt.pdf")
+        dysk.do_pliku(wektor.klucz_pdf(lista, tekst), lambda f: wektor.zbuduj_pdf(lista, tekst, f), cel)
+        return lambda: None, lambda _: (dysk.do_pliku(wektor.klucz_pdf(lista, tekst), lambda f: wektor.zbuduj_pdf(lista, tekst, f), cel), len(lista))[1], "elementy"
+
+    def kontrola_wsadu(projekty):
+        from kolizje import sprawdz_wsadowo
+        listy = run_generator_wsadowo(projekty)
+        return lambda: listy, lambda ls: (sprawdz_wsadowo(ls), sum(l.otwory.size for l in ls))[1], "otwory"
+
+    def podglad_3d(projekty):
+        from podglad3d import bryly, zbuduj_glb
+        listy = run_generator_wsadowo(projekty)
+        return lambda: None, lambda _: sum((zbuduj_glb(*bryly(p, l)), len(l))[1] for p, l in zip(projekty, listy)), "elementy"
+
+    projekty_wsadu = wsad(1000)
+    return {
+        "generator/szafka": lambda: gen(szafka()),
+        "generator/szafa_6": lambda: gen(szafa(6)),
+        "generator/wsad_1k": lambda: (lambda: projekty_wsadu, lambda ps: sum(len(run_generator(p)) for p in ps), "elementy"),
+        "generator/wsad_1k_wektorowo": lambda: (lambda: projekty_wsadu, lambda ps: sum(map(len, run_generator_wsadowo(ps))), "elementy"),
+        "wiercenia/gen_wiercenia_boku_szafa_6": boki,
+        "rysunki/rysuj_element": rysunek,
+        "rysunki/element_svg": svg,
+        "rysunki/pdf_wektor_szafka": lambda: pdf(szafka()),
+        "rysunki/pdf_wektor_szafa_6": lambda: pdf(szafa(6)),
+        "rysunki/pdf_wektor_zlecenie_20": lambda: pdf_zlecenia([szafa(6, i) for i in range(20)]),
+        "rysunki/pdf_z_dysku_szafa_6": lambda: pdf_z_dysku(szafa(6)),
+        "rysunki/podglad_szafa_12": lambda: podglad(szafa(12), False),
+        "rysunki/podglad_svg_szafa_12": lambda: podglad(szafa(12), True),
+        "rysunki/podglad_3d_wsad_100": lambda: podglad_3d(projekty_wsadu[:100]),
+        "nesting/rozkroj_szafa_6": lambda: nesting([szafa(6)], "guillotine"),
+        "nesting/rozkroj_wsad_100_maxrects": lambda: nesting(projekty_wsadu[:100], "maxrects"),
+        "nesting/rozkroj_wsad_1k": lambda: nesting(projekty_wsadu, "guillotine"),
+        "nesting/rysuj_nesting_szafa_6": rysunek_nestingu,
+        "export/export_cnc_wsad_1k": lambda: cnc(projekty_wsadu),
+        "export/export_pdf_korpus": pdf_korpusu,
+        "kosztorys/ilosci_wsad_100": lambda: kosztorys_wsadu(projekty_wsadu[:100]),
+        "kosztorys/wycena_100k_x_10": lambda: ponowna_wycena(100_000, 10),
+        "kosztorys/zapotrzebowanie_wsad_100": lambda: zapotrzebowanie_wsadu(projekty_wsadu[:100]),
+        "warianty/przeglad_szafka_204": przeglad_wariantow,
+        "kolizje/kontrola_wsad_1k": lambda: kontrola_wsadu(projekty_wsadu),
+    }
+
+
+# ======================================================
+# POMIAR
+# ======================================================
+
+def zmierz(przygotuj, pomiar, min_czas=1.0, max_powtorzen=20):
+    """Powtarza pomiar (co najmniej 3 razy lub do min_czas), potem jeden przebieg pod tracemalloc."""
+    dane = przygotuj(); czasy = []; jednostki = 0
+    pomiar(dane)   # rozgrzewka (importy, pula procesów, pamięci podręczne Matplotlib)
+    start = time.perf_counter()
+    while len(czasy) < 3 or (time.perf_counter() - start < min_czas and len(czasy) < max_powtorzen):
+        gc.collect(); t = time.perf_counter()
+        jednostki = pomiar(dane)
+        czasy.append(time.perf_counter() - t)
+    gc.collect(); tracemalloc.start()
+    pomiar(dane)
+    szczyt = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+    med = statistics.median(czasy)
+    return {"czas_s": round(med, 6), "czas_min_s": round(min(czasy), 6), "powtorzenia": len(czasy),
+            "szczyt_pamieci_mb": round(szczyt / 2**20, 3), "jednostki": jednostki,
+            "przepustowosc_na_s": round(jednostki / med, 2) if med else None}
+
+
+def _srodowisko():
+    import numpy
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=KATALOG, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        rev = ""
+    return {"rev": rev, "czas": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0], "numpy": numpy.__version__,
+            "system": platform.platform(), "procesor": platform.processor() or platform.machine(), "rdzenie": os.cpu_count()}
+
+
+def porownaj(stare, nowe, prog):
+    """Tabela czasów stary -> nowy; zwraca nazwy przypadków wolniejszych niż prog (stosunek czasów)."""
+    regresje = []
+    print(f"\n{'przypadek':<42}{'stary [s]':>12}{'nowy [s]':>12}{'zmiana':>9}")
+    for nazwa, w in nowe["wyniki"].items():
+        s = stare["wyniki"].get(nazwa)
+        if not s: print(f"{nazwa:<42}{'–':>12}{w['czas_s']:>12.4f}"); continue
+        stosunek = w["czas_s"] / s["czas_s"] if s["czas_s"] else float("inf")
+        znak = " !" if stosunek > prog else ""
+        if znak: regresje.append(nazwa)
+        print(f"{nazwa:<42}{s['czas_s']:>12.4f}{w['czas_s']:>12.4f}{stosunek:>8.2f}x{znak}")
+    return regresje
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STOLARZPRO – pomiary wydajności")
+    parser.add_argument("-o", "--wyjscie", help="plik JSON z wynikami (domyślnie stdout)")
+    parser.add_argument("-k", "--filtr", action="append", default=[], help="tylko przypadki zawierające tekst (można powtórzyć)")
+    parser.add_argument("--min-czas", type=float, default=1.0, help="minimalny łączny czas pomiaru przypadku [s]")
+    parser.add_argument("--porownaj", help="poprzedni plik JSON – wypisz zmiany")
+    parser.add_argument("--prog", type=float, default=1.25, help="stosunek czasów uznawany za regresję (z --porownaj)")
+    parser.add_argument("-l", "--lista", action="store_true", help="tylko wypisz nazwy przypadków")
+    args = parser.parse_args(argv)
+
+    przypadki = _przypadki()
+    wybrane = [n for n in przypadki if not args.filtr or any(f in n for f in args.filtr)]
+    if args.lista:
+        print("\n".join(wybrane)); return 0
+
+    wynik = {"srodowisko": _srodowisko(), "wyniki": {}}
+    for nazwa in wybrane:
+        przygotuj, pomiar, jednostka = przypadki[nazwa]()
+        w = zmierz(przygotuj, pomiar, args.min_czas); w["jednostka"] = jednostka
+        wynik["wyniki"][nazwa] = w
+        print(f"{nazwa:<42}{w['czas_s']:>10.4f} s {w['szczyt_pamieci_mb']:>9.1f} MB {w['przepustowosc_na_s']:>12.1f} {jednostka}/s", file=sys.stderr)
+
+    tekst = json.dumps(wynik, ensure_ascii=False, indent=2)
+    if args.wyjscie:
+        with open(args.wyjscie, "w", encoding="utf-8") as f: f.write(tekst + "\n")
+    else:
+        print(tekst)
+
+    if args.porownaj:
+        with open(args.porownaj, encoding="utf-8") as f: stare = json.load(f)
+        if porownaj(stare, wynik, args.prog): return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
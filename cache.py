@@ -0,0 +1,272 @@
+# cache.py
+# Pamięć podręczna wyników (LRU z limitem pamięci, pliki na dysku) dla STOLARZPRO
+#
+# LRUCache – obiekty w pamięci procesu (reruny Streamlit).
+# CacheDyskowy – bajty wyników (PNG, strony i całe PDF-y) w plikach nazwanych
+# skrótem klucza, wspólne dla sesji, procesów roboczych i kolejnych uruchomień.
+# Klucz zawiera skrót danych wejściowych i wersję rysującego modułu
+# (rysunki.WERSJA, wektor.WERSJA), więc zmiana wyglądu stron nie zwraca starych plików.
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+# Pola specyfikacji, od których zależy lista elementów i rysunki (ceny – nie)
+POLA_GEOMETRII = (
+    'kod_pro', 'h_mebla', 'w_mebla', 'd_mebla', 'gr_plyty', 'il_przegrod',
+    'typ_konstrukcji', 'typ_plecow', 'moduly_sekcji', 'system_prowadnic', 'system_zawiasow',
+)
+
+
+# ======================================================
+# KLUCZ PROJEKTU
+# ======================================================
+
+def _kanoniczne(v):
+    """1000 i 1000.0 z number_input mają dawać ten sam klucz; klucze sekcji jako tekst."""
+    if isinstance(v, float) and v.is_integer(): return int(v)
+    if isinstance(v, dict): return {str(k): _kanoniczne(x) for k, x in v.items()}
+    if isinstance(v, (list, tuple)): return [_kanoniczne(x) for x in v]
+    return v
+
+
+def hash_projektu(projekt, pola=POLA_GEOMETRII):
+    """Skrót SHA-256 kanonicznego JSON-a wybranych pól specyfikacji."""
+    dane = {k: _kanoniczne(projekt.get(k)) for k in pola}
+    tekst = json.dumps(dane, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(tekst.encode("utf-8")).hexdigest()
+
+
+# ======================================================
+# LRU Z LIMITEM PAMIĘCI
+# ======================================================
+
+def _rozmiar(wartosc):
+    if isinstance(wartosc, (bytes, bytearray)): return len(wartosc)
+    if isinstance(wartosc, str): return len(wartosc.encode("utf-8"))
+    try:
+        return len(pickle.dumps(wartosc, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        # np. DataFrame z obiektami – szacunek z pandas
+        uzycie = getattr(wartosc, "memory_usage", None)
+        return int(uzycie(deep=True).sum()) if uzycie else 1024
+
+
+class LRUCache:
+    """
+    Słownik klucz -> wynik, usuwający najdawniej używane wpisy, gdy suma
+    rozmiarów przekroczy max_bajtow. Bezpieczny dla wątków (sesje Streamlit).
+    Zwracane obiekty są współdzielone – nie wolno ich modyfikować.
+    """
+
+    def __init__(self, max_bajtow=256 * 2**20):
+        self.max_bajtow = max_bajtow
+        self.bajty = 0
+        self.trafienia = 0
+        self.chybienia = 0
+        self._dane = OrderedDict()   # klucz -> (wartość, rozmiar)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._dane)
+
+    def __contains__(self, klucz):
+        return klucz in self._dane
+
+    def pobierz(self, klucz, domyslna=None):
+        with self._lock:
+            if klucz not in self._dane:
+                self.chybienia += 1
+                return domyslna
+            self._dane.move_to_end(klucz)
+            self.trafienia += 1
+            return self._dane[klucz][0]
+
+    def zapisz(self, klucz, wartosc):
+        rozmiar = _rozmiar(wartosc)
+        with self._lock:
+            if klucz in self._dane: self.bajty -= self._dane.pop(klucz)[1]
+            if rozmiar > self.max_bajtow: return wartosc
+            self._dane[klucz] = (wartosc, rozmiar); self.bajty += rozmiar
+            while self.bajty > self.max_bajtow:
+                _, (_, r) = self._dane.popitem(last=False); self.bajty -= r
+        return wartosc
+
+    def pobierz_lub_licz(self, klucz, funkcja):
+        """Zwraca wynik z pamięci albo liczy funkcja() i zapamiętuje."""
+        brak = object()
+        wynik = self.pobierz(klucz, brak)
+        if wynik is brak: wynik = self.zapisz(klucz, funkcja())
+        return wynik
+
+    def wyczysc(self):
+        with self._lock:
+            self._dane.clear(); self.bajty = 0
+
+
+# Wspólna dla całego procesu (moduł importowany raz, app.py wykonywany przy każdym rerunie)
+wyniki = LRUCache()
+
+
+# ======================================================
+# PLIKI NA DYSKU (WSPÓLNE DLA PROCESÓW)
+# ======================================================
+
+ZMIENNA_KATALOGU = "STOLARZPRO_CACHE"        # katalog plików; pusty – bez zapisu na dysk
+ZMIENNA_LIMITU = "STOLARZPRO_CACHE_MB"
+PORZUCONE = 3600                             # [s] pliki tymczasowe starsze niż to – po przerwanym zapisie
+
+
+def skrot_klucza(klucz):
+    """SHA-256 z repr klucza (krotki tekstów, liczb i bajtów – repr taki sam w każdym procesie)."""
+    return hashlib.sha256(repr(klucz).encode("utf-8")).hexdigest()
+
+
+def _usun(sciezka):
+    try:
+        os.remove(sciezka)
+    except OSError:
+        pass   # usunięty przez inny proces albo otwarty (Windows)
+
+
+class CacheDyskowy:
+    """
+    Bajty wyników w plikach katalog/ab/abcdef… (skrót klucza). Zapis atomowy:
+    plik tymczasowy w tym samym katalogu + os.replace – inny proces widzi cały
+    plik albo żaden. Trafienie odświeża czas modyfikacji pliku, a gdy suma
+    rozmiarów przekroczy max_bajtow, usuwane są najdawniej używane pliki
+    (przegląd katalogu co ~1/16 limitu zapisanych bajtów). katalog=None – bez
+    dysku: wszystko liczone za każdym razem.
+    """
+
+    def __init__(self, katalog, max_bajtow=1024 * 2**20):
+        self.katalog = katalog
+        self.max_bajtow = max_bajtow
+        self.bajty = 0               # z ostatniego przeglądu katalogu
+        self.trafienia = 0
+        self.chybienia = 0
+        self._od_przegladu = max_bajtow   # pierwszy zapis przegląda katalog
+
+    def sciezka(self, klucz):
+        if not self.katalog: return None
+        s = skrot_klucza(klucz)
+        return os.path.join(self.katalog, s[:2], s[2:])
+
+    def pobierz(self, klucz, domyslna=None):
+        sciezka = self.sciezka(klucz); dane = None
+        if sciezka:
+            try:
+                with open(sciezka, "rb") as f: dane = f.read()
+            except OSError:
+                pass
+        if dane is None:
+            self.chybienia += 1
+            return domyslna
+        self.trafienia += 1; self._odswiez(sciezka)
+        return dane
+
+    def zapisz(self, klucz, dane):
+        sciezka = self.sciezka(klucz)
+        if sciezka: self._zapisz_plik(sciezka, lambda f: f.write(dane))
+        return dane
+
+    def pobierz_lub_licz(self, klucz, funkcja):
+        """Bajty z dysku albo funkcja() zapisane na dysk."""
+        dane = self.pobierz(klucz)
+        return self.zapisz(klucz, funkcja()) if dane is None else dane
+
+    def do_pliku(self, klucz, zapis, cel):
+        """
+        Wynik jako plik `cel` (kopia pliku z dysku). Przy braku zapis(f) pisze
+        go do otwartego pliku binarnego – np. PDF strona po stronie, bez całości
+        w pamięci. Zwraca True, jeśli był na dysku.
+        """
+        sciezka = self.sciezka(klucz)
+        if sciezka:
+            if self._kopiuj(sciezka, cel): self.trafienia += 1; return True
+            self.chybienia += 1
+            self._zapisz_plik(sciezka, zapis)
+            if self._kopiuj(sciezka, cel): return False
+        with open(cel, "wb") as f: zapis(f)   # bez dysku albo plik usunięty w międzyczasie
+        return False
+
+    # ---------- pliki ----------
+
+    @staticmethod
+    def _odswiez(sciezka):
+        try:
+            os.utime(sciezka)
+        except OSError:
+            pass
+
+    def _kopiuj(self, sciezka, cel):
+        # Kopia, nie dowiązanie: zmiana pliku wynikowego nie może zmienić pliku w pamięci podręcznej
+        try:
+            shutil.copyfile(sciezka, cel)
+        except FileNotFoundError:
+            return False
+        self._odswiez(sciezka)
+        return True
+
+    def _zapisz_plik(self, sciezka, zapis):
+        katalog = os.path.dirname(sciezka)
+        os.makedirs(katalog, exist_ok=True)
+        uchwyt, tymczasowy = tempfile.mkstemp(dir=katalog, prefix=".tmp")
+        try:
+            os.chmod(tymczasowy, 0o644)   # mkstemp: 0600
+            with os.fdopen(uchwyt, "wb") as f:
+                zapis(f); f.flush(); os.fsync(f.fileno())
+            rozmiar = os.path.getsize(tymczasowy)
+            os.replace(tymczasowy, sciezka)
+        except BaseException:
+            _usun(tymczasowy)
+            raise
+        self._od_przegladu += rozmiar
+        if self._od_przegladu > self.max_bajtow // 16: self.przytnij()
+
+    def przytnij(self):
+        """Usuwa najdawniej używane pliki, aż suma rozmiarów zejdzie do 90% limitu."""
+        pliki = []; suma = 0; teraz = time.time()
+        try:
+            podkatalogi = [d.path for d in os.scandir(self.katalog) if d.is_dir()]
+        except OSError:
+            return
+        for katalog in podkatalogi:
+            try:
+                wpisy = list(os.scandir(katalog))
+            except OSError:
+                continue
+            for w in wpisy:
+                try:
+                    st = w.stat()
+                except OSError:
+                    continue
+                if w.name.startswith(".tmp"):
+                    if teraz - st.st_mtime > PORZUCONE: _usun(w.path)
+                    continue
+                pliki.append((st.st_mtime, st.st_size, w.path)); suma += st.st_size
+        if suma > self.max_bajtow:
+            pliki.sort()
+            for _, rozmiar, sciezka in pliki:
+                if suma <= self.max_bajtow * 0.9: break
+                _usun(sciezka); suma -= rozmiar
+        self.bajty = suma; self._od_przegladu = 0
+
+    def wyczysc(self):
+        if self.katalog and os.path.isdir(self.katalog): shutil.rmtree(self.katalog, ignore_errors=True)
+        self.bajty = 0
+
+
+def _katalog_domyslny():
+    return os.environ.get(ZMIENNA_KATALOGU, os.path.join(os.path.expanduser("~"), ".cache", "stolarzpro"))
+
+
+# Wspólny katalog wszystkich procesów (aplikacja, batch.py, serwer.py i ich procesy robocze)
+dysk = CacheDyskowy(_katalog_domyslny(), int(os.environ.get(ZMIENNA_LIMITU, 1024)) * 2**20)
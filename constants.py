@@ -14,3 +14,46 @@ GR_PLYTA_DOMYSLNA = 18  # grubość płyty [mm]
 KOLOR_PLYTA = "#d7ba9d"
 KOLOR_FRONT = "#fdf0d5"
 KOLOR_PRZEGRODA = "#aaaaaa"
+
+# ---- OKUCIA ----
+BAZA_SYSTEMOW = {
+    "GTV Axis Pro": {"offset_prowadnica": 37, "offset_front_y": 48},
+    "Blum Antaro": {"offset_prowadnica": 37, "offset_front_y": 46}
+}
+
+BAZA_ZAWIASOW = {
+    "Blum Clip Top": {"puszka_offset": 22},
+    "GTV Prestige": {"puszka_offset": 22},
+    "Hettich Sensys": {"puszka_offset": 23}
+}
+
+CENY_OKUC = {           # ceny okuć do kosztorysu [zł/szt., prowadnice za parę]
+    "konfirmaty": 0.25,
+    "wkrety": 0.05,
+    "prowadnice": 35.0,
+    "zawiasy": 9.0
+}
+
+# ---- ROZKRÓJ ----
+ARKUSZ_W = 2800         # długość arkusza płyty [mm]
+ARKUSZ_H = 2070         # szerokość arkusza płyty [mm]
+RZAZ = 4                # szerokość rzazu piły [mm]
+RESZTKA_MIN_DL = 300    # najkrótsza długość odpadu zapisywanego w magazynie resztek [mm]
+RESZTKA_MIN_SZER = 100  # najkrótsza szerokość odpadu zapisywanego w magazynie resztek [mm]
+
+# ---- WIERCENIA ----
+FI_OTWOROW = {          # średnica otworu wg typu [mm]
+    "blue": 5.0,        # konfirmat (przelotowo)
+    "red": 2.0,         # prowadnica (puntowanie)
+    "green": 2.0,       # podpórka półki / prowadnik zawiasu (puntowanie)
+}
+GL_OTWOROW = {          # głębokość otworu wg typu [mm]; 0 – przelotowo (na grubość płyty)
+    "blue": 0.0,
+    "red": 3.0,
+    "green": 3.0,
+}
+MIN_MOSTEK = 3.0        # min. materiał między brzegami sąsiednich otworów [mm]
+MIN_OD_KRAWEDZI = 3.0   # min. materiał między brzegiem otworu a krawędzią płyty [mm]
+ODSTEPY_OKUC = {        # min. odległość środków otworów różnych okuć [mm] (korpus okucia, nie sam otwór)
+    ("green", "red"): 32.0,   # prowadnica szuflady – zawias / podpórka półki
+}
@@ -1,11 +1,16 @@
 # drawings.py
 # Funkcje rysujące (Matplotlib) dla STOLARZPRO
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 from constants import KOLOR_PLYTA, KOLOR_FRONT, KOLOR_PRZEGRODA
 
 
+def _mpl():
+    """Matplotlib ładowany przy pierwszym rysunku, nie przy imporcie modułu."""
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+    return plt, patches
+
+
 # ======================================================
 # RYSUNEK POJEDYNCZEGO ELEMENTU
 # ======================================================
@@ -22,6 +27,7 @@ def rysuj_element(
     if otwory is None:
         otwory = []
 
+    plt, patches = _mpl()
     fig, ax = plt.subplots(figsize=(10, 6))
 
     rect = patches.Rectangle(
@@ -71,6 +77,7 @@ def rysuj_element(
 # ======================================================
 
 def rysuj_podglad_mebla(w, h, gr, konfiguracja, szer_wneki):
+    plt, patches = _mpl()
     fig, ax = plt.subplots(figsize=(12, 6))
 
     # Obrys zewnętrzny
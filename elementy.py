@@ -0,0 +1,260 @@
+# elementy.py
+# Kolumnowa lista elementów (formatek) dla STOLARZPRO
+
+import hashlib
+from array import array
+from collections.abc import Mapping
+
+import numpy as np
+
+from pomiary import mierzony
+from wiercenia import BRAK_OTWOROW, OTWOR_DTYPE
+
+
+# Kolumny tabeli (zakładka LISTA, CSV) i pełny zestaw kluczy elementu
+KOLUMNY_TABELI = ("ID", "Nazwa", "Szerokość [mm]", "Wysokość [mm]", "Grubość [mm]", "Materiał", "Oklejanie")
+KLUCZE = KOLUMNY_TABELI + ("wiercenia", "orientacja")
+
+
+# ======================================================
+# SŁOWNIK TEKSTÓW (KODY KATEGORII)
+# ======================================================
+
+def _typ_kodow(n):
+    """Typ kodów jak w pandas (coerce_indexer_dtype) – Categorical bez kopiowania."""
+    return 'b' if n < 127 else 'h' if n < 32767 else 'i'
+
+
+class Slownik:
+    """
+    Teksty powtarzalne (nazwa, materiał, oklejanie) trzymane raz; kolumna to
+    tablica małych kodów. Typ kodów rośnie razem z liczbą różnych wartości.
+    """
+    __slots__ = ("wartosci", "kody", "_indeks")
+
+    def __init__(self):
+        self.wartosci = []
+        self.kody = array('b')
+        self._indeks = {}
+
+    def dodaj(self, tekst):
+        kod = self._indeks.get(tekst)
+        if kod is None:
+            kod = self._indeks[tekst] = len(self.wartosci); self.wartosci.append(tekst)
+            if _typ_kodow(len(self.wartosci)) != self.kody.typecode:
+                self.kody = array(_typ_kodow(len(self.wartosci)), self.kody)
+        self.kody.append(kod)
+
+    def __getitem__(self, i):
+        return self.wartosci[self.kody[i]]
+
+    def dolacz(self, inny):
+        """Dopisuje kolumnę innego słownika (kody przeliczone wektorowo)."""
+        for t in inny.wartosci:
+            if t not in self._indeks:
+                self._indeks[t] = len(self.wartosci); self.wartosci.append(t)
+        if _typ_kodow(len(self.wartosci)) != self.kody.typecode:
+            self.kody = array(_typ_kodow(len(self.wartosci)), self.kody)
+        mapa = np.array([self._indeks[t] for t in inny.wartosci], dtype=self.kody.typecode)
+        if len(inny.kody): self.kody.frombytes(mapa[np.frombuffer(inny.kody, dtype=inny.kody.typecode)].tobytes())
+
+    def do_pandas(self):
+        import pandas as pd
+        return pd.Categorical.from_codes(np.frombuffer(self.kody, dtype=self.kody.typecode), self.wartosci, validate=False)
+
+
+# ======================================================
+# LISTA ELEMENTÓW
+# ======================================================
+
+class ListaElementow:
+    """
+    Lista formatek zapisana kolumnami: wymiary w tablicach liczbowych, teksty
+    jako kody słowników, wiercenia wszystkich formatek w jednej tablicy
+    OTWOR_DTYPE z offsetami (formatka i -> otwory[offsety[i]:offsety[i+1]]).
+    Położenie formatki w meblu (narożnik bryły x, y, z [mm], podgląd 3D) –
+    trzy liczby na formatkę, poza kolumnami tabeli.
+
+    Zachowuje się jak lista słowników z wcześniejszych wersji: lista[i],
+    iteracja i len() dają widoki Formatka z kluczami jak w KLUCZE.
+    Eksport (do_pandas) korzysta z tych samych buforów – po eksporcie listy
+    nie należy już rozbudowywać. Wyszukiwanie po ID (pozycja) i po tekstach
+    kolumn (grupy) idzie przez indeksy budowane leniwie, nie przez przegląd listy.
+    """
+    __slots__ = ("id", "nazwa", "material", "oklejanie", "orientacja", "szer", "wys", "gr",
+                 "polozenie", "offsety", "_otwory", "_czesci", "_indeks_id", "_grupy")
+
+    def __init__(self):
+        self.id = []
+        self.nazwa = Slownik(); self.material = Slownik(); self.oklejanie = Slownik(); self.orientacja = Slownik()
+        self.szer = array('i'); self.wys = array('i'); self.gr = array('d')
+        self.polozenie = array('d')
+        self.offsety = array('q', [0])
+        self._otwory = BRAK_OTWOROW
+        self._czesci = []   # wiercenia dodane od ostatniego scalenia
+        self._indeks_id = {}; self._grupy = {}   # indeksy wyszukiwania (dopisywane / liczone na nowo po dodaniu formatek)
+
+    def dodaj(self, ident, nazwa, szer, wys, gr, material, oklejanie, wiercenia=BRAK_OTWOROW, orientacja="L", polozenie=(0, 0, 0)):
+        self.id.append(ident); self.nazwa.dodaj(nazwa); self.material.dodaj(material)
+        self.oklejanie.dodaj(oklejanie); self.orientacja.dodaj(orientacja)
+        self.szer.append(int(round(szer))); self.wys.append(int(round(wys))); self.gr.append(gr)
+        self.polozenie.extend(polozenie)
+        if len(wiercenia): self._czesci.append(wiercenia)
+        self.offsety.append(self.offsety[-1] + len(wiercenia))
+
+    @classmethod
+    def polacz(cls, listy):
+        """Jedna lista z kilku (np. fragmenty projektu liczone osobno) – kolumnami, bez przechodzenia po formatkach."""
+        wynik = cls()
+        for lista in listy:
+            wynik.id += lista.id
+            for kol in ("nazwa", "material", "oklejanie", "orientacja"): getattr(wynik, kol).dolacz(getattr(lista, kol))
+            wynik.szer += lista.szer; wynik.wys += lista.wys; wynik.gr += lista.gr; wynik.polozenie += lista.polozenie
+            przes = np.frombuffer(lista.offsety, dtype='i8')[1:] + wynik.offsety[-1]
+            wynik.offsety.frombytes(przes.tobytes())
+            if len(lista.otwory): wynik._czesci.append(lista.otwory)
+        return wynik
+
+    @property
+    def otwory(self):
+        """Wszystkie otwory w jednej tablicy (scalane leniwie, raz)."""
+        if self._czesci:
+            self._otwory = np.concatenate([self._otwory] + self._czesci).astype(OTWOR_DTYPE, copy=False)
+            self._otwory.flags.writeable = False
+            self._czesci = []
+        return self._otwory
+
+    def wiercenia(self, i):
+        return self.otwory[self.offsety[i]:self.offsety[i + 1]]
+
+    def polozenia(self):
+        """Narożniki brył formatek [mm] – tablica (n, 3), widok bufora listy."""
+        return np.frombuffer(self.polozenie, dtype='f8').reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.id)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice): return [Formatka(self, j) for j in range(len(self))[i]]
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError(i)
+        return Formatka(self, i)
+
+    def __iter__(self):
+        return (Formatka(self, i) for i in range(len(self)))
+
+    def __getstate__(self):
+        return {k: getattr(self, k) for k in self.__slots__ if k not in ("_czesci", "_indeks_id", "_grupy")} | {"_otwory": self.otwory}
+
+    def __setstate__(self, stan):
+        for k, v in stan.items(): setattr(self, k, v)
+        self._czesci = []; self._indeks_id = {}; self._grupy = {}
+
+    # -------- Wyszukiwanie --------
+
+    def pozycja(self, ident):
+        """Nr formatki o danym ID (KeyError – brak). Indeks ID -> nr dopisywany o nowe formatki przy szukaniu."""
+        indeks = self._indeks_id
+        for i in range(len(indeks), len(self.id)):
+            if indeks.setdefault(self.id[i], i) != i: raise ValueError(f"Powtórzone ID formatki: {self.id[i]}")
+        return indeks[ident]
+
+    def grupy(self, kolumna):
+        """
+        Numery formatek wg tekstu kolumny ('nazwa', 'material', 'oklejanie',
+        'orientacja'): {tekst: tablica nr rosnąco}. Jedno sortowanie kodów
+        słownika; wynik pamiętany do dopisania kolejnych formatek.
+        """
+        wynik = self._grupy.get(kolumna)
+        if wynik is None or wynik[0] != len(self):
+            slownik = getattr(self, kolumna); kody = np.frombuffer(slownik.kody, dtype=slownik.kody.typecode)
+            kolej = np.argsort(kody, kind='stable'); granice = np.searchsorted(kody[kolej], np.arange(len(slownik.wartosci) + 1))
+            wynik = self._grupy[kolumna] = (len(self), {t: kolej[granice[k]:granice[k + 1]] for k, t in enumerate(slownik.wartosci)
+                                                        if granice[k + 1] > granice[k]})
+        return wynik[1]
+
+    def numery(self, kolumna, fragment):
+        """Numery formatek (rosnąco), których tekst kolumny zawiera fragment – z grup, bez przeglądu formatek."""
+        trafione = [nr for t, nr in self.grupy(kolumna).items() if fragment in t]
+        return np.sort(np.concatenate(trafione)) if trafione else np.empty(0, dtype='i8')
+
+    def maska(self, slownik, fragment):
+        """Maska formatek, których tekst w danej kolumnie (np. material) zawiera fragment."""
+        trafione = [k for k, t in enumerate(slownik.wartosci) if fragment in t]
+        return np.isin(np.frombuffer(slownik.kody, dtype=slownik.kody.typecode), trafione)
+
+    def pole_m2(self, material=""):
+        """Suma pól formatek [m2] z materiałem zawierającym podany fragment."""
+        m = self.maska(self.material, material)
+        szer = np.frombuffer(self.szer, dtype='i4'); wys = np.frombuffer(self.wys, dtype='i4')
+        return float(np.dot(szer[m].astype('f8'), wys[m])) / 1e6
+
+    def skrot(self):
+        """SHA-256 zawartości listy (teksty, wymiary, wiercenia) – klucz plików wyników na dysku (cache.dysk)."""
+        h = hashlib.sha256()
+        for teksty in (self.id, self.nazwa.wartosci, self.material.wartosci, self.oklejanie.wartosci, self.orientacja.wartosci):
+            h.update(b"%d\0" % len(teksty)); h.update("\0".join(teksty).encode("utf-8")); h.update(b"\1")
+        for kol in (self.nazwa, self.material, self.oklejanie, self.orientacja):
+            h.update(np.frombuffer(kol.kody, dtype=kol.kody.typecode).astype('i4').tobytes())
+        for kol in (self.szer, self.wys, self.gr, self.offsety): h.update(kol.tobytes())
+        h.update(self.otwory.tobytes())
+        return h.hexdigest()
+
+    # -------- Eksport --------
+
+    @mierzony("dataframe")
+    def do_pandas(self, wiercenia=False):
+        """
+        DataFrame z kolumnami KOLUMNY_TABELI. Kolumny liczbowe i kody tekstów
+        to widoki buforów listy (bez kopiowania); teksty jako Categorical.
+        wiercenia=True dokłada kolumny 'wiercenia' (widoki) i 'orientacja'.
+        """
+        import pandas as pd
+        kolumny = {
+            "ID": self.id, "Nazwa": self.nazwa.do_pandas(),
+            "Szerokość [mm]": np.frombuffer(self.szer, dtype='i4'), "Wysokość [mm]": np.frombuffer(self.wys, dtype='i4'),
+            "Grubość [mm]": np.frombuffer(self.gr, dtype='f8'),
+            "Materiał": self.material.do_pandas(), "Oklejanie": self.oklejanie.do_pandas(),
+        }
+        if wiercenia:
+            kolumny["wiercenia"] = [self.wiercenia(i) for i in range(len(self))]
+            kolumny["orientacja"] = self.orientacja.do_pandas()
+        return pd.DataFrame(kolumny, copy=False)
+
+    def do_csv(self, plik):
+        """Tabela do CSV (ścieżka albo otwarty plik tekstowy); grubość bez zbędnego '.0'."""
+        self.do_pandas().to_csv(plik, index=False, float_format="%g")
+
+
+class Formatka(Mapping):
+    """Widok jednej formatki – czyta się jak dawny słownik elementu."""
+    __slots__ = ("_lista", "_i")
+
+    def __init__(self, lista, i):
+        self._lista = lista; self._i = i
+
+    def __getitem__(self, klucz):
+        lista = self._lista; i = self._i
+        if klucz == "ID": return lista.id[i]
+        if klucz == "Nazwa": return lista.nazwa[i]
+        if klucz == "Szerokość [mm]": return lista.szer[i]
+        if klucz == "Wysokość [mm]": return lista.wys[i]
+        if klucz == "Grubość [mm]": return lista.gr[i]
+        if klucz == "Materiał": return lista.material[i]
+        if klucz == "Oklejanie": return lista.oklejanie[i]
+        if klucz == "wiercenia": return lista.wiercenia(i)
+        if klucz == "orientacja": return lista.orientacja[i]
+        raise KeyError(klucz)
+
+    def __iter__(self):
+        return iter(KLUCZE)
+
+    def __len__(self):
+        return len(KLUCZE)
+
+    def __repr__(self):
+        return f"Formatka({dict(self)!r})"
+
+    def __reduce__(self):
+        # Do innego procesu trafia sam element, nie cała lista
+        return dict, (dict(self),)
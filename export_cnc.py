@@ -1,7 +1,27 @@
 # export_cnc.py
-# Eksport listy elementów do CSV (STOLARZPRO)
+# Eksport dla maszyn CNC (STOLARZPRO): lista rozkroju, programy wierceń, plik zbiorczy
+#
+# Eksport jest strumieniowy: projekty podaje się po kolei (np. prosto z
+# generatora wsadowego), każdy jest zapisywany i zapominany – pamięć nie
+# rośnie z wielkością wsadu. Formaty to funkcje (kod_projektu, lista) ->
+# pary (ścieżka względna, tekst); nowy format dodaje się do FORMATY.
 
 import csv
+import io
+import os
+from typing import Callable, NamedTuple
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+from pomiary import mierzony
+from wiercenia import jako_otwory
+
+
+BUFOR = 1 << 16          # bufor zapisu plików [B]
+Z_BEZPIECZNE = 5.0       # wysokość przejazdu nad płytą [mm]
+POSUW = 1500             # posuw wiercenia [mm/min]
+OBROTY = 6000            # obroty wrzeciona [1/min]
 
 
 def export_cnc(korpus, filepath):
@@ -11,6 +31,163 @@ def export_cnc(korpus, filepath):
     with open(filepath, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f, delimiter=";")
         writer.writerow(["ID", "Nazwa", "Szerokość [mm]", "Wysokość [mm]", "Grubość [mm]", "Uwagi"])
-        
+
         for e in korpus.elementy:
             writer.writerow([e.id, e.nazwa, f"{e.szer:.1f}", f"{e.wys:.1f}", f"{e.gr:.1f}", e.uwagi])
+
+
+# ======================================================
+# FORMATY
+# ======================================================
+
+def _nazwa_pliku(tekst):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in tekst).strip("_") or "X"
+
+
+def _glebokosci(o, gr):
+    """Głębokości otworów; 0 (przelotowo) -> grubość płyty."""
+    return np.where(o['gl'] > 0, o['gl'], gr)
+
+
+def _csv_rozkroj(kod, lista):
+    """Lista rozkroju projektu (CSV ze średnikiem, jak export_cnc)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter=";", lineterminator="\n")
+    writer.writerow(["ID", "Nazwa", "Szerokość [mm]", "Wysokość [mm]", "Grubość [mm]", "Materiał", "Oklejanie", "Otwory"])
+    writer.writerows([el['ID'], el['Nazwa'], f"{el['Szerokość [mm]']:.1f}", f"{el['Wysokość [mm]']:.1f}", f"{el['Grubość [mm]']:.1f}",
+                      el['Materiał'], el['Oklejanie'], len(el['wiercenia'])] for el in lista)
+    yield f"{_nazwa_pliku(kod)}_rozkroj.csv", buf.getvalue()
+
+
+def _gcode(kod, lista):
+    """Program wierceń dla każdej formatki z otworami (G-code, cykl G81, narzędzie wg średnicy)."""
+    for el in lista:
+        o = jako_otwory(el['wiercenia'])
+        if not len(o): continue
+        linie = [f"(STOLARZPRO {kod} / {el['ID']} / {el['Nazwa']})",
+                 f"(FORMATKA {el['Szerokość [mm]']} x {el['Wysokość [mm]']} x {el['Grubość [mm]']:g})",
+                 "G21 G90 G17", f"G0 Z{Z_BEZPIECZNE:.1f}"]
+        fi_narzedzia = None
+        o = o[np.argsort(o['fi'], kind='stable')]   # jedna zmiana narzędzia na średnicę
+        for x, y, fi, gl in zip(o['x'].tolist(), o['y'].tolist(), o['fi'].tolist(), _glebokosci(o, el['Grubość [mm]']).tolist()):
+            if fi != fi_narzedzia:
+                if fi_narzedzia is not None: linie.append("G80")
+                fi_narzedzia = fi
+                linie += [f"(WIERTLO FI {fi:g})", f"T{int(round(fi * 10))} M6", f"S{OBROTY} M3"]
+                linie.append(f"G81 X{x:.2f} Y{y:.2f} Z{-gl:.2f} R{Z_BEZPIECZNE:.1f} F{POSUW}")
+            else:
+                linie.append(f"X{x:.2f} Y{y:.2f}")
+        linie += ["G80", f"G0 Z{Z_BEZPIECZNE:.1f}", "M5", "M30"]
+        yield os.path.join(_nazwa_pliku(kod), _nazwa_pliku(el['ID']) + ".nc"), "\n".join(linie) + "\n"
+
+
+def _xml(kod, lista):
+    """Program wierceń dla każdej formatki z otworami (XML: formatka + lista otworów)."""
+    for el in lista:
+        o = jako_otwory(el['wiercenia'])
+        if not len(o): continue
+        linie = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 f"<Formatka projekt={quoteattr(kod)} id={quoteattr(el['ID'])} nazwa={quoteattr(el['Nazwa'])} "
+                 f"dl=\"{el['Szerokość [mm]']}\" szer=\"{el['Wysokość [mm]']}\" gr=\"{el['Grubość [mm]']:g}\" material={quoteattr(el['Materiał'])}>"]
+        for x, y, typ, fi, gl in zip(o['x'].tolist(), o['y'].tolist(), o['typ'].tolist(), o['fi'].tolist(), _glebokosci(o, el['Grubość [mm]']).tolist()):
+            linie.append(f'  <Otwor x="{x:.2f}" y="{y:.2f}" fi="{fi:g}" gl="{gl:g}" typ="{typ}"/>')
+        linie.append("</Formatka>")
+        yield os.path.join(_nazwa_pliku(kod), _nazwa_pliku(el['ID']) + ".xml"), "\n".join(linie) + "\n"
+
+
+NAGLOWEK_WSADU = "Projekt;ID;Szerokość [mm];Wysokość [mm];Grubość [mm];X;Y;Fi;Gl;Typ\n"
+
+
+def _wsad(kod, lista):
+    """Wszystkie otwory całego wsadu w jednym pliku (wiersz na otwór, z wymiarami formatki)."""
+    wiersze = []
+    for el in lista:
+        o = jako_otwory(el['wiercenia'])
+        if not len(o): continue
+        pocz = f"{kod};{el['ID']};{el['Szerokość [mm]']};{el['Wysokość [mm]']};{el['Grubość [mm]']:g}"
+        for x, y, fi, gl, typ in zip(o['x'].tolist(), o['y'].tolist(), o['fi'].tolist(), _glebokosci(o, el['Grubość [mm]']).tolist(), o['typ'].tolist()):
+            wiersze.append(f"{pocz};{x:.2f};{y:.2f};{fi:g};{gl:g};{typ}\n")
+    if wiersze: yield "wsad_otwory.csv", "".join(wiersze)
+
+
+class Format(NamedTuple):
+    funkcja: Callable
+    zbiorczy: bool = False    # jeden wspólny plik dla całego wsadu
+    naglowek: str = ""        # zapisywany raz, na początku pliku zbiorczego
+
+
+FORMATY = {
+    "csv": Format(_csv_rozkroj),
+    "gcode": Format(_gcode),
+    "xml": Format(_xml),
+    "wsad": Format(_wsad, zbiorczy=True, naglowek=NAGLOWEK_WSADU),
+}
+
+
+# ======================================================
+# ZAPIS STRUMIENIOWY
+# ======================================================
+
+class EksporterCNC:
+    """
+    Zapisuje kolejne projekty w wybranych formatach do katalogu. Pliki
+    pojedyncze są otwierane, zapisywane jednym blokiem i zamykane; pliki
+    zbiorcze zostają otwarte (z buforem) do zamknięcia eksportera.
+
+        with EksporterCNC("cnc", ("csv", "gcode", "wsad")) as eks:
+            for kod, lista in projekty: eks.projekt(kod, lista)
+    """
+
+    def __init__(self, katalog, formaty=tuple(FORMATY)):
+        nieznane = [f for f in formaty if f not in FORMATY]
+        if nieznane: raise ValueError(f"Nieznany format CNC: {', '.join(nieznane)}")
+        self.katalog = katalog
+        self.formaty = tuple(formaty)
+        self.pliki = 0
+        self._zbiorcze = {}   # ścieżka -> otwarty plik
+        os.makedirs(katalog, exist_ok=True)
+
+    @mierzony("cnc.projekt")
+    def projekt(self, kod, lista, formaty=None):
+        for nazwa in formaty or self.formaty:
+            fmt = FORMATY[nazwa]
+            for sciezka, tekst in fmt.funkcja(kod, lista): self.zapisz(sciezka, tekst, fmt)
+
+    def zapisz(self, sciezka, tekst, fmt=Format(None)):
+        pelna = os.path.join(self.katalog, sciezka)
+        if fmt.zbiorczy:
+            f = self._zbiorcze.get(pelna)
+            if f is None:
+                f = self._zbiorcze[pelna] = open(pelna, "w", encoding="utf-8", newline="", buffering=BUFOR)
+                f.write(fmt.naglowek); self.pliki += 1
+            f.write(tekst)
+            return
+        os.makedirs(os.path.dirname(pelna), exist_ok=True)
+        with open(pelna, "w", encoding="utf-8", newline="", buffering=BUFOR) as f: f.write(tekst)
+        self.pliki += 1
+
+    def zamknij(self):
+        for f in self._zbiorcze.values(): f.close()
+        self._zbiorcze.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.zamknij()
+
+
+def fragmenty_zbiorcze(kod, lista, formaty):
+    """
+    Teksty formatów zbiorczych projektu – liczone w procesie roboczym,
+    dopisywane do wspólnego pliku w procesie głównym (EksporterCNC.zapisz).
+    """
+    return [(nazwa, sciezka, tekst) for nazwa in formaty if FORMATY[nazwa].zbiorczy
+            for sciezka, tekst in FORMATY[nazwa].funkcja(kod, lista)]
+
+
+def eksportuj_cnc(projekty, katalog, formaty=tuple(FORMATY)):
+    """Eksport strumienia par (kod_projektu, lista_elementow). Zwraca liczbę zapisanych plików."""
+    with EksporterCNC(katalog, formaty) as eks:
+        for kod, lista in projekty: eks.projekt(kod, lista)
+    return eks.pliki
@@ -1,44 +1,47 @@
 # export_pdf.py
 # Eksport listy elementów do PDF (STOLARZPRO)
 
-from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import A4
+NAGLOWKI = ["ID", "Nazwa", "Szerokość [mm]", "Wysokość [mm]", "Grubość [mm]", "Uwagi"]
+MARGINES = 72          # jak SimpleDocTemplate (1 cal)
+WIERSZ = 18            # wysokość wiersza tabeli [pt]
+ODSTEP = 6             # odstęp tekstu od krawędzi kolumny [pt]
 
 
 def export_pdf(korpus, filepath):
     """
-    Tworzy PDF z listą elementów mebla.
+    Tworzy PDF z listą elementów mebla. Strony zapisywane są do pliku
+    (lub strumienia z write()) na bieżąco – nagłówek tabeli na każdej stronie.
     """
+    # czcionki i zapis PDF dopiero przy eksporcie (szybszy start aplikacji)
+    from strumien_pdf import StrumienPDF
+    from wektor import A4_PION, czcionka, szerokosc
 
-    styles = getSampleStyleSheet()
-    doc = SimpleDocTemplate(filepath, pagesize=A4)
+    W, H = A4_PION
+    wiersze = ([e.id, e.nazwa, f"{e.szer:.1f}", f"{e.wys:.1f}", f"{e.gr:.1f}", e.uwagi] for e in korpus.elementy)
 
-    elements = []
-
-    # Tytuł
-    elements.append(Paragraph("STOLARZPRO – lista elementów", styles["Title"]))
-    elements.append(Spacer(1, 12))
-
-    # Nagłówki tabeli
-    data = [
-        ["ID", "Nazwa", "Szerokość [mm]", "Wysokość [mm]", "Grubość [mm]", "Uwagi"]
-    ]
-
-    # Dane
+    # Kolumny wg najdłuższego tekstu (jak Table z platypus), zwężane do szerokości strony
+    kolumny = [szerokosc(n, "sans", 10) for n in NAGLOWKI]
     for e in korpus.elementy:
-        data.append(
-            [
-                e.id,
-                e.nazwa,
-                f"{e.szer:.1f}",
-                f"{e.wys:.1f}",
-                f"{e.gr:.1f}",
-                e.uwagi,
-            ]
-        )
-
-    table = Table(data, repeatRows=1)
-    elements.append(table)
-
-    doc.build(elements)
+        for i, t in ((0, e.id), (1, e.nazwa), (5, e.uwagi)): kolumny[i] = max(kolumny[i], szerokosc(str(t), "sans", 10))
+    kolumny = [k + 2 * ODSTEP for k in kolumny]
+    # Przy zwężaniu czcionka maleje w tej samej skali – tekst nie wchodzi na sąsiednią kolumnę
+    skala = min(1.0, (W - 2 * MARGINES) / sum(kolumny)); kolumny = [k * skala for k in kolumny]; rozmiar = 10 * skala
+    x0 = (W - sum(kolumny)) / 2; xs = [x0 + sum(kolumny[:i]) for i in range(len(kolumny))]
+
+    with StrumienPDF(filepath) as pdf:
+        def strona(pierwsza):
+            pdf.strona(W, H); y = H - MARGINES
+            if pierwsza:
+                tytul = "STOLARZPRO – lista elementów"
+                pdf.tekst((W - szerokosc(tytul, "sans_b", 18)) / 2, y - 18, tytul, czcionka("sans_b"), 18); y -= 18 + 6 + 12
+            return wiersz(y, NAGLOWKI)
+
+        def wiersz(y, komorki):
+            for x, t in zip(xs, komorki): pdf.tekst(x + ODSTEP * skala, y - 13, str(t), czcionka("sans"), rozmiar)
+            return y - WIERSZ
+
+        y = strona(True)
+        for komorki in wiersze:
+            if y - WIERSZ < MARGINES: pdf.koniec_strony(); y = strona(False)
+            y = wiersz(y, komorki)
+        pdf.koniec_strony()
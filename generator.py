@@ -0,0 +1,531 @@
+# generator.py
+# Silnik generowania listy elementów STOLARZPRO (bez Streamlit / Matplotlib)
+
+import copy
+import json
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import accumulate, chain
+
+import numpy as np
+
+from constants import BAZA_SYSTEMOW, BAZA_ZAWIASOW
+from elementy import ListaElementow
+from pomiary import licznik, mierzony
+from wiercenia import BRAK_OTWOROW, FI_TYPOW, GL_TYPOW, OTWOR_DTYPE, TYPY, z_kodow, z_wzorow
+
+
+# ======================================================
+# SPECYFIKACJA PROJEKTU
+# ======================================================
+
+DOMYSLNY_PROJEKT = {
+    'kod_pro': "PROJEKT",
+    'h_mebla': 1000, 'w_mebla': 600, 'd_mebla': 300, 'gr_plyty': 18,
+    'il_przegrod': 0,
+    'typ_konstrukcji': "Wieńce Nakładane",
+    'typ_plecow': "HDF 3mm (Nakładane)",
+    'moduly_sekcji': {},
+    'system_prowadnic': "GTV Axis Pro",
+    'system_zawiasow': "Blum Clip Top",
+    'ceny': {'korpus': 50.0, 'front': 70.0, 'hdf': 15.0, 'okl': 2.0},
+}
+
+
+def normalizuj_projekt(data):
+    """
+    Zwraca kompletną specyfikację projektu w formacie export_project_to_json.
+    Brakujące pola uzupełnia wartościami domyślnymi, klucze sekcji rzutuje na int.
+    """
+    projekt = copy.deepcopy(DOMYSLNY_PROJEKT)
+    for k in projekt:
+        if k in data and data[k] is not None:
+            projekt[k] = copy.deepcopy(data[k])
+    projekt['ceny'] = {**DOMYSLNY_PROJEKT['ceny'], **(data.get('ceny') or {})}
+    projekt['il_przegrod'] = int(projekt['il_przegrod'])
+    projekt['moduly_sekcji'] = {int(k): v for k, v in projekt['moduly_sekcji'].items()}
+    return projekt
+
+
+# ======================================================
+# WYMIARY POCHODNE
+# ======================================================
+
+@dataclass(frozen=True)
+class Wymiary:
+    kod: str
+    h: float
+    w: float
+    d: float
+    gr: float
+    typ_konstrukcji: str
+    typ_plecow: str
+    il_przegrod: int
+    n_sekcji: int
+    wys_boku: float
+    szer_wienca: float
+    szer_wew_total: float
+    szer_wneki: float
+    wys_wew: float
+    gr_plecow: int
+    gleb_wew: float
+    params_szuflad: dict
+    params_zawias: dict
+
+
+def oblicz_wymiary(projekt):
+    h = projekt['h_mebla']; w = projekt['w_mebla']; d = projekt['d_mebla']; gr = projekt['gr_plyty']
+    tk = projekt['typ_konstrukcji']; tp = projekt['typ_plecow']
+    il_p = projekt['il_przegrod']; n_sekcji = il_p + 1
+
+    if "Wpuszczane" in tk:
+        wys_boku = h; szer_wienca = w - (2*gr) - (il_p*gr)
+        if il_p > 0: szer_wienca = w - (2*gr)
+        szer_wew_total = szer_wienca - (il_p*gr)
+    else:
+        wys_boku = h - (2*gr); szer_wienca = w
+        szer_wew_total = w - (2*gr) - (il_p*gr)
+
+    gr_plecow = 18 if "18mm" in tp else (16 if "16mm" in tp else 0)
+    return Wymiary(
+        kod=projekt['kod_pro'].upper().replace(" ", "_"),
+        h=h, w=w, d=d, gr=gr, typ_konstrukcji=tk, typ_plecow=tp,
+        il_przegrod=il_p, n_sekcji=n_sekcji,
+        wys_boku=wys_boku, szer_wienca=szer_wienca, szer_wew_total=szer_wew_total,
+        szer_wneki=szer_wew_total / n_sekcji if n_sekcji > 0 else 0,
+        wys_wew=h - (2*gr), gr_plecow=gr_plecow, gleb_wew=d - gr_plecow,
+        params_szuflad=BAZA_SYSTEMOW[projekt['system_prowadnic']],
+        params_zawias=BAZA_ZAWIASOW[projekt['system_zawiasow']],
+    )
+
+
+# ======================================================
+# FUNKCJE POMOCNICZE
+# ======================================================
+
+# Skróty początków nazw w ID (klucze jak po zamianie spacji na '_')
+SKROTY_ID = {"BOK_LEWY": "BOK_L", "BOK_PRAWY": "BOK_P", "WIENIEC_GÓRNY": "WIENIEC_G", "WIENIEC_DOLNY": "WIENIEC_D", "PRZEGRODA": "PRZEG",
+             "FRONT_SZUFLADY": "FR_SZUF", "DNO_SZUFLADY": "DNO_SZUF", "TYŁ_SZUFLADY": "TYL_SZUF"}
+
+
+@lru_cache(maxsize=4096)
+def _skrot_nazwy(nazwa_baza):
+    key = nazwa_baza.upper().replace(" ", "_")
+    return next((key.replace(k, v) for k, v in SKROTY_ID.items() if k in key), key)
+
+
+def get_unique_id(nazwa_baza, counts_dict, kod_projektu):
+    """
+    ID elementu: KOD_SKRÓT_NAZWY, a powtórzenia tej samej nazwy – KOD_SKRÓT_2, _3...
+    counts_dict (wspólny dla listy): wydane ID -> ostatni numer; ID nie powtarza
+    się nigdy i zależy tylko od kolejności elementów.
+    """
+    baza = f"{kod_projektu}_{_skrot_nazwy(nazwa_baza)}"
+    n = counts_dict.get(baza, 0); eid = baza
+    while eid in counts_dict: n += 1; eid = f"{baza}_{n}"
+    counts_dict[baza] = max(n, 1); counts_dict.setdefault(eid, 1)
+    return eid
+
+
+# Oklejane krawędzie wg opisu oklejania: (długie, krótkie) – do metrów bieżących okleiny
+KRAWEDZIE = {"4 krawędzie (2mm)": (2, 2), "1 Długa (Przód)": (1, 0), "1 Krótka (Przód)": (0, 1),
+             "1 Długa + 2 Krótkie (Przód+Góra+Dół)": (1, 2), "Brak": (0, 0), "Wg uznania": (0, 0)}
+
+
+def opisz_oklejanie(nazwa, szer_el, wys_el):
+    n = nazwa.upper()
+    if "FRONT" in n or "DRZWI" in n: return "4 krawędzie (2mm)"
+    elif "WIENIEC" in n or "PÓŁKA" in n or "PRZEGRODA" in n:
+        return "1 Długa (Przód)" if szer_el >= wys_el else "1 Krótka (Przód)"
+    elif "BOK" in n: return "1 Długa + 2 Krótkie (Przód+Góra+Dół)"
+    return "Brak" if "DNO" in n or "TYŁ" in n or "PLECY" in n else "Wg uznania"
+
+
+def wysokosc_auto(moduly, wys_wew):
+    """Wysokość modułu 'auto' – reszta wnętrza podzielona po równo."""
+    return (wys_wew - sum(m['wys_mm'] for m in moduly if m['wys_mode'] == 'fixed')) / max(1, sum(1 for m in moduly if m['wys_mode'] == 'auto'))
+
+
+# ======================================================
+# WIERCENIA
+# ======================================================
+
+# Role współrzędnej X otworu; wartość zależy od projektu i strony płyty (lustro)
+X_FRONT, X_TYL_PROWADNICY, X_TYL, X_TYL_PODPORKI, X_PLECY = range(5)
+
+
+def _numeruj(n):
+    """Dla liczności n (wektor) zwraca indeks grupy i numer w grupie, np. [2, 1] -> [0, 0, 1], [0, 1, 0]."""
+    grupa = np.repeat(np.arange(n.size), n)
+    return grupa, np.arange(grupa.size) - np.repeat(np.cumsum(n) - n, n)
+
+
+@mierzony("generator.wiercenia")
+def wiercenia_plyt(projekty):
+    """
+    Otwory wszystkich płyt pionowych dla wielu projektów naraz.
+
+    projekty – lista par (moduly_sekcji, Wymiary). Zwraca dla każdego projektu
+    listę tablic OTWOR_DTYPE: [bok lewy, bok prawy, przegroda 1, ...].
+
+    Wszystko liczone jest jednym przebiegiem na wektorach: moduły wszystkich
+    sekcji wszystkich projektów naraz. Wzorzec sekcji (Y, typ, rola X) liczony
+    jest raz i trafia na dwie płyty – bez lustra na płytę po lewej stronie
+    sekcji, z lustrem na płytę po prawej. Na końcu jedno sortowanie po
+    (płyta, Y, X); wyniki to widoki (wycinki) jednej wspólnej tablicy.
+    Jeden projekt (aplikacja, serwer, GeneratorPrzyrostowy) – _wiercenia_projektu.
+    """
+    if len(projekty) == 1: return [_wiercenia_projektu(*projekty[0])]
+    n_proj = len(projekty)
+    wym = [w for _, w in projekty]
+    D = np.array([w.d for w in wym], dtype='f8'); H = np.array([w.h for w in wym], dtype='f8')
+    GR = np.array([w.gr for w in wym], dtype='f8'); GP = np.array([w.gr_plecow for w in wym], dtype='f8')
+    OFF = np.array([w.params_szuflad["offset_prowadnica"] for w in wym], dtype='f8')
+    WPUSZ = np.array(["Wpuszczane" in w.typ_konstrukcji for w in wym])
+    N = np.array([w.n_sekcji for w in wym], dtype='i8')
+
+    # X każdej roli: [projekt, lustro, rola]
+    x_rol = np.empty((n_proj, 2, 5))
+    x_rol[:, 0] = np.column_stack((np.full(n_proj, 37.0), np.full(n_proj, 37.0+224.0), D-50.0, D-GP-50.0, D-(GP/2)))
+    x_rol[:, 1] = np.column_stack((D-37.0, D-(37.0+224.0), np.full(n_proj, 50.0), np.full(n_proj, 50.0), GP/2))
+
+    # Sekcje (globalnie numerowane) i płyty: projekt p ma N+1 płyt pionowych
+    sek_pocz = np.cumsum(N) - N; sek_proj = np.repeat(np.arange(n_proj), N)
+    sek_nr = np.arange(sek_proj.size) - sek_pocz[sek_proj]
+    plyta_pocz = np.cumsum(N + 1) - (N + 1)
+    # Lewa płyta sekcji s: bok lewy (0) albo przegroda s-1 (s+1); prawa: bok prawy (1) albo przegroda s (2+s)
+    plyta_l = plyta_pocz[sek_proj] + np.where(sek_nr == 0, 0, sek_nr + 1)
+    plyta_p = plyta_pocz[sek_proj] + np.where(sek_nr == N[sek_proj] - 1, 1, sek_nr + 2)
+
+    czesci = []   # (sekcja globalna, y, rola, kod typu: 0 blue, 1 red, 2 green)
+    # Konfirmaty wieńców wpuszczanych – w każdej sekcji
+    sw = np.flatnonzero(WPUSZ[sek_proj]); gr_ = GR[sek_proj[sw]]; h_ = H[sek_proj[sw]]
+    czesci.append((np.repeat(sw, 4), np.column_stack((gr_/2, gr_/2, h_-gr_/2, h_-gr_/2)).ravel(),
+                   np.tile([X_FRONT, X_TYL, X_FRONT, X_TYL], sw.size), 0))
+    # Konfirmaty pleców z płyty
+    n_pl = np.where(GP[sek_proj] > 0, (H[sek_proj]/400).astype('i8') + 2, 0)
+    s_, k = _numeruj(n_pl); p_ = sek_proj[s_]
+    yp = 50 + k*((H[p_]-100)/((H[p_]/400).astype('i8')+1))
+    ok = (yp > GR[p_]) & (yp < H[p_]-GR[p_])
+    czesci.append((s_[ok], yp[ok], X_PLECY, 0))
+
+    # Moduły: jeden wiersz na moduł (tylko sekcje istniejące w projekcie);
+    # wysokość i początek modułu liczone po kolei jak w montażu – dokładnie, bez sum wektorowych
+    wiersze = []
+    for p, (moduly_sekcji, w) in enumerate(projekty):
+        for nr in range(N[p]):
+            moduly = moduly_sekcji.get(nr, [])
+            ha = wysokosc_auto(moduly, w.wys_wew); y0 = w.gr
+            for j, m in enumerate(moduly):
+                hm = m['wys_mm'] if m['wys_mode'] == 'fixed' else ha; det = m['detale']
+                wiersze.append((sek_pocz[p] + nr, j > 0, m['typ'] == "Szuflady", m['typ'] == "Półki", hm, y0,
+                                bool(det.get('drzwi')), bool(det.get('fixed')), det.get('ilosc', 2 if m['typ'] == "Szuflady" else 1)))
+                y0 += hm + w.gr
+    if wiersze:
+        t = np.array(wiersze, dtype='f8')
+        sek = t[:, 0].astype('i8'); wm = t[:, 1] > 0; szuf = t[:, 2] > 0; polki = t[:, 3] > 0
+        hm = t[:, 4]; start = t[:, 5]; drzwi = t[:, 6] > 0; stale = t[:, 7] > 0; ilosc = t[:, 8].astype('i8')
+        proj = sek_proj[sek]; gr = GR[proj]
+
+        # Wieńce środkowe (między modułami)
+        czesci.append((np.repeat(sek[wm], 2), np.repeat(start[wm] - gr[wm]/2, 2), np.tile([X_FRONT, X_TYL], wm.sum()), 0))
+        # Zawiasy drzwi
+        czesci.append((np.repeat(sek[drzwi], 2), np.column_stack((start[drzwi]+100, start[drzwi]+hm[drzwi]-100)).ravel(), X_FRONT, 2))
+        # Prowadnice szuflad
+        m, k = _numeruj(ilosc[szuf]); m = np.flatnonzero(szuf)[m]
+        ys = start[m] + k*((hm[m]-(ilosc[m]-1)*3)/ilosc[m]+3) + 3 + OFF[proj[m]]
+        czesci.append((np.repeat(sek[m], 2), np.repeat(ys, 2), np.tile([X_FRONT, X_TYL_PROWADNICY], ys.size), 1))
+        # Półki: stałe na konfirmaty, ruchome na podpórki
+        m, k = _numeruj(ilosc[polki]); m = np.flatnonzero(polki)[m]
+        yp = start[m] + (k+1)*(hm[m]/(ilosc[m]+1))
+        czesci.append((np.repeat(sek[m], 2), np.repeat(yp, 2),
+                       np.column_stack((np.full(yp.size, X_FRONT), np.where(stale[m], X_TYL, X_TYL_PODPORKI))).ravel(),
+                       np.repeat(np.where(stale[m], 0, 2), 2)))
+
+    sek = np.concatenate([c[0] for c in czesci])
+    y = np.concatenate([c[1] for c in czesci])
+    rola = np.concatenate([np.broadcast_to(np.asarray(c[2], dtype='i1'), c[1].shape) for c in czesci])
+    kod = np.concatenate([np.broadcast_to(np.asarray(c[3], dtype='i1'), c[1].shape) for c in czesci])
+
+    # Każdy otwór sekcji trafia na płytę po lewej (bez lustra) i po prawej (lustro)
+    proj = sek_proj[sek]
+    plyta = np.concatenate((plyta_l[sek], plyta_p[sek]))
+    x = np.concatenate((x_rol[proj, 0, rola], x_rol[proj, 1, rola]))
+    kod = np.concatenate((kod, kod)); gl = GL_TYPOW[kod]
+    gl = np.where(gl > 0, gl, np.concatenate((GR[proj], GR[proj])))   # przelotowe – na grubość płyty
+    wszystkie = z_kodow(x, np.concatenate((y, y)), kod, grupa=plyta, gl=gl)
+
+    granice = np.searchsorted(np.sort(plyta), np.arange(int((N + 1).sum()) + 1))
+    return [[wszystkie[granice[i]:granice[i + 1]] for i in range(plyta_pocz[p], plyta_pocz[p] + N[p] + 1)]
+            for p in range(n_proj)]
+
+
+# Kod otworu we wzorcu sekcji: 3*rola X + kod typu (0 blue, 1 red, 2 green)
+_KF0, _KF1, _KF2 = 3.0*X_FRONT, 3.0*X_FRONT + 1, 3.0*X_FRONT + 2
+_KTP1, _KT0, _KTPP2, _KP0 = 3.0*X_TYL_PROWADNICY + 1, 3.0*X_TYL, 3.0*X_TYL_PODPORKI + 2, 3.0*X_PLECY
+
+
+def _wzorzec_sekcji(moduly, w):
+    """
+    Otwory jednej sekcji jako płaska lista [Y, kod, Y, kod, ...] (kod: 3*rola X +
+    typ, wszystko float – jedna szybka konwersja do tablicy). Rodzaje otworów
+    w kolejności jak w wiercenia_plyt.
+    """
+    gr = w.gr; h = w.h; off = w.params_szuflad["offset_prowadnica"]
+    wzorzec = []
+    if "Wpuszczane" in w.typ_konstrukcji:
+        wzorzec += (gr/2, _KF0, gr/2, _KT0, h-gr/2, _KF0, h-gr/2, _KT0)
+    if w.gr_plecow > 0:
+        n = int(h/400)
+        for k in range(n + 2):
+            yp = 50 + k*((h-100)/(n+1))
+            if gr < yp < h-gr: wzorzec += (yp, _KP0)
+    wience = []; zawiasy = []; prowadnice = []; polki = []
+    ha = wysokosc_auto(moduly, w.wys_wew); y0 = gr
+    for j, m in enumerate(moduly):
+        hm = m['wys_mm'] if m['wys_mode'] == 'fixed' else ha; det = m['detale']
+        ilosc = det.get('ilosc', 2 if m['typ'] == "Szuflady" else 1)
+        if j > 0: wience += (y0 - gr/2, _KF0, y0 - gr/2, _KT0)
+        if det.get('drzwi'): zawiasy += (y0+100, _KF2, y0+hm-100, _KF2)
+        if m['typ'] == "Szuflady":
+            krok = (hm-(ilosc-1)*3)/ilosc+3
+            for k in range(ilosc):
+                ys = y0 + k*krok + 3 + off; prowadnice += (ys, _KF1, ys, _KTP1)
+        elif m['typ'] == "Półki":
+            kf, kt = (_KF0, _KT0) if det.get('fixed') else (_KF2, _KTPP2)
+            for k in range(ilosc):
+                yp = y0 + (k+1)*(hm/(ilosc+1)); polki += (yp, kf, yp, kt)
+        y0 += hm + gr
+    return wzorzec + wience + zawiasy + prowadnice + polki
+
+
+@lru_cache(maxsize=256)
+def _otwory_kodow(d, gp, gr):
+    """
+    Wzór otworu (bez Y) dla każdego kodu: 15*lustro + kod wzorca sekcji. Zależy
+    tylko od głębokości, pleców i płyty – tablica wspólna, tylko do odczytu.
+    """
+    k = np.arange(30); typ = k % 3
+    x_rol = np.array(((37.0, 37.0+224.0, d-50.0, d-gp-50.0, d-(gp/2)), (d-37.0, d-(37.0+224.0), 50.0, 50.0, gp/2)))
+    o = np.zeros(30, dtype=OTWOR_DTYPE)
+    o['x'] = x_rol[k // 15, k % 15 // 3]; o['typ'] = TYPY[typ]; o['fi'] = FI_TYPOW[typ]
+    gl = GL_TYPOW[typ]; o['gl'] = np.where(gl > 0, gl, gr)   # przelotowe – na grubość płyty
+    o.flags.writeable = False
+    return o
+
+
+def _wiercenia_projektu(moduly_sekcji, w):
+    """
+    wiercenia_plyt dla jednego projektu. Wzorce sekcji liczone w pętli Pythona,
+    otwory brane z gotowych wzorów kodów (_otwory_kodow), jedno sortowanie – przy
+    kilkuset otworach narzut kilkudziesięciu operacji wektorowych wiercenia_plyt
+    byłby większy niż same obliczenia. Wynik (też kolejność otworów o równych
+    Y, X) jak z wiercenia_plyt.
+    """
+    n = w.n_sekcji
+    wzorce = [_wzorzec_sekcji(moduly_sekcji.get(s, []), w) for s in range(n)]
+    # Jak w wiercenia_plyt: najpierw wszystkie otwory bez lustra (płyta z lewej sekcji), potem z lustrem (z prawej)
+    t = np.fromiter(chain.from_iterable(wzorce), dtype='f8').reshape(-1, 2); t = np.concatenate((t, t))
+    kod = t[:, 1].astype('i8'); kod[len(t) // 2:] += 15; dl = [len(wz) // 2 for wz in wzorce]
+    o = z_wzorow(_otwory_kodow(float(w.d), float(w.gr_plecow), float(w.gr)), kod, t[:, 0],
+                 grupa=np.repeat([0] + list(range(2, n + 1)) + list(range(2, n + 1)) + [1], dl + dl))
+    # Płyty po kolei: bok lewy, bok prawy, przegrody (z prawej strony sekcji i i z lewej strony i+1)
+    granice = list(accumulate([0, dl[0], dl[-1]] + [dl[i] + dl[i + 1] for i in range(n - 1)]))
+    return [o[granice[i]:granice[i + 1]] for i in range(n + 1)]
+
+
+def gen_wiercenia_boku(moduly, wym, is_mirror=False):
+    """
+    Otwory boku/przegrody dla modułów jednej sekcji jako tablica OTWOR_DTYPE
+    (posortowana po Y, X). Dla całego projektu używa się wiercenia_plyt.
+    """
+    jedna = replace(wym, il_przegrod=0, n_sekcji=1)
+    return wiercenia_plyt([({0: moduly}, jedna)])[0][1 if is_mirror else 0]
+
+
+# ======================================================
+# GENERATOR LISTY ELEMENTÓW
+# ======================================================
+
+def _korpus(wym, plyty):
+    """
+    Elementy korpusu: (nazwa, szer, wys, gr, materiał, wiercenia, orientacja,
+    położenie); plyty – z wiercenia_plyt. Położenie to narożnik bryły formatki
+    (x, y, z) [mm] – X w prawo, Y w górę, Z = 0 tył korpusu, Z = d lico.
+    """
+    W_MEBLA = wym.w; H_MEBLA = wym.h; D_MEBLA = wym.d; GR_PLYTY = wym.gr; GR_PLECOW = wym.gr_plecow
+    TYP_PLECOW = wym.typ_plecow; ILOSC_PRZEGROD = wym.il_przegrod
+    GLEBOKOSC_WEWNETRZNA = wym.gleb_wew; WYS_WEWNETRZNA = wym.wys_wew; SZER_JEDNEJ_WNEKI = wym.szer_wneki
+    wpusz = "Wpuszczane" in wym.typ_konstrukcji
+    y_boku = 0 if wpusz else GR_PLYTY; x_wienca = GR_PLYTY if wpusz else 0
+    wiersze = []
+
+    if "HDF" in TYP_PLECOW: wiersze.append(("Plecy (HDF)", W_MEBLA-4, H_MEBLA-4, 3, "3mm HDF", BRAK_OTWOROW, "X", (2, 2, -3)))
+    elif GR_PLECOW > 0: wiersze.append(("Plecy (Płyta)", (W_MEBLA if "Nakładane" in wym.typ_konstrukcji else wym.szer_wew_total+(ILOSC_PRZEGROD*GR_PLYTY)), WYS_WEWNETRZNA, GR_PLECOW, f"{GR_PLECOW}mm KORPUS", BRAK_OTWOROW, "X",
+                                        (GR_PLYTY if wpusz else 0, GR_PLYTY, 0)))
+    wiersze.append(("Bok Lewy", D_MEBLA, wym.wys_boku, GR_PLYTY, "18mm KORPUS", plyty[0], "L", (0, y_boku, 0)))
+    wiersze.append(("Bok Prawy", D_MEBLA, wym.wys_boku, GR_PLYTY, "18mm KORPUS", plyty[1], "P", (W_MEBLA-GR_PLYTY, y_boku, 0)))
+    wiersze.append(("Wieniec Górny", wym.szer_wienca, GLEBOKOSC_WEWNETRZNA, GR_PLYTY, "18mm KORPUS", BRAK_OTWOROW, "L", (x_wienca, H_MEBLA-GR_PLYTY, GR_PLECOW)))
+    wiersze.append(("Wieniec Dolny", wym.szer_wienca, GLEBOKOSC_WEWNETRZNA, GR_PLYTY, "18mm KORPUS", BRAK_OTWOROW, "L", (x_wienca, 0, GR_PLECOW)))
+    for i in range(ILOSC_PRZEGROD): wiersze.append((f"Przegroda {i+1}", D_MEBLA, WYS_WEWNETRZNA, GR_PLYTY, "18mm KORPUS", plyty[2+i], "L",
+                                                    (GR_PLYTY + (i+1)*SZER_JEDNEJ_WNEKI + i*GR_PLYTY, GR_PLYTY, 0)))
+    return wiersze
+
+
+def _sekcja(i, moduly, wym):
+    """Elementy wnętrza sekcji i (wieńce środkowe, drzwi, szuflady, półki) – jak w _korpus, bez wierceń."""
+    SZER_JEDNEJ_WNEKI = wym.szer_wneki; GLEBOKOSC_WEWNETRZNA = wym.gleb_wew; GR_PLYTY = wym.gr; GR_PLECOW = wym.gr_plecow; D_MEBLA = wym.d
+    wiersze = []; dodaj = lambda *w: wiersze.append(w[:5] + (BRAK_OTWOROW,) + w[5:])
+    ha = wysokosc_auto(moduly, wym.wys_wew)
+    cx = GR_PLYTY + i*(SZER_JEDNEJ_WNEKI + GR_PLYTY); y0 = GR_PLYTY   # lewy dolny narożnik wnęki
+    for idx, mod in enumerate(moduly):
+        if idx > 0:
+            dodaj(f"Wieniec Środkowy (Sekcja {i+1})", SZER_JEDNEJ_WNEKI, GLEBOKOSC_WEWNETRZNA, GR_PLYTY, "18mm KORPUS", "L", (cx, y0, GR_PLECOW)); y0 += GR_PLYTY
+        hm = mod['wys_mm'] if mod['wys_mode'] == 'fixed' else ha; det = mod['detale']
+        if det.get('drzwi'): dodaj(f"Drzwi (Sekcja {i+1})", SZER_JEDNEJ_WNEKI-4, hm-4, 18, "18mm FRONT", "L", (cx+2, y0+2, D_MEBLA))
+        if mod['typ'] == "Szuflady":
+            hf = (hm - ((det.get('ilosc')-1)*3)) / det.get('ilosc')
+            zf = D_MEBLA - 23 if det.get('drzwi') else D_MEBLA   # szuflady wewnętrzne – za drzwiami
+            for k in range(det.get('ilosc')):
+                yf = y0 + k*(hf + 3)
+                dodaj(f"Front Szuflady {k+1} (Sekcja {i+1})", SZER_JEDNEJ_WNEKI-4, hf, 18, "18mm KORPUS" if det.get('drzwi') else "18mm FRONT", "D", (cx+2, yf, zf))
+                dodaj(f"Dno Szuflady {k+1} (Sekcja {i+1})", SZER_JEDNEJ_WNEKI-71, 476, 3, "3mm HDF", "D", (cx+71/2, yf+15, zf-476))
+                dodaj(f"Tył Szuflady {k+1} (Sekcja {i+1})", SZER_JEDNEJ_WNEKI-83, 150, 16, "16mm BIAŁA", "D", (cx+83/2, yf+18, zf-476))
+        elif mod['typ'] == "Półki":
+            wp = SZER_JEDNEJ_WNEKI - (0 if det.get('fixed') else 2)
+            if det.get('drzwi') and not det.get('fixed'): wp -= 10
+            dp = GLEBOKOSC_WEWNETRZNA if det.get('fixed') else (GLEBOKOSC_WEWNETRZNA - 20)
+            for k in range(det.get('ilosc')): dodaj(f"{'Półka Stała' if det.get('fixed') else 'Półka Ruchoma'} {k+1} (Sekcja {i+1})", wp, dp, 18, "18mm KORPUS", "L",
+                                                    (cx + (SZER_JEDNEJ_WNEKI-wp)/2, y0 + (k+1)*(hm/(det.get('ilosc')+1)), GR_PLECOW))
+        y0 += hm
+    return wiersze
+
+
+def _do_listy(lista, wiersze, kod, counts_dict):
+    for nazwa, szer, wys, gr, mat, wiercenia, ori, pol in wiersze:
+        lista.dodaj(get_unique_id(nazwa, counts_dict, kod), nazwa, szer, wys, gr, mat, opisz_oklejanie(nazwa, szer, wys), wiercenia, ori, pol)
+
+
+@mierzony("generator.lista")
+def run_generator(projekt, _wym=None, _plyty=None):
+    """
+    Buduje listę elementów (ListaElementow – elementy czytane jak słowniki
+    z zakładki LISTA, z kluczami 'wiercenia' i 'orientacja') dla
+    znormalizowanej specyfikacji projektu.
+    """
+    wym = _wym or oblicz_wymiary(projekt)
+    moduly_sekcji = projekt['moduly_sekcji']
+    plyty = _plyty or wiercenia_plyt([(moduly_sekcji, wym)])[0]
+    lista_elementow = ListaElementow(); counts_dict = {}
+    _do_listy(lista_elementow, _korpus(wym, plyty), wym.kod, counts_dict)
+    for i in range(wym.n_sekcji): _do_listy(lista_elementow, _sekcja(i, moduly_sekcji.get(i, []), wym), wym.kod, counts_dict)
+    return lista_elementow
+
+
+@mierzony("generator.wsad")
+def run_generator_wsadowo(projekty):
+    """Listy elementów wielu projektów; wiercenia liczone jednym przebiegiem dla wszystkich."""
+    wymiary = [oblicz_wymiary(p) for p in projekty]
+    plyty = wiercenia_plyt([(p['moduly_sekcji'], w) for p, w in zip(projekty, wymiary)])
+    return [run_generator(p, w, pl) for p, w, pl in zip(projekty, wymiary, plyty)]
+
+
+class GeneratorPrzyrostowy:
+    """
+    run_generator z pamięcią między wywołaniami – do edycji projektu w aplikacji.
+
+    Elementy sekcji zależą tylko od jej modułów (i wymiarów mebla), wiercenia
+    boku/przegrody – od modułów sekcji po obu stronach płyty. Po zmianie
+    sekcji i liczone są więc tylko: jej wnętrze i dwie sąsiednie płyty.
+    Zmiana wymiarów mebla (Wymiary) liczy wszystko od nowa. Trzymane są tylko
+    fragmenty użyte w ostatnim wywołaniu.
+    """
+
+    def __init__(self):
+        self._wym = None
+        self._sekcje = {}   # (nr, klucz modułów) -> fragment ListaElementow
+        self._plyty = {}    # (rodzaj, klucze modułów sekcji obok) -> otwory
+        self.przeliczone = {"sekcje": 0, "plyty": 0}
+
+    @mierzony("generator.przyrostowy")
+    def generuj(self, projekt):
+        wym = oblicz_wymiary(projekt)
+        if wym != self._wym: self._wym = wym; self._sekcje = {}; self._plyty = {}
+        moduly = [projekt['moduly_sekcji'].get(i, []) for i in range(wym.n_sekcji)]
+        klucze = [json.dumps(m, sort_keys=True) for m in moduly]
+
+        # Płyty pionowe: bok lewy, bok prawy, przegrody – klucz to sekcje, które je wiercą
+        potrzebne = [("L", klucze[0]), ("P", klucze[-1])] + [("Z", klucze[i], klucze[i+1]) for i in range(wym.il_przegrod)]
+        brakujace = list(dict.fromkeys(k for k in potrzebne if k not in self._plyty))
+        if brakujace:
+            jedna = replace(wym, il_przegrod=0, n_sekcji=1); dwie = replace(wym, il_przegrod=1, n_sekcji=2)
+            wejscie = []
+            for k in brakujace:
+                if k[0] == "Z": wejscie.append(({0: json.loads(k[1]), 1: json.loads(k[2])}, dwie))
+                else: wejscie.append(({0: json.loads(k[1])}, jedna))
+            for k, plyty in zip(brakujace, wiercenia_plyt(wejscie)):
+                self._plyty[k] = plyty[{"L": 0, "P": 1, "Z": 2}[k[0]]]
+        self._plyty = {k: self._plyty[k] for k in potrzebne}
+
+        # Sekcje: gotowe fragmenty listy (z ID i oklejaniem), łączone kolumnami. Numery ID
+        # liczone w obrębie fragmentu: nazwy zawierają nr sekcji, więc fragmenty nie dzielą
+        # ID i wynik jest taki sam jak z run_generator (jeden counts_dict na listę)
+        sekcje = {}
+        for i, (m, k) in enumerate(zip(moduly, klucze)):
+            if (i, k) in self._sekcje: sekcje[(i, k)] = self._sekcje[(i, k)]; continue
+            sekcje[(i, k)] = fragment = ListaElementow()
+            _do_listy(fragment, _sekcja(i, m, wym), wym.kod, {})
+        self.przeliczone = {"sekcje": len(sekcje.keys() - self._sekcje.keys()), "plyty": len(brakujace)}
+        licznik("generator.sekcje_przeliczone", self.przeliczone["sekcje"]); licznik("generator.plyty_przeliczone", len(brakujace))
+        self._sekcje = sekcje
+
+        korpus = ListaElementow()
+        _do_listy(korpus, _korpus(wym, [self._plyty[k] for k in potrzebne]), wym.kod, {})
+        return ListaElementow.polacz([korpus, *sekcje.values()])
+
+
+# ======================================================
+# INSTRUKCJA MONTAŻU (TEKST)
+# ======================================================
+
+def okucia(projekt):
+    """Liczba okuć projektu (szt.; prowadnice w parach) – lista zakupowa i kosztorys."""
+    wym = oblicz_wymiary(projekt)
+    konf = 0; wkr = 0; prow = 0; zaw = 0
+    if "Wpuszczane" in wym.typ_konstrukcji: konf += 8 + (4 * wym.il_przegrod)
+    if "Płyta" in wym.typ_plecow: konf += 4 * (int(wym.h/400)+1)
+    for s in projekt['moduly_sekcji'].values():
+        if len(s) > 1: konf += 4 * (len(s)-1)
+        for m in s:
+            if m['typ']=="Półki" and m['detale'].get('fixed'): konf+=4*m['detale'].get('ilosc')
+            if m['typ']=="Szuflady": wkr+=8*m['detale'].get('ilosc'); prow+=m['detale'].get('ilosc')
+            if m['detale'].get('drzwi'): wkr+=8; zaw+=2
+    if "HDF" in wym.typ_plecow: wkr += int((2*wym.h + 2*wym.w)/150)
+    return {'konfirmaty': konf, 'wkrety': wkr, 'prowadnice': prow, 'zawiasy': zaw}
+
+
+def generuj_instrukcje_tekst(projekt):
+    wym = oblicz_wymiary(projekt); o = okucia(projekt)
+
+    return f"""INSTRUKCJA MONTAŻU: {wym.kod}
+------------------------------------------------------------
+LISTA ZAKUPOWA (SZACUNEK):
+[ ] Konfirmaty: ok. {o['konfirmaty']} szt.
+[ ] Wkręty 3.5x16: ok. {o['wkrety']} szt.
+------------------------------------------------------------
+KROK 0: TRASOWANIE
+1. Użyj rysunków PDF do zaznaczenia linii przerywanych na bokach.
+2. Przecięcia linii to punkty wiercenia.
+
+KROK 1: WIERCENIE
+1. Punkty NIEBIESKIE: Wierć przelotowo (fi 5/7mm) pod konfirmaty.
+2. Punkty CZERWONE/ZIELONE: Puntuj (fi 2mm) pod wkręty.
+
+KROK 2: MONTAŻ BOKÓW
+1. Przykręć prowadnice i zawiasy do leżących boków.
+
+KROK 3: SKŁADANIE KORPUSU
+1. Skręć wieńce z bokami. Sprawdź kąty.
+
+KROK 4: FINAŁ
+1. Montaż pleców i frontów."""
@@ -0,0 +1,197 @@
+# kolizje.py
+# Kontrola wierceń STOLARZPRO: nachodzące i za bliskie otwory, otwory przy krawędzi, prowadnica przy zawiasie
+#
+#   from kolizje import sprawdz, tabela
+#   wynik = sprawdz(lista)                  # tablica KOLIZJA_DTYPE (pusta – bez uwag)
+#   st.dataframe(tabela([lista], wynik))
+#
+#   python kolizje.py tydzien.jsonl -o kolizje.csv   -> cały wsad, kod wyjścia 1 przy kolizjach
+#
+# Przegroda dostaje wzorce z obu sąsiednich sekcji (wiercenia_plyt), a okucia
+# różnych modułów nie wiedzą o sobie – kolizje wychodziły dopiero na CNC.
+# Otwory wszystkich płyt wsadu trafiają do jednej siatki o boku równym
+# największej sprawdzanej odległości: klucz komórki (płyta, kx, ky), jedno
+# sortowanie, a sąsiednie komórki wyszukiwane binarnie (searchsorted) – O(n log n),
+# porównywane są tylko otwory tej samej płyty w sąsiednich komórkach.
+
+import argparse
+import csv
+import json
+import sys
+
+import numpy as np
+
+from constants import FI_OTWOROW, MIN_MOSTEK, MIN_OD_KRAWEDZI, ODSTEPY_OKUC
+from pomiary import licznik, mierzony
+from wiercenia import TYPY
+
+# Rodzaj uwagi -> opis (tabela, CSV)
+RODZAJE = {
+    "duplikat": "Ten sam otwór dwa razy",
+    "nakladanie": "Otwory nachodzą na siebie",
+    "mostek": "Za mało materiału między otworami",
+    "okucia": "Prowadnica koliduje z zawiasem / podpórką",
+    "krawedz": "Otwór za blisko krawędzi",
+}
+KOLUMNY = ("ID", "Nazwa", "Uwaga", "Otwory", "X [mm]", "Y [mm]", "X2 [mm]", "Y2 [mm]", "Odległość [mm]", "Wymagana [mm]")
+DUPLIKAT = 0.5   # [mm] otwory tego samego typu bliżej niż to – jeden otwór wpisany dwa razy
+
+# Jedna uwaga: projekt (nr na liście), płyta (nr formatki w projekcie), środki otworów (x2, y2 – drugi otwór
+# pary; dla 'krawedz' NaN), typy otworów, odległość środków (krawedz: materiał do krawędzi) i wymagana
+KOLIZJA_DTYPE = np.dtype([('projekt', 'i4'), ('plyta', 'i4'), ('rodzaj', 'U10'), ('x', 'f8'), ('y', 'f8'),
+                          ('x2', 'f8'), ('y2', 'f8'), ('typy', 'U11'), ('odleglosc', 'f4'), ('wymagana', 'f4')])
+
+
+def _macierz_odstepow():
+    """Minimalna odległość środków otworów dla par typów (kolejność TYPY) z ODSTEPY_OKUC."""
+    m = np.zeros((len(TYPY), len(TYPY)))
+    indeks = {t: i for i, t in enumerate(TYPY)}
+    for (a, b), odl in ODSTEPY_OKUC.items(): m[indeks[a], indeks[b]] = m[indeks[b], indeks[a]] = odl
+    return m
+
+
+ODSTEPY = _macierz_odstepow()
+# Bok komórki siatki: największa odległość, przy której para otworów może być uwagą
+ZASIEG = max(max(FI_OTWOROW.values()) + MIN_MOSTEK, ODSTEPY.max())
+
+
+# ======================================================
+# INDEKS PRZESTRZENNY (SIATKA)
+# ======================================================
+
+def _zakresy(dlugosci):
+    """Dla bloków o długościach n: indeks bloku i pozycja w bloku każdego elementu."""
+    blok = np.repeat(np.arange(dlugosci.size), dlugosci)
+    return blok, np.arange(blok.size) - np.repeat(np.cumsum(dlugosci) - dlugosci, dlugosci)
+
+
+def pary_blisko(plyta, x, y, r):
+    """
+    Pary (i, j), i < j, punktów tej samej płyty odległych o mniej niż r, i ich
+    odległości. Siatka o boku r: para leży w tej samej albo sąsiedniej komórce,
+    więc wystarczy pięć przesunięć (komórka i połowa sąsiadów – każda para raz).
+    """
+    pusta = (np.empty(0, dtype='i8'), np.empty(0, dtype='i8'), np.empty(0))
+    if x.size < 2: return pusta
+    kx = np.floor(x / r).astype('i8'); ky = np.floor(y / r).astype('i8')
+    kx -= kx.min() - 1; ky -= ky.min() - 1   # sąsiedzi (kx±1, ky±1) w granicach płyty – klucze płyt rozłączne
+    nx = int(kx.max()) + 2; ny = int(ky.max()) + 2
+    klucz = (plyta.astype('i8') * nx + kx) * ny + ky
+    kolej = np.argsort(klucz, kind='stable'); posort = klucz[kolej]
+    wszystkie_i = []; wszystkie_j = []
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        sasiad = klucz + dx * ny + dy
+        od = np.searchsorted(posort, sasiad, 'left'); n = np.searchsorted(posort, sasiad, 'right') - od
+        i, k = _zakresy(n); j = kolej[od[i] + k]
+        if dx == dy == 0: i, j = i[i < j], j[i < j]
+        wszystkie_i.append(i); wszystkie_j.append(j)
+    i = np.concatenate(wszystkie_i); j = np.concatenate(wszystkie_j); i, j = np.minimum(i, j), np.maximum(i, j)
+    d = np.hypot(x[i] - x[j], y[i] - y[j]); blisko = d < r
+    return i[blisko], j[blisko], d[blisko]
+
+
+# ======================================================
+# KONTROLA
+# ======================================================
+
+@mierzony("kolizje")
+def sprawdz_wsadowo(listy):
+    """
+    Uwagi do wierceń wszystkich formatek list (ListaElementow, np. cały wsad
+    z run_generator_wsadowo) jednym przebiegiem – tablica KOLIZJA_DTYPE,
+    posortowana po projekcie, płycie i położeniu.
+    """
+    if not listy: return np.empty(0, dtype=KOLIZJA_DTYPE)
+    n_formatek = np.array([len(l) for l in listy], dtype='i8')
+    pocz = np.cumsum(n_formatek) - n_formatek
+    o = np.concatenate([l.otwory for l in listy])
+    szer = np.concatenate([np.frombuffer(l.szer, dtype='i4') for l in listy]).astype('f8')
+    wys = np.concatenate([np.frombuffer(l.wys, dtype='i4') for l in listy]).astype('f8')
+    # Płyta (globalnie) każdego otworu z offsetów list
+    plyta = np.concatenate([np.repeat(np.arange(len(l)) + p, np.diff(np.frombuffer(l.offsety, dtype='i8')))
+                            for l, p in zip(listy, pocz)]).astype('i8')
+    x = o['x']; y = o['y']; fi = o['fi'].astype('f8')
+    kod = (o['typ'][:, None] == TYPY).argmax(axis=1)
+
+    # Otwory przy krawędzi (i poza płytą): materiał od brzegu otworu do najbliższej krawędzi
+    material = np.minimum.reduce([x, szer[plyta] - x, y, wys[plyta] - y]) - fi / 2
+    kr = np.flatnonzero(material < MIN_OD_KRAWEDZI)
+
+    # Pary otworów: nakładanie, mostek, okucia
+    i, j, d = pary_blisko(plyta, x, y, ZASIEG)
+    r = (fi[i] + fi[j]) / 2
+    wymagana = np.maximum(r + MIN_MOSTEK, ODSTEPY[kod[i], kod[j]])
+    zle = d < wymagana; i, j, d, r, wymagana = i[zle], j[zle], d[zle], r[zle], wymagana[zle]
+    rodzaj = np.where((d < DUPLIKAT) & (kod[i] == kod[j]), "duplikat",
+                      np.where(d < r, "nakladanie", np.where(d < r + MIN_MOSTEK, "mostek", "okucia")))
+
+    wynik = np.empty(kr.size + i.size, dtype=KOLIZJA_DTYPE)
+    gp = np.concatenate((plyta[kr], plyta[i]))
+    wynik['projekt'] = np.searchsorted(pocz, gp, 'right') - 1
+    wynik['plyta'] = gp - pocz[wynik['projekt']]
+    wynik['rodzaj'] = np.concatenate((np.full(kr.size, "krawedz"), rodzaj))
+    wynik['x'] = np.concatenate((x[kr], x[i])); wynik['y'] = np.concatenate((y[kr], y[i]))
+    wynik['x2'] = np.concatenate((np.full(kr.size, np.nan), x[j])); wynik['y2'] = np.concatenate((np.full(kr.size, np.nan), y[j]))
+    wynik['typy'] = np.concatenate((o['typ'][kr], np.char.add(np.char.add(o['typ'][i], "/"), o['typ'][j])))
+    wynik['odleglosc'] = np.concatenate((material[kr], d)); wynik['wymagana'] = np.concatenate((np.full(kr.size, MIN_OD_KRAWEDZI), wymagana))
+    wynik = wynik[np.lexsort((wynik['x'], wynik['y'], wynik['plyta'], wynik['projekt']))]
+    licznik("kolizje.otwory", o.size); licznik("kolizje.uwagi", wynik.size)
+    return wynik
+
+
+def sprawdz(lista):
+    """Uwagi do wierceń jednej listy elementów (projekt lub zlecenie)."""
+    return sprawdz_wsadowo([lista])
+
+
+def tabela(listy, wynik, projekty=None):
+    """Wiersze uwag (do st.dataframe / CSV) z ID i nazwą formatki; projekty – nazwy projektów wsadu."""
+    wiersze = []
+    for k in wynik:
+        lista = listy[k['projekt']]; el = lista[int(k['plyta'])]
+        wiersz = {} if projekty is None else {"Projekt": projekty[k['projekt']]}
+        wiersz.update(zip(KOLUMNY, (el['ID'], el['Nazwa'], RODZAJE[k['rodzaj']], k['typy'], round(float(k['x']), 1), round(float(k['y']), 1),
+                                    None if np.isnan(k['x2']) else round(float(k['x2']), 1), None if np.isnan(k['y2']) else round(float(k['y2']), 1),
+                                    round(float(k['odleglosc']), 1), round(float(k['wymagana']), 1))))
+        wiersze.append(wiersz)
+    return wiersze
+
+
+# ======================================================
+# CLI (WSAD)
+# ======================================================
+
+def main(argv=None):
+    from batch import czytaj_zadania
+    from generator import normalizuj_projekt, run_generator_wsadowo
+    from zlecenie import jest_zleceniem, lista_zlecenia, normalizuj_zlecenie
+
+    parser = argparse.ArgumentParser(description="STOLARZPRO – kontrola wierceń wsadu (kolizje otworów, krawędzie, okucia)")
+    parser.add_argument("wejscie", help="katalog z plikami .json, plik .jsonl lub '-' (stdin), jak w batch.py")
+    parser.add_argument("-o", "--wyjscie", default="-", help="plik CSV z uwagami (domyślnie: stdout)")
+    args = parser.parse_args(argv)
+
+    projekty = []; nazwy = []; listy = []
+    for _, zrodlo, tekst in czytaj_zadania(args.wejscie):
+        dane = json.loads(tekst)
+        if jest_zleceniem(dane): listy.append(lista_zlecenia(normalizuj_zlecenie(dane))); nazwy.append(zrodlo)
+        else: projekty.append(normalizuj_projekt(dane)); nazwy.append(zrodlo); listy.append(None)
+    # Projekty (nie zlecenia) generowane razem – wiercenia jednym przebiegiem
+    wygenerowane = iter(run_generator_wsadowo(projekty))
+    listy = [l if l is not None else next(wygenerowane) for l in listy]
+
+    wynik = sprawdz_wsadowo(listy)
+    wiersze = tabela(listy, wynik, nazwy)
+    wyj = sys.stdout if args.wyjscie == "-" else open(args.wyjscie, "w", newline="", encoding="utf-8-sig")
+    try:
+        if wiersze:
+            writer = csv.DictWriter(wyj, fieldnames=list(wiersze[0])); writer.writeheader(); writer.writerows(wiersze)
+    finally:
+        if wyj is not sys.stdout: wyj.close()
+    rodzaje = dict(zip(*np.unique(wynik['rodzaj'], return_counts=True)))
+    print(f"Projekty: {len(listy)}, uwagi: {wynik.size}" + "".join(f", {r}: {n}" for r, n in rodzaje.items()), file=sys.stderr)
+    return 1 if wynik.size else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
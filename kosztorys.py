@@ -0,0 +1,135 @@
+# kosztorys.py
+# Kosztorys STOLARZPRO: płyta (arkusze z rozkroju), okleina (metry bieżące krawędzi), okucia
+#
+# Wycena rozdzielona na ilości i ceny. Ilości projektu (wektor POZYCJE) zależą
+# tylko od geometrii – liczone raz (np. przez batch.py --kosztorys), a ceny to
+# wektor w tej samej kolejności. Ponowna wycena tysięcy projektów po zmianie
+# cennika to jedno mnożenie macierzy:
+#
+#   python kosztorys.py wyniki/kosztorys.csv --ceny cennik.json [--ceny cennik2.json] -o wyceny.csv
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from constants import CENY_OKUC
+from generator import DOMYSLNY_PROJEKT, KRAWEDZIE
+
+# Pozycje kosztorysu: (klucz ilości, nazwa, jednostka, klucz ceny)
+POZYCJE = (("plyta_korpus_m2", "Płyta korpusowa", "m2", "korpus"),
+           ("plyta_front_m2", "Płyta frontowa", "m2", "front"),
+           ("plyta_hdf_m2", "HDF", "m2", "hdf"),
+           ("okleina_mb", "Okleina", "mb", "okl"),
+           ("konfirmaty", "Konfirmaty", "szt", "konfirmaty"),
+           ("wkrety", "Wkręty 3.5x16", "szt", "wkrety"),
+           ("prowadnice", "Prowadnice", "kpl", "prowadnice"),
+           ("zawiasy", "Zawiasy", "szt", "zawiasy"))
+ILOSCI = tuple(p[0] for p in POZYCJE)
+PLYTA = {"korpus": 0, "front": 1, "hdf": 2}   # rodzaj materiału -> pozycja
+
+
+def rodzaj_materialu(material):
+    """Rodzaj płyty w cenniku ('korpus', 'front', 'hdf') wg nazwy materiału."""
+    if "HDF" in material: return "hdf"
+    return "front" if "FRONT" in material else "korpus"
+
+
+# ======================================================
+# ILOŚCI
+# ======================================================
+
+def mb_okleiny(lista):
+    """Metry bieżące okleiny każdej formatki: krawędzie długie i krótkie wg KRAWEDZIE (wektorowo)."""
+    kr = np.array([KRAWEDZIE.get(t, (0, 0)) for t in lista.oklejanie.wartosci], dtype='f8').reshape(-1, 2)
+    kody = np.frombuffer(lista.oklejanie.kody, dtype=lista.oklejanie.kody.typecode)
+    szer = np.frombuffer(lista.szer, dtype='i4'); wys = np.frombuffer(lista.wys, dtype='i4')
+    return (kr[kody, 0] * np.maximum(szer, wys) + kr[kody, 1] * np.minimum(szer, wys)) / 1000
+
+
+def okleina_materialow(lista):
+    """Materiał -> metry bieżące okleiny."""
+    if not len(lista): return {}
+    kody = np.frombuffer(lista.material.kody, dtype=lista.material.kody.typecode)
+    mb = np.bincount(kody, weights=mb_okleiny(lista), minlength=len(lista.material.wartosci))
+    return dict(zip(lista.material.wartosci, mb.tolist()))
+
+
+def ilosci(lista, rozkroje, okucia):
+    """
+    Wektor ilości (kolejność POZYCJE): płyta w całych nowych arkuszach z rozkroju
+    (materiał -> WynikRozkroju; resztki z magazynu bez kosztu), okleina z listy,
+    okucia ze słownika generator.okucia.
+    """
+    q = np.zeros(len(POZYCJE))
+    for m, wynik in rozkroje.items(): q[PLYTA[rodzaj_materialu(m)]] += sum(a.w * a.h for a in wynik.kupione) / 1e6
+    q[3] = mb_okleiny(lista).sum()
+    for i, (klucz, *_) in enumerate(POZYCJE[4:], 4): q[i] = okucia.get(klucz, 0)
+    return q
+
+
+def suma_okuc(lista_okuc):
+    """Okucia kilku szafek (zlecenie) razem."""
+    wynik = {}
+    for o in lista_okuc:
+        for k, n in o.items(): wynik[k] = wynik.get(k, 0) + n
+    return wynik
+
+
+# ======================================================
+# CENY
+# ======================================================
+
+def wektor_cen(ceny):
+    """Ceny w kolejności POZYCJE: płyta i okleina z cennika projektu, okucia z cennika lub CENY_OKUC."""
+    ceny = {**DOMYSLNY_PROJEKT['ceny'], **CENY_OKUC, **(ceny or {})}
+    return np.array([float(ceny[p[3]]) for p in POZYCJE])
+
+
+def wycena(q, ceny):
+    """Wiersze kosztorysu (do st.dataframe) – pozycje z niezerową ilością."""
+    c = wektor_cen(ceny)
+    return [{"Pozycja": nazwa, "Ilość": round(float(q[i]), 2), "Jedn.": jedn, "Cena [zł]": c[i], "Wartość [zł]": round(float(q[i] * c[i]), 2)}
+            for i, (_, nazwa, jedn, _) in enumerate(POZYCJE) if q[i]]
+
+
+def wyceny_wsadowo(Q, cenniki):
+    """Koszty wielu projektów wg wielu cenników: macierz (projekty x POZYCJE) @ (POZYCJE x cenniki)."""
+    return np.asarray(Q, dtype='f8').reshape(-1, len(POZYCJE)) @ np.column_stack([wektor_cen(c) for c in cenniki])
+
+
+# ======================================================
+# PONOWNA WYCENA (CLI)
+# ======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STOLARZPRO – ponowna wycena projektów z zapisanych ilości (batch.py --kosztorys)")
+    parser.add_argument("ilosci", help="plik kosztorys.csv z batch.py")
+    parser.add_argument("--ceny", action="append", required=True, help="cennik JSON (klucze jak 'ceny' projektu i CENY_OKUC); można podać kilka")
+    parser.add_argument("-o", "--wyjscie", default="-", help="plik CSV z wycenami (domyślnie: stdout)")
+    args = parser.parse_args(argv)
+
+    with open(args.ilosci, newline="", encoding="utf-8-sig") as f: wiersze = list(csv.DictReader(f))
+    Q = np.array([[float(w[k] or 0) for k in ILOSCI] for w in wiersze]).reshape(-1, len(ILOSCI))
+    cenniki = []
+    for plik in args.ceny:
+        with open(plik, encoding="utf-8") as f: cenniki.append(json.load(f))
+    koszty = wyceny_wsadowo(Q, cenniki)
+    kolumny = [f"koszt_{os.path.splitext(os.path.basename(p))[0]}" for p in args.ceny]
+
+    wyj = sys.stdout if args.wyjscie == "-" else open(args.wyjscie, "w", newline="", encoding="utf-8-sig")
+    try:
+        writer = csv.writer(wyj)
+        writer.writerow(["nr", "projekt"] + kolumny)
+        for w, k in zip(wiersze, koszty): writer.writerow([w.get("nr", ""), w.get("projekt", "")] + [f"{v:.2f}" for v in k])
+    finally:
+        if wyj is not sys.stdout: wyj.close()
+    for kol, suma in zip(kolumny, koszty.sum(axis=0)): print(f"{kol}: {suma:.2f} zł ({len(wiersze)} projektów)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+# magazyn.py
+# Magazyn resztek płyt (SQLite) i rozkrój z resztkami dla STOLARZPRO
+#
+#   python magazyn.py stan                          -> resztki wg materiału
+#   python magazyn.py dodaj "18mm KORPUS" 18 900 450 -> ręczne przyjęcie resztki
+#   (batch.py --kosztorys --magazyn resztki.sqlite  -> rozkrój wsadu z resztkami)
+#
+# Resztka to prostokąt płyty (materiał, grubość, długość >= szerokość) po
+# wcześniejszych zleceniach. Rozkrój najpierw układa formatki na pasujących
+# resztkach, nowy arkusz otwiera dopiero, gdy formatka nie mieści się w żadnej;
+# zużyte resztki znikają z magazynu, a wolne pola rozkroju nie mniejsze niż
+# RESZTKA_MIN_DL x RESZTKA_MIN_SZER są do niego dopisywane. Indeks
+# (material, gr, dl * szer) – resztki czytane są od najmniejszej wprost
+# z indeksu, a LIMIT kończy przegląd przy pierwszych pasujących, bez
+# sortowania wszystkich kandydatów, także przy dziesiątkach tysięcy resztek.
+
+import argparse
+import os
+import sqlite3
+import time
+
+from constants import ARKUSZ_H, ARKUSZ_W, RESZTKA_MIN_DL, RESZTKA_MIN_SZER, RZAZ
+from nesting import rozkroj
+from pomiary import licznik, mierzony
+
+
+ZMIENNA = "STOLARZPRO_MAGAZYN"   # plik bazy; domyślnie ~/.stolarzpro/resztki.sqlite
+LIMIT_RESZTEK = 200              # najwięcej resztek branych do jednego rozkroju
+ZAPAS = 1.25                     # pole resztki liczone na formatkę z zapasem na straty ułożenia
+
+SCHEMAT = """
+CREATE TABLE IF NOT EXISTS resztki (
+    id INTEGER PRIMARY KEY,
+    material TEXT NOT NULL,
+    gr REAL NOT NULL,
+    dl INTEGER NOT NULL,
+    szer INTEGER NOT NULL,
+    zrodlo TEXT NOT NULL DEFAULT '',
+    dodano REAL NOT NULL
+);
+DROP INDEX IF EXISTS resztki_wymiary;
+CREATE INDEX IF NOT EXISTS resztki_pole ON resztki (material, gr, dl * szer);
+"""
+
+
+def sciezka_domyslna():
+    return os.environ.get(ZMIENNA, os.path.join(os.path.expanduser("~"), ".stolarzpro", "resztki.sqlite"))
+
+
+# ======================================================
+# MAGAZYN
+# ======================================================
+
+class MagazynResztek:
+    """
+    Resztki w pliku SQLite (WAL – odczyt nie blokuje zapisu). Rozkrój z
+    magazynem (rozkroj_z_magazynu) rezerwuje resztki (wybór i usunięcie w jednej
+    krótkiej transakcji), więc równoległe procesy (pula batch.py) nie wezmą tej
+    samej resztki, a blokada zapisu nie trwa przez cały rozkrój. Połączenie –
+    jedno na proces/wątek (with MagazynResztek(...) as m).
+    """
+
+    def __init__(self, sciezka=None):
+        self.sciezka = sciezka or sciezka_domyslna()
+        if self.sciezka != ":memory:": os.makedirs(os.path.dirname(os.path.abspath(self.sciezka)), exist_ok=True)
+        self._db = sqlite3.connect(self.sciezka, timeout=60, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMAT)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.zamknij()
+
+    def zamknij(self):
+        self._db.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM resztki").fetchone()[0]
+
+    def _transakcja(self):
+        return _Transakcja(self._db)
+
+    # -------- Zapis --------
+
+    def dodaj(self, material, gr, w, h, zrodlo=""):
+        """Przyjęcie resztki (wymiary w dowolnej kolejności); zwraca jej id."""
+        with self._transakcja():
+            return self._dodaj([(material, gr, w, h, zrodlo)])[0]
+
+    def _dodaj(self, resztki):
+        teraz = time.time(); ids = []
+        for material, gr, w, h, zrodlo in resztki:
+            kursor = self._db.execute("INSERT INTO resztki (material, gr, dl, szer, zrodlo, dodano) VALUES (?, ?, ?, ?, ?, ?)",
+                                      (material, float(gr), int(max(w, h)), int(min(w, h)), zrodlo, teraz))
+            ids.append(kursor.lastrowid)
+        return ids
+
+    def _zarezerwuj(self, ids):
+        """Usuwa resztki z magazynu; zwraca ich pełne wiersze (do _zwroc)."""
+        wiersze = [self._db.execute("SELECT id, material, gr, dl, szer, zrodlo, dodano FROM resztki WHERE id = ?", (i,)).fetchone() for i in ids]
+        self._db.executemany("DELETE FROM resztki WHERE id = ?", [(i,) for i in ids])
+        return wiersze
+
+    def _zwroc(self, wiersze):
+        """Przywraca zarezerwowane, niezużyte resztki (z dotychczasowym id)."""
+        self._db.executemany("INSERT INTO resztki (id, material, gr, dl, szer, zrodlo, dodano) VALUES (?, ?, ?, ?, ?, ?, ?)", wiersze)
+
+    # -------- Odczyt --------
+
+    def pasujace(self, material, gr, min_dl=0, min_szer=0, limit=LIMIT_RESZTEK):
+        """Resztki materiału o wymiarach co najmniej min_dl x min_szer, od najmniejszej: [(id, dl, szer)]."""
+        # Kolejność indeksu resztki_pole (pole, potem rowid = id); mniejsze pola pominięte zakresem indeksu
+        return self._db.execute(
+            "SELECT id, dl, szer FROM resztki INDEXED BY resztki_pole "
+            "WHERE material = ? AND gr = ? AND dl * szer >= ? AND dl >= ? AND szer >= ? ORDER BY dl * szer, id LIMIT ?",
+            (material, float(gr), int(min_dl) * int(min_szer), int(min_dl), int(min_szer), limit)).fetchall()
+
+    def najmniejsza(self, material, gr, min_dl, min_szer, pomin=()):
+        """Najmniejsza resztka mieszcząca min_dl x min_szer, poza pomin: (id, dl, szer) albo None."""
+        for wiersz in self.pasujace(material, gr, min_dl, min_szer, limit=len(pomin) + 1):
+            if wiersz[0] not in pomin: return wiersz
+        return None
+
+    def stan(self):
+        """Wiersz na materiał i grubość: liczba resztek i ich pole [m2]."""
+        return [{"Materiał": m, "Grubość [mm]": gr, "Resztki": n, "Pole [m2]": round(pole / 1e6, 3)} for m, gr, n, pole in self._db.execute(
+            "SELECT material, gr, COUNT(*), SUM(dl * szer) FROM resztki GROUP BY material, gr ORDER BY material, gr")]
+
+
+class _Transakcja:
+    """BEGIN IMMEDIATE … COMMIT (ROLLBACK przy wyjątku) – blokada zapisu od początku."""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __enter__(self):
+        self._db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, typ, *_):
+        self._db.execute("ROLLBACK" if typ else "COMMIT")
+
+
+# ======================================================
+# ROZKRÓJ Z RESZTKAMI
+# ======================================================
+
+def odpady(arkusz, rzaz=RZAZ, min_dl=RESZTKA_MIN_DL, min_szer=RESZTKA_MIN_SZER):
+    """
+    Użyteczne odpady arkusza po rozkroju: wolne pola bez rzazu, nie mniejsze niż
+    min_dl x min_szer. Pola maxrects mogą się nakładać – brane od największego,
+    z pominięciem nakładających się na już wybrane. Zwraca [(w, h)].
+    """
+    wynik = []; wybrane = []
+    for x, y, w, h in sorted(arkusz.wolne, key=lambda p: -p[2] * p[3]):
+        uw = w - rzaz; uh = h - rzaz
+        if max(uw, uh) < min_dl or min(uw, uh) < min_szer: continue
+        if any(x < bx + bw and bx < x + w and y < by + bh and by < y + h for bx, by, bw, bh in wybrane): continue
+        wybrane.append((x, y, w, h)); wynik.append((uw, uh))
+    return wynik
+
+
+def _wybierz_resztki(magazyn, formatki, material, gr, rzaz, obrot=True):
+    """
+    Resztki dla formatek (best fit): formatki od największej; każda trafia do
+    już wybranej resztki, jeśli się w niej mieści i zostało w niej pole (z
+    zapasem ZAPAS), inaczej do najmniejszej mieszczącej ją resztki z magazynu.
+    Formatka bez pasującej resztki pójdzie na nowy arkusz. Zwraca [(id, dl, szer)].
+    """
+    wybrane = {}; wolne = {}
+    for e in sorted(formatki, key=lambda e: e['w'] * e['h'], reverse=True):
+        if obrot and e.get('obrot', True): dl = max(e['w'], e['h']); szer = min(e['w'], e['h'])
+        else: dl = e['w']; szer = e['h']
+        pole = (e['w'] + rzaz) * (e['h'] + rzaz) * ZAPAS
+        rid = next((i for i, (_, rdl, rszer) in wybrane.items() if rdl >= dl and rszer >= szer and wolne[i] >= pole), None)
+        if rid is None:
+            wiersz = magazyn.najmniejsza(material, gr, dl, szer, pomin=wybrane)
+            if wiersz is None: continue
+            rid = wiersz[0]; wybrane[rid] = wiersz; wolne[rid] = (wiersz[1] + rzaz) * (wiersz[2] + rzaz)
+        wolne[rid] -= pole
+    return list(wybrane.values())
+
+
+@mierzony("magazyn.rozkroj")
+def rozkroj_z_magazynu(magazyn, formatki, material, gr, zrodlo="", arkusz_w=ARKUSZ_W, arkusz_h=ARKUSZ_H, rzaz=RZAZ, **opcje):
+    """
+    Rozkrój (jak nesting.rozkroj) najpierw na resztkach materiału z magazynu,
+    dobieranych formatka po formatce (_wybierz_resztki). Wybrane resztki są
+    rezerwowane (usuwane) w krótkiej transakcji, rozkrój idzie bez blokady
+    bazy, a w drugiej transakcji wracają niezużyte resztki i są przyjmowane
+    odpady wszystkich arkuszy wyniku (zrodlo: np. kod zlecenia).
+    """
+    if not formatki: return rozkroj(formatki, arkusz_w, arkusz_h, rzaz, **opcje)
+    with magazyn._transakcja():
+        wiersze = magazyn._zarezerwuj([rid for rid, _, _ in _wybierz_resztki(magazyn, formatki, material, gr, rzaz, opcje.get("obrot", True))])
+    try:
+        wynik = rozkroj(formatki, arkusz_w, arkusz_h, rzaz, resztki=[{"w": w[3], "h": w[4], "id": w[0]} for w in wiersze], **opcje)
+    except BaseException:
+        with magazyn._transakcja(): magazyn._zwroc(wiersze)
+        raise
+    zuzyte = {a.resztka for a in wynik.arkusze if a.resztka is not None}
+    nowe = [(material, gr, w, h, zrodlo) for a in wynik.arkusze for w, h in odpady(a, rzaz)]
+    with magazyn._transakcja():
+        magazyn._zwroc([w for w in wiersze if w[0] not in zuzyte])
+        magazyn._dodaj(nowe)
+    licznik("magazyn.resztki_zuzyte", len(zuzyte)); licznik("magazyn.resztki_nowe", len(nowe))
+    return wynik
+
+
+# ======================================================
+# CLI
+# ======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STOLARZPRO – magazyn resztek płyt")
+    parser.add_argument("--baza", default=None, help=f"plik SQLite (domyślnie: {ZMIENNA} albo ~/.stolarzpro/resztki.sqlite)")
+    polecenia = parser.add_subparsers(dest="polecenie", required=True)
+    polecenia.add_parser("stan", help="resztki wg materiału i grubości")
+    dodaj = polecenia.add_parser("dodaj", help="przyjmij resztkę")
+    dodaj.add_argument("material", help="materiał jak w liście elementów, np. '18mm KORPUS'")
+    dodaj.add_argument("gr", type=float, help="grubość [mm]")
+    dodaj.add_argument("w", type=int, help="wymiar [mm]")
+    dodaj.add_argument("h", type=int, help="wymiar [mm]")
+    args = parser.parse_args(argv)
+
+    with MagazynResztek(args.baza) as magazyn:
+        if args.polecenie == "dodaj":
+            print(f"Resztka {magazyn.dodaj(args.material, args.gr, args.w, args.h, 'ręcznie')}: {args.material} {max(args.w, args.h)}x{min(args.w, args.h)}")
+        else:
+            for w in magazyn.stan(): print(f"{w['Materiał']:<20} {w['Grubość [mm]']:>5g} mm  {w['Resztki']:>6} szt.  {w['Pole [m2]']:>9.3f} m2")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
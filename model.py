@@ -8,13 +8,14 @@ from constants import (
     LUZ_POLKA,
     COF_PLECY,
 )
+from wiercenia import BRAK_OTWOROW
 
 
 # ======================================================
 # ELEMENT
 # ======================================================
 
-@dataclass
+@dataclass(slots=True)
 class Element:
     id: str
     nazwa: str
@@ -22,7 +23,10 @@ class Element:
     wys: float
     gr: float
     uwagi: str = ""
-    wiercenia: list = field(default_factory=list)
+    wiercenia: object = field(default=None)   # tablica OTWOR_DTYPE
+
+    def __post_init__(self):
+        if self.wiercenia is None: self.wiercenia = BRAK_OTWOROW   # wspólna pusta, tylko do odczytu
 
 
 # ======================================================
@@ -38,6 +42,7 @@ class Korpus:
         self.gr = gr
         self.przegrody = przegrody
         self.elementy: list[Element] = []
+        self._numery = {}   # prefiks ID -> ostatni numer
 
     # -------- Wymiary wewnętrzne --------
 
@@ -52,8 +57,10 @@ class Korpus:
     # -------- Dodawanie elementów --------
 
     def _next_id(self, nazwa):
-        idx = sum(1 for e in self.elementy if e.nazwa == nazwa) + 1
-        return f"{self.kod}-{nazwa[:3].upper()}-{idx}"
+        # Numer liczony na prefiks (nie na pełną nazwę): "Bok Lewy" i "Bok Prawy" to BOK-1 i BOK-2
+        prefiks = f"{self.kod}-{nazwa[:3].upper()}"
+        idx = self._numery[prefiks] = self._numery.get(prefiks, 0) + 1
+        return f"{prefiks}-{idx}"
 
     def dodaj(self, nazwa, szer, wys, gr, uwagi=""):
         eid = self._next_id(nazwa)
@@ -0,0 +1,210 @@
+# nesting.py
+# Optymalizacja rozkroju płyt (gilotyna / maxrects) dla STOLARZPRO
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+
+from constants import ARKUSZ_W, ARKUSZ_H, RZAZ
+from pomiary import mierzony
+
+
+METODY = ("guillotine", "maxrects")
+
+
+# ======================================================
+# STRUKTURY WYNIKU
+# ======================================================
+
+@dataclass
+class Ulozenie:
+    nazwa: str
+    x: float
+    y: float
+    w: float          # wymiar na arkuszu (po ewentualnym obrocie), bez rzazu
+    h: float
+    obrocona: bool = False
+
+
+@dataclass
+class Arkusz:
+    w: float
+    h: float
+    ulozenia: list = field(default_factory=list)
+    resztka: object = None   # id resztki z magazynu (magazyn.py); None – nowy arkusz
+    wolne: list = field(default_factory=list)   # wolne pola po rozkroju (x, y, w, h), z rzazem
+
+    @property
+    def pole_uzyte(self):
+        return sum(u.w * u.h for u in self.ulozenia)
+
+    @property
+    def uzysk(self):
+        """Procent powierzchni arkusza zajęty przez formatki."""
+        return 100.0 * self.pole_uzyte / (self.w * self.h)
+
+
+@dataclass
+class WynikRozkroju:
+    arkusze: list
+    nieulozone: list   # formatki większe niż arkusz
+
+    @property
+    def liczba_arkuszy(self):
+        return len(self.arkusze)
+
+    @property
+    def kupione(self):
+        """Nowe arkusze (bez resztek z magazynu) – do kosztu płyty."""
+        return [a for a in self.arkusze if a.resztka is None]
+
+    @property
+    def uzysk(self):
+        if not self.arkusze: return 0.0
+        return 100.0 * sum(a.pole_uzyte for a in self.arkusze) / sum(a.w * a.h for a in self.arkusze)
+
+
+# ======================================================
+# WOLNE PROSTOKĄTY (INDEKS PO POLU, WSPÓLNY DLA ARKUSZY)
+# ======================================================
+
+class _WolnePola:
+    """
+    Wolne prostokąty wszystkich arkuszy w jednej liście posortowanej po
+    polu (bisect). Szukanie miejsca zaczyna się od pierwszego pola nie
+    mniejszego niż formatka, więc za małe pola i pełne arkusze nie są
+    w ogóle przeglądane. Dodatkowo każdy arkusz zna swoje wolne pola
+    (potrzebne przy podziale w maxrects).
+    """
+    __slots__ = ("klucze", "arkusze", "_nr")
+
+    def __init__(self):
+        self.klucze = []      # (pole, nr, arkusz, x, y, w, h)
+        self.arkusze = []     # arkusz -> {nr: klucz}
+        self._nr = 0
+
+    def nowy_arkusz(self, w, h):
+        self.arkusze.append({})
+        self.dodaj(len(self.arkusze) - 1, 0, 0, w, h)
+        return len(self.arkusze) - 1
+
+    def dodaj(self, ark, x, y, w, h):
+        self._nr += 1
+        k = (w * h, self._nr, ark, x, y, w, h)
+        insort(self.klucze, k)
+        self.arkusze[ark][self._nr] = k
+
+    def usun(self, k):
+        del self.klucze[bisect_left(self.klucze, k)]
+        del self.arkusze[k[2]][k[1]]
+
+    def znajdz(self, w, h, obrot):
+        """Najmniejsze (best-area-fit) wolne pole mieszczące formatkę."""
+        klucze = self.klucze
+        for i in range(bisect_left(klucze, (w * h,)), len(klucze)):
+            k = klucze[i]
+            if (w <= k[5] and h <= k[6]) or (obrot and h <= k[5] and w <= k[6]):
+                return k
+        return None
+
+
+def _dopasuj(k, w, h, obrot):
+    """Wymiary (w, h, obrocona) formatki w wolnym polu k; bez obrotu, jeśli się da."""
+    if w <= k[5] and h <= k[6]:
+        # Obrót, gdy lepiej wypełnia pole (mniejsza krótsza reszta)
+        if obrot and h <= k[5] and w <= k[6] and min(k[5] - h, k[6] - w) < min(k[5] - w, k[6] - h):
+            return h, w, True
+        return w, h, False
+    return h, w, True
+
+
+# ======================================================
+# PODZIAŁ POLA – GILOTYNA
+# ======================================================
+
+def _podziel_gilotyna(wolne, k, pw, ph):
+    """Cięcie wzdłuż krótszej reszty -> większy zwarty odpad."""
+    _, _, ark, x, y, fw, fh = k
+    wolne.usun(k)
+    reszta_w = fw - pw; reszta_h = fh - ph
+    if reszta_w < reszta_h:
+        if reszta_w > 0: wolne.dodaj(ark, x + pw, y, reszta_w, ph)
+        if reszta_h > 0: wolne.dodaj(ark, x, y + ph, fw, reszta_h)
+    else:
+        if reszta_w > 0: wolne.dodaj(ark, x + pw, y, reszta_w, fh)
+        if reszta_h > 0: wolne.dodaj(ark, x, y + ph, pw, reszta_h)
+
+
+# ======================================================
+# PODZIAŁ POLA – MAXRECTS
+# ======================================================
+
+def _podziel_maxrects(wolne, k, pw, ph):
+    """Maxrects: wolne pola mogą się nakładać, dzielimy wszystkie przecięte."""
+    ark = k[2]; px = k[3]; py = k[4]
+    nowe = []
+    for k2 in list(wolne.arkusze[ark].values()):
+        _, _, _, x, y, w, h = k2
+        if px >= x + w or px + pw <= x or py >= y + h or py + ph <= y: continue
+        wolne.usun(k2)
+        if px > x: nowe.append((x, y, px - x, h))
+        if px + pw < x + w: nowe.append((px + pw, y, x + w - px - pw, h))
+        if py > y: nowe.append((x, y, w, py - y))
+        if py + ph < y + h: nowe.append((x, py + ph, w, y + h - py - ph))
+    # Przycinanie: sprawdzamy tylko nowe pola (nowe vs wszystkie), nie całą listę parami
+    nowe = [n for i, n in enumerate(nowe) if not any(
+        j != i and _zawiera(m, n) and (m != n or j < i) for j, m in enumerate(nowe))]
+    stare = [k2[3:] for k2 in wolne.arkusze[ark].values()]
+    for n in nowe:
+        if not any(_zawiera(s, n) for s in stare): wolne.dodaj(ark, *n)
+
+
+def _zawiera(a, b):
+    return b[0] >= a[0] and b[1] >= a[1] and b[0] + b[2] <= a[0] + a[2] and b[1] + b[3] <= a[1] + a[3]
+
+
+# ======================================================
+# ROZKRÓJ
+# ======================================================
+
+def formatki_listy(lista, material="KORPUS"):
+    """Formatki do rozkroju z listy elementów – materiał zawierający fragment (jak ListaElementow.pole_m2)."""
+    if hasattr(lista, "numery"):   # ListaElementow: indeks materiałów zamiast przeglądu formatek
+        return [{"w": lista.szer[i], "h": lista.wys[i], "nazwa": lista.id[i]} for i in lista.numery("material", material).tolist()]
+    return [{"w": x['Szerokość [mm]'], "h": x['Wysokość [mm]'], "nazwa": x['ID']} for x in lista if material in x['Materiał']]
+
+
+@mierzony("rozkroj")
+def rozkroj(formatki, arkusz_w=ARKUSZ_W, arkusz_h=ARKUSZ_H, rzaz=RZAZ, metoda="guillotine", obrot=True, resztki=()):
+    """
+    Rozkłada formatki na dowolną liczbę arkuszy.
+
+    formatki – lista słowników {'w', 'h', 'nazwa'} (opcjonalnie 'obrot': False
+    dla płyt z usłojeniem, które nie mogą być obrócone o 90°).
+    rzaz – szerokość piły [mm]; doliczana do każdej formatki, arkusz
+    powiększany o rzaz, żeby formatka przy krawędzi nie traciła miejsca.
+    Formatki większe niż arkusz trafiają do `nieulozone`, nie są pomijane po cichu.
+    resztki – płyty {'w', 'h', 'id'} otwierane przed nowymi arkuszami: nowy
+    arkusz powstaje dopiero, gdy formatka nie mieści się w żadnej resztce.
+    Nieużyte resztki nie trafiają do wyniku.
+    """
+    if metoda not in METODY: raise ValueError(f"Nieznana metoda rozkroju: {metoda}")
+    podziel = _podziel_maxrects if metoda == "maxrects" else _podziel_gilotyna
+    aw = arkusz_w + rzaz; ah = arkusz_h + rzaz
+
+    kolejka = sorted(formatki, key=lambda e: (e['w'] * e['h'], max(e['w'], e['h'])), reverse=True)
+    wolne = _WolnePola(); arkusze = []; nieulozone = []
+    for r in resztki:
+        wolne.nowy_arkusz(r['w'] + rzaz, r['h'] + rzaz); arkusze.append(Arkusz(r['w'], r['h'], resztka=r['id']))
+    for e in kolejka:
+        w = e['w'] + rzaz; h = e['h'] + rzaz; obr = obrot and e.get('obrot', True)
+        if not ((w <= aw and h <= ah) or (obr and h <= aw and w <= ah)):
+            nieulozone.append(e); continue
+        k = wolne.znajdz(w, h, obr)
+        if k is None:
+            wolne.nowy_arkusz(aw, ah); arkusze.append(Arkusz(arkusz_w, arkusz_h))
+            k = wolne.znajdz(w, h, obr)
+        pw, ph, obrocona = _dopasuj(k, w, h, obr)
+        arkusze[k[2]].ulozenia.append(Ulozenie(e.get('nazwa', ""), k[3], k[4], pw - rzaz, ph - rzaz, obrocona))
+        podziel(wolne, k, pw, ph)
+    for a, pola in zip(arkusze, wolne.arkusze): a.wolne = [k[3:] for k in pola.values()]
+    return WynikRozkroju([a for a in arkusze if a.ulozenia], nieulozone)
@@ -0,0 +1,197 @@
+# podglad3d.py
+# Podgląd 3D mebla STOLARZPRO: formatki z listy elementów jako bryły -> glTF (GLB) z geometrią instancjonowaną
+#
+#   from podglad3d import glb
+#   dane = glb(projekt)          # bajty .glb – pamiętane na dysku wg skrótu specyfikacji (cache.dysk)
+#
+# Każda formatka to prostopadłościan: wymiary z kolumn listy (szer, wys, gr),
+# ułożone w osiach wg rodzaju formatki (bok / poziom / front) – wektorowo,
+# przez kody nazw. Położenia (narożnik bryły) podaje generator razem z każdym
+# elementem (ListaElementow.polozenia).
+#
+# Geometria to jeden sześcian jednostkowy (24 wierzchołki). Formatki jednego
+# materiału to jeden węzeł z rozszerzeniem EXT_mesh_gpu_instancing (tablice
+# przesunięć i skal), więc plik rośnie o 24 B na formatkę – szafa z setką półek
+# i szuflad to kilka kB. Jednostki glTF: metry, oś Y w górę, +Z do patrzącego.
+
+import base64
+import json
+import struct
+
+import numpy as np
+
+from cache import dysk, hash_projektu
+from constants import KOLOR_FRONT, KOLOR_PLYTA
+from generator import run_generator
+from pomiary import licznik, mierzony
+
+# Wersja geometrii – część klucza plików na dysku (cache.dysk)
+WERSJA = 1
+
+# Rodzaj formatki -> które z (szer, wys, gr) leży na osi X, Y, Z
+BOK, POZIOM, FRONT = range(3)
+OSIE = np.array([(2, 1, 0),      # bok, przegroda: grubość w X, szerokość to głębokość
+                 (0, 2, 1),      # wieniec, półka, dno szuflady: wysokość formatki to głębokość
+                 (0, 1, 2)])     # plecy, drzwi, front i tył szuflady
+
+# Materiały podglądu: (fragment nazwy materiału, kolor RGB 0..1); pierwszy pasujący, ostatni – reszta
+def _rgb(tekst):
+    return [int(tekst[i:i + 2], 16) / 255 for i in (1, 3, 5)]
+
+
+MATERIALY = (("FRONT", _rgb(KOLOR_FRONT)), ("HDF", _rgb("#b08968")), ("BIAŁA", _rgb("#f2f2f2")), ("", _rgb(KOLOR_PLYTA)))
+
+# Sześcian [0, 1]^3: 6 ścian po 4 wierzchołki (osobne normalne), 12 trójkątów
+_SCIANY = [((0, 1, 3, 2), (-1, 0, 0)), ((4, 6, 7, 5), (1, 0, 0)), ((0, 4, 5, 1), (0, -1, 0)),
+           ((2, 3, 7, 6), (0, 1, 0)), ((0, 2, 6, 4), (0, 0, -1)), ((1, 5, 7, 3), (0, 0, 1))]
+_NAROZA = np.array([(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype='f4')
+POZYCJE_SZESCIANU = np.concatenate([_NAROZA[list(n)] for n, _ in _SCIANY])
+NORMALNE_SZESCIANU = np.repeat(np.array([s for _, s in _SCIANY], dtype='f4'), 4, axis=0)
+INDEKSY_SZESCIANU = np.array([[4*f, 4*f + 1, 4*f + 2, 4*f, 4*f + 2, 4*f + 3] for f in range(6)], dtype='u2').ravel()
+
+
+# ======================================================
+# BRYŁY FORMATEK
+# ======================================================
+
+def _rodzaj(nazwa):
+    if nazwa.startswith(("Bok", "Przegroda")): return BOK
+    if nazwa.startswith(("Wieniec", "Półka", "Dno")): return POZIOM
+    return FRONT
+
+
+@mierzony("podglad3d.bryly")
+def bryly(projekt, lista=None):
+    """
+    Bryły formatek projektu: (narożniki [mm], rozmiary [mm], nr materiału
+    z MATERIALY) – tablice (n, 3), (n, 3), (n,). Narożniki, rozmiary
+    i materiały wektorowo z kolumn listy elementów.
+    """
+    lista = lista if lista is not None else run_generator(projekt)
+    naroza = lista.polozenia().astype('f8')
+    kody = np.frombuffer(lista.nazwa.kody, dtype=lista.nazwa.kody.typecode)
+    osie = OSIE[np.array([_rodzaj(n) for n in lista.nazwa.wartosci], dtype='i8')[kody]]
+    wymiary = np.column_stack((np.frombuffer(lista.szer, dtype='i4'), np.frombuffer(lista.wys, dtype='i4'),
+                               np.frombuffer(lista.gr, dtype='f8'))).astype('f8')
+    rozmiary = np.take_along_axis(wymiary, osie, axis=1)
+    mat_kody = np.frombuffer(lista.material.kody, dtype=lista.material.kody.typecode)
+    mat = np.array([next(i for i, (f, _) in enumerate(MATERIALY) if f in m) for m in lista.material.wartosci], dtype='i8')[mat_kody]
+    return naroza, rozmiary, mat
+
+
+# ======================================================
+# GLB
+# ======================================================
+
+def _glb(gltf, bufor):
+    """Kontener GLB: nagłówek, fragment JSON i fragment BIN (wyrównane do 4 B)."""
+    tekst = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    tekst += b" " * (-len(tekst) % 4); bufor += b"\0" * (-len(bufor) % 4)
+    return (struct.pack("<III", 0x46546C67, 2, 12 + 8 + len(tekst) + 8 + len(bufor))
+            + struct.pack("<II", len(tekst), 0x4E4F534A) + tekst + struct.pack("<II", len(bufor), 0x004E4942) + bufor)
+
+
+@mierzony("podglad3d.glb")
+def zbuduj_glb(naroza, rozmiary, mat, instancje=True):
+    """
+    GLB z brył: jeden sześcian jednostkowy, siatka na materiał. instancje=True –
+    węzeł na materiał z EXT_mesh_gpu_instancing; False – węzeł na formatkę
+    (przesunięcie + skala, ta sama siatka) dla przeglądarek bez rozszerzenia.
+    """
+    srodek = np.array([(naroza[:, 0] + rozmiary[:, 0]).max() / 2, 0, (naroza[:, 2] + rozmiary[:, 2]).max() / 2]) if len(naroza) else np.zeros(3)
+    przes = ((naroza - srodek) / 1000).astype('f4'); skale = (rozmiary / 1000).astype('f4')
+    czesci = []; widoki = []; akcesoria = []
+
+    def dodaj(tablica, typ, skladowe, cel=None, minmax=False):
+        poz = sum(len(c) for c in czesci); dane = np.ascontiguousarray(tablica).tobytes()
+        czesci.append(dane + b"\0" * (-len(dane) % 4))
+        widoki.append({"buffer": 0, "byteOffset": poz, "byteLength": len(dane), **({"target": cel} if cel else {})})
+        a = {"bufferView": len(widoki) - 1, "componentType": typ, "count": len(tablica), "type": skladowe}
+        if minmax: a["min"] = tablica.min(axis=0).tolist(); a["max"] = tablica.max(axis=0).tolist()
+        akcesoria.append(a)
+        return len(akcesoria) - 1
+
+    pozycje = dodaj(POZYCJE_SZESCIANU, 5126, "VEC3", 34962, True)
+    normalne = dodaj(NORMALNE_SZESCIANU, 5126, "VEC3", 34962)
+    indeksy = dodaj(INDEKSY_SZESCIANU, 5123, "SCALAR", 34963)
+    siatki = []; wezly = []; materialy = []
+    for nr, (_, kolor) in enumerate(MATERIALY):
+        m = np.flatnonzero(mat == nr)
+        if not m.size: continue
+        materialy.append({"pbrMetallicRoughness": {"baseColorFactor": kolor + [1.0], "metallicFactor": 0.0, "roughnessFactor": 0.8}})
+        siatki.append({"primitives": [{"attributes": {"POSITION": pozycje, "NORMAL": normalne}, "indices": indeksy, "material": len(materialy) - 1}]})
+        if instancje:
+            wezly.append({"mesh": len(siatki) - 1, "extensions": {"EXT_mesh_gpu_instancing": {"attributes": {
+                "TRANSLATION": dodaj(przes[m], 5126, "VEC3"), "SCALE": dodaj(skale[m], 5126, "VEC3")}}}})
+        else:
+            wezly += [{"mesh": len(siatki) - 1, "translation": t.tolist(), "scale": s.tolist()} for t, s in zip(przes[m], skale[m])]
+    bufor = b"".join(czesci)
+    gltf = {"asset": {"version": "2.0", "generator": "STOLARZPRO"}, "scene": 0,
+            "scenes": [{"nodes": list(range(len(wezly)))}], "nodes": wezly, "meshes": siatki, "materials": materialy,
+            "accessors": akcesoria, "bufferViews": widoki, "buffers": [{"byteLength": len(bufor)}]}
+    if instancje: gltf["extensionsUsed"] = gltf["extensionsRequired"] = ["EXT_mesh_gpu_instancing"]
+    licznik("podglad3d.formatki", len(naroza))
+    return _glb(gltf, bufor)
+
+
+def glb(projekt, lista=None, instancje=True):
+    """Podgląd 3D znormalizowanego projektu jako bajty GLB – z cache.dysk wg skrótu geometrii."""
+    klucz = ("glb", WERSJA, instancje, hash_projektu(projekt))
+    return dysk.pobierz_lub_licz(klucz, lambda: zbuduj_glb(*bryly(projekt, lista), instancje=instancje))
+
+
+# ======================================================
+# PRZEGLĄDARKA (WebGL, BEZ SIECI)
+# ======================================================
+# Własna przeglądarka GLB z tego modułu, osadzona w stronie – podgląd działa bez
+# internetu (warsztat). Czyta węzły zbuduj_glb (instancje albo przesunięcie +
+# skala), z każdej bryły robi 36 wierzchołków sześcianu i rysuje jednym
+# drawArrays; światło kierunkowe, obrót myszą (przeciąganie), kółko – przybliżenie.
+
+PRZEGLADARKA = """
+const b=Uint8Array.from(atob(DANE),z=>z.charCodeAt(0)).buffer,dv=new DataView(b),jl=dv.getUint32(12,true);
+const g=JSON.parse(new TextDecoder().decode(new Uint8Array(b,20,jl))),bin=20+jl+8;
+const tab=i=>{const a=g.accessors[i],o=bin+(g.bufferViews[a.bufferView].byteOffset||0);return new Float32Array(b.slice(o,o+a.count*12));};
+const bryly=[];
+for(const n of g.nodes){
+  const kol=g.materials[g.meshes[n.mesh].primitives[0].material].pbrMetallicRoughness.baseColorFactor;
+  const e=n.extensions&&n.extensions.EXT_mesh_gpu_instancing;
+  if(e){const T=tab(e.attributes.TRANSLATION),S=tab(e.attributes.SCALE);for(let i=0;i<T.length;i+=3)bryly.push([T.subarray(i,i+3),S.subarray(i,i+3),kol]);}
+  else bryly.push([n.translation,n.scale,kol]);
+}
+const v=new Float32Array(bryly.length*INDEKSY.length*9),mn=[1e9,1e9,1e9],mx=[-1e9,-1e9,-1e9];let k=0;
+for(const [t,s,c] of bryly)for(const i of INDEKSY)for(let a=0;a<3;a++){
+  const p=t[a]+POZYCJE[i][a]*s[a];v[k+a]=p;v[k+3+a]=NORMALNE[i][a];v[k+6+a]=c[a];mn[a]=Math.min(mn[a],p);mx[a]=Math.max(mx[a],p);if(a==2)k+=9;}
+const cv=document.getElementById("p3d"),gl=cv.getContext("webgl",{antialias:true});
+const sh=(t,z)=>{const o=gl.createShader(t);gl.shaderSource(o,z);gl.compileShader(o);return o;},pr=gl.createProgram();
+gl.attachShader(pr,sh(gl.VERTEX_SHADER,"attribute vec3 p,n,c;uniform mat4 m;varying vec3 f;void main(){gl_Position=m*vec4(p,1.);f=c*(.45+.55*max(dot(n,normalize(vec3(.4,.8,.6))),0.));}"));
+gl.attachShader(pr,sh(gl.FRAGMENT_SHADER,"precision mediump float;varying vec3 f;void main(){gl_FragColor=vec4(f,1.);}"));
+gl.linkProgram(pr);gl.useProgram(pr);gl.bindBuffer(gl.ARRAY_BUFFER,gl.createBuffer());gl.bufferData(gl.ARRAY_BUFFER,v,gl.STATIC_DRAW);
+["p","n","c"].forEach((a,i)=>{const l=gl.getAttribLocation(pr,a);gl.enableVertexAttribArray(l);gl.vertexAttribPointer(l,3,gl.FLOAT,false,36,12*i);});
+gl.enable(gl.DEPTH_TEST);gl.clearColor(.957,.957,.957,1);
+const sr=[0,1,2].map(a=>(mn[a]+mx[a])/2),r=Math.hypot(mx[0]-mn[0],mx[1]-mn[1],mx[2]-mn[2])/2||1;let obr=.6,poch=.35,odl=2.6*r;
+const roz=(a,b)=>[a[0]-b[0],a[1]-b[1],a[2]-b[2]],wek=(a,b)=>[a[1]*b[2]-a[2]*b[1],a[2]*b[0]-a[0]*b[2],a[0]*b[1]-a[1]*b[0]];
+const nor=a=>{const d=Math.hypot(...a);return a.map(x=>x/d);},il=(a,b)=>a[0]*b[0]+a[1]*b[1]+a[2]*b[2];
+function rysuj(){
+  cv.width=cv.clientWidth*devicePixelRatio;cv.height=cv.clientHeight*devicePixelRatio;gl.viewport(0,0,cv.width,cv.height);
+  const o=[sr[0]+odl*Math.cos(poch)*Math.sin(obr),sr[1]+odl*Math.sin(poch),sr[2]+odl*Math.cos(poch)*Math.cos(obr)];
+  const z=nor(roz(o,sr)),x=nor(wek([0,1,0],z)),y=wek(z,x),bl=odl/100,da=odl+2*r,t=1/Math.tan(.4),as=cv.width/cv.height;
+  const V=[x[0],y[0],z[0],0,x[1],y[1],z[1],0,x[2],y[2],z[2],0,-il(x,o),-il(y,o),-il(z,o),1];
+  const P=[t/as,0,0,0,0,t,0,0,0,0,(da+bl)/(bl-da),-1,0,0,2*da*bl/(bl-da),0],M=[];
+  for(let i=0;i<4;i++)for(let j=0;j<4;j++){let s=0;for(let q=0;q<4;q++)s+=P[q*4+j]*V[i*4+q];M[i*4+j]=s;}
+  gl.uniformMatrix4fv(gl.getUniformLocation(pr,"m"),false,M);gl.clear(gl.COLOR_BUFFER_BIT|gl.DEPTH_BUFFER_BIT);gl.drawArrays(gl.TRIANGLES,0,v.length/9);
+}
+let mysz=null;
+cv.onpointerdown=e=>{mysz=[e.clientX,e.clientY];cv.setPointerCapture(e.pointerId);};cv.onpointerup=()=>{mysz=null;};
+cv.onpointermove=e=>{if(!mysz)return;obr-=(e.clientX-mysz[0])*.01;poch=Math.max(-1.5,Math.min(1.5,poch+(e.clientY-mysz[1])*.01));mysz=[e.clientX,e.clientY];rysuj();};
+cv.onwheel=e=>{e.preventDefault();odl=Math.max(r*.5,Math.min(r*10,odl*Math.exp(e.deltaY*.001)));rysuj();};
+addEventListener("resize",rysuj);rysuj();
+"""
+
+
+def html_podgladu(dane, wysokosc=520):
+    """Strona z przeglądarką PRZEGLADARKA (bez zewnętrznych skryptów) i modelem GLB osadzonym w base64."""
+    stale = (f"const DANE={json.dumps(base64.b64encode(dane).decode('ascii'))},POZYCJE={json.dumps(POZYCJE_SZESCIANU.tolist())},"
+             f"NORMALNE={json.dumps(NORMALNE_SZESCIANU.tolist())},INDEKSY={json.dumps(INDEKSY_SZESCIANU.tolist())};")
+    return (f'<canvas id="p3d" style="width:100%;height:{wysokosc - 20}px;touch-action:none;cursor:grab"></canvas>'
+            f'<script>{stale}{PRZEGLADARKA}</script>')
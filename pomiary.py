@@ -0,0 +1,176 @@
+# pomiary.py
+# Pomiary czasu etapów i liczniki dla STOLARZPRO (włączane zmienną STOLARZPRO_POMIARY=1)
+#
+#   with pomiary.etap("pdf.skladanie"): ...
+#   @pomiary.mierzony("rozkroj")
+#   pomiary.licznik("pdf.strony", n)
+#
+# Wyłączone pomiary kosztują jedno sprawdzenie flagi na wywołanie. Czasy
+# trafiają do rejestru procesu (GLOBALNY) i do rejestru bieżącego przebiegu
+# (rerun Streamlit, jeden projekt wsadu) – patrz nowy_przebieg().
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+
+ZMIENNA = "STOLARZPRO_POMIARY"
+
+_wlaczone = os.environ.get(ZMIENNA, "") not in ("", "0")
+
+
+def wlaczone():
+    return _wlaczone
+
+
+def wlacz(stan=True):
+    """Włącza pomiary w tym procesie i w procesach potomnych (przez zmienną środowiskową)."""
+    global _wlaczone
+    _wlaczone = bool(stan); os.environ[ZMIENNA] = "1" if stan else "0"
+
+
+# ======================================================
+# REJESTR
+# ======================================================
+
+class Rejestr:
+    """Etap -> [liczba wywołań, suma czasu, najdłuższe wywołanie]; licznik -> liczba."""
+
+    def __init__(self):
+        self.etapy = {}
+        self.liczniki = {}
+        self._lock = threading.Lock()
+
+    def czas(self, nazwa, s):
+        with self._lock:
+            e = self.etapy.get(nazwa)
+            if e is None: self.etapy[nazwa] = [1, s, s]
+            else: e[0] += 1; e[1] += s; e[2] = max(e[2], s)
+
+    def dodaj(self, nazwa, n=1):
+        with self._lock: self.liczniki[nazwa] = self.liczniki.get(nazwa, 0) + n
+
+    def stan(self):
+        """Kopia do JSON / przesłania z procesu roboczego."""
+        with self._lock:
+            return {"etapy": {k: {"liczba": n, "suma_s": round(s, 6), "max_s": round(m, 6)} for k, (n, s, m) in self.etapy.items()},
+                    "liczniki": dict(self.liczniki)}
+
+    def dolacz(self, stan):
+        """Dodaje stan() innego rejestru (np. z procesu roboczego)."""
+        with self._lock:
+            for k, e in stan["etapy"].items():
+                moj = self.etapy.get(k)
+                if moj is None: self.etapy[k] = [e["liczba"], e["suma_s"], e["max_s"]]
+                else: moj[0] += e["liczba"]; moj[1] += e["suma_s"]; moj[2] = max(moj[2], e["max_s"])
+            for k, n in stan["liczniki"].items(): self.liczniki[k] = self.liczniki.get(k, 0) + n
+
+    def wyczysc(self):
+        with self._lock: self.etapy.clear(); self.liczniki.clear()
+
+
+GLOBALNY = Rejestr()   # od startu procesu
+_przebieg = contextvars.ContextVar("przebieg", default=None)
+
+
+def nowy_przebieg():
+    """Nowy rejestr bieżącego przebiegu (wątku / kontekstu); zwraca go."""
+    r = Rejestr(); _przebieg.set(r)
+    return r
+
+
+def zapisz_czas(nazwa, s):
+    GLOBALNY.czas(nazwa, s)
+    r = _przebieg.get()
+    if r is not None: r.czas(nazwa, s)
+
+
+def licznik(nazwa, n=1):
+    if not _wlaczone: return
+    GLOBALNY.dodaj(nazwa, n)
+    r = _przebieg.get()
+    if r is not None: r.dodaj(nazwa, n)
+
+
+# ======================================================
+# ETAPY
+# ======================================================
+
+class _Etap:
+    __slots__ = ("nazwa", "_t")
+
+    def __init__(self, nazwa):
+        self.nazwa = nazwa
+
+    def __enter__(self):
+        self._t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        zapisz_czas(self.nazwa, time.perf_counter() - self._t)
+
+
+class _Nic:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NIC = _Nic()
+
+
+def etap(nazwa):
+    """Kontekst mierzący czas etapu (przy wyłączonych pomiarach – pusty)."""
+    return _Etap(nazwa) if _wlaczone else _NIC
+
+
+def mierzony(nazwa):
+    """Dekorator: każde wywołanie funkcji to jeden pomiar etapu `nazwa`."""
+    def dekorator(f):
+        @functools.wraps(f)
+        def opakowana(*args, **kwargs):
+            if not _wlaczone: return f(*args, **kwargs)
+            t = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                zapisz_czas(nazwa, time.perf_counter() - t)
+        return opakowana
+    return dekorator
+
+
+# ======================================================
+# WYNIKI
+# ======================================================
+
+def tabela(stan):
+    """Wiersze do st.dataframe – etapy od najdłuższego łącznego czasu."""
+    return [{"etap": k, "wywołania": e["liczba"], "suma [ms]": round(e["suma_s"] * 1000, 2), "max [ms]": round(e["max_s"] * 1000, 2)}
+            for k, e in sorted(stan["etapy"].items(), key=lambda x: -x[1]["suma_s"])]
+
+
+def do_json(stan, **dodatkowe):
+    return json.dumps({**stan, **dodatkowe}, ensure_ascii=False, indent=2)
+
+
+def _etykieta(tekst):
+    return str(tekst).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def do_prometheus(stan, prefiks="stolarzpro"):
+    """Format tekstowy Prometheus (node_exporter textfile / pushgateway)."""
+    linie = [f"# HELP {prefiks}_etap_sekundy Czas etapów przetwarzania.", f"# TYPE {prefiks}_etap_sekundy summary"]
+    for k, e in stan["etapy"].items():
+        linie += [f'{prefiks}_etap_sekundy_sum{{etap="{_etykieta(k)}"}} {e["suma_s"]}',
+                  f'{prefiks}_etap_sekundy_count{{etap="{_etykieta(k)}"}} {e["liczba"]}']
+    linie += [f"# HELP {prefiks}_etap_max_sekundy Najdłuższe wywołanie etapu.", f"# TYPE {prefiks}_etap_max_sekundy gauge"]
+    linie += [f'{prefiks}_etap_max_sekundy{{etap="{_etykieta(k)}"}} {e["max_s"]}' for k, e in stan["etapy"].items()]
+    linie += [f"# HELP {prefiks}_zdarzenia_total Liczniki zdarzeń.", f"# TYPE {prefiks}_zdarzenia_total counter"]
+    linie += [f'{prefiks}_zdarzenia_total{{nazwa="{_etykieta(k)}"}} {n}' for k, n in stan["liczniki"].items()]
+    return "\n".join(linie) + "\n"
@@ -0,0 +1,126 @@
+# rysunki.py
+# Rysunki elementów, rozkroju i podglądu mebla (Matplotlib) dla STOLARZPRO
+#
+# Dokumentację PDF składa wektor.zbuduj_pdf (bez Matplotlib); tu zostają
+# rysunki do PNG (zakładki aplikacji) i wersje do porównań w benchmarkach.
+
+import io
+
+import matplotlib.pyplot as plt
+import matplotlib.patches as patches
+
+from pomiary import mierzony
+from wiercenia import jako_otwory, linie, sortuj
+
+# Wersja wyglądu rysunków – część klucza PNG zapisywanych na dysku (cache.dysk)
+WERSJA = 1
+
+
+# ======================================================
+# RYSUNEK ELEMENTU
+# ======================================================
+
+# FIX: FRONT BARDZO DALEKO (250mm), DUŻE MARGINESY (350mm)
+@mierzony("rysunek.element")
+def rysuj_element(szer, wys, id_elementu, nazwa, otwory=[], orientacja_frontu="L", kolor_tla='#e6ccb3', figsize=(10, 7), naglowek=True):
+    plt.close('all'); fig, ax = plt.subplots(figsize=figsize)
+    if "HDF" in nazwa: kolor_tla = '#d9d9d9'
+    rect = patches.Rectangle((0, 0), szer, wys, linewidth=2, edgecolor='black', facecolor=kolor_tla, zorder=1); ax.add_patch(rect)
+    
+    # Header
+    if naglowek:
+        fig.text(0.5, 0.96, nazwa.upper(), ha='center', va='top', fontsize=18, weight='bold')
+        fig.text(0.5, 0.93, id_elementu, ha='center', va='top', fontsize=10, color='#555', family='monospace')
+
+    otwory = jako_otwory(otwory)
+    if len(otwory):
+        ux, uy = linie(otwory)
+        for yl in uy:
+            ax.plot([-500, szer+500], [yl, yl], color='#444', linestyle='--', linewidth=0.4, alpha=0.6)
+            ax.text(-25, yl, f"Y:{yl:.0f}", ha='right', va='center', fontsize=7, color='#444')
+            ax.text(szer+25, yl, f"{yl:.0f}", ha='left', va='center', fontsize=7, color='#444')
+        for xl in ux:
+            ax.plot([xl, xl], [-500, wys+500], color='#444', linestyle='--', linewidth=0.4, alpha=0.6)
+            ax.text(xl, -30, f"X:{xl:.0f}", ha='center', va='top', fontsize=7, color='#444', rotation=90)
+        o = sortuj(otwory)
+        for i, (x,y,c) in enumerate(zip(o['x'], o['y'], o['typ'])):
+            if c=='blue': ax.add_patch(patches.Circle((x,y), 6, edgecolor='blue', facecolor='white', lw=2))
+            elif c=='red': ax.add_patch(patches.Circle((x,y), 4, color='red'))
+            elif c=='green': ax.add_patch(patches.Circle((x,y), 17.5 if "Front" in nazwa else 4, edgecolor='green', facecolor='white', lw=1.5))
+            ax.add_patch(patches.Circle((x+12, y+12), 9, color='black', zorder=40))
+            ax.text(x+12, y+12, str(i+1), color='white', ha='center', va='center', fontsize=9, weight='bold', zorder=41)
+
+    # Front logic
+    is_h = "WIENIEC" in nazwa.upper() or "PÓŁKA" in nazwa.upper(); dist = 250 # FIX: 25cm odstępu
+    if "Plecy" not in nazwa:
+        if is_h: 
+            ax.add_patch(patches.Rectangle((0, -5), szer, 5, color='#d62828'))
+            ax.text(szer/2, -dist, "FRONT", ha='center', va='center', color='#d62828', weight='bold', fontsize=16)
+        else:
+            if orientacja_frontu == 'L': ax.add_patch(patches.Rectangle((-5,0), 5, wys, color='#d62828')); ax.text(-dist, wys/2, "FRONT", rotation=90, color='#d62828', weight='bold', fontsize=16, ha='center', va='center')
+            elif orientacja_frontu == 'P': ax.add_patch(patches.Rectangle((szer,0), 5, wys, color='#d62828')); ax.text(szer+dist, wys/2, "FRONT", rotation=270, color='#d62828', weight='bold', fontsize=16, ha='center', va='center')
+            elif orientacja_frontu == 'D': ax.add_patch(patches.Rectangle((0, -5), szer, 5, color='#d62828')); ax.text(szer/2, -dist, "FRONT", ha='center', va='center', color='#d62828', weight='bold', fontsize=16)
+
+    # Dims
+    ax.text(szer/2, wys+150, f"{szer:.0f} mm", ha='center', weight='bold', fontsize=14)
+    ax.text(szer+150, wys/2, f"{wys:.0f} mm", va='center', rotation=90, weight='bold', fontsize=14)
+    
+    # Margins
+    mx = max(szer*0.3, 350); my = max(wys*0.2, 250)
+    ax.set_xlim(-mx, szer+mx); ax.set_ylim(-my, wys+my)
+    plt.subplots_adjust(left=0.02, right=0.98, top=0.85, bottom=0.02); ax.set_aspect('equal'); ax.axis('off'); return fig
+
+
+# ======================================================
+# ROZKRÓJ I WIZUALIZACJA (ZAKŁADKI APLIKACJI)
+# ======================================================
+
+def klucz_nestingu(arkusz):
+    """Wszystko, co widać na rysunku arkusza: wymiary i ułożenia bez nazw formatek (nazwy zawierają kod projektu)."""
+    return (arkusz.w, arkusz.h, tuple((u.x, u.y, u.w, u.h, u.obrocona) for u in arkusz.ulozenia))
+
+
+@mierzony("rysunek.rozkroj")
+def rysuj_nesting(arkusz, nr, liczba):
+    plt.close('all'); fig = plt.figure(figsize=(10, 8)); ax = fig.add_subplot(111)
+    ax.add_patch(patches.Rectangle((0,0), arkusz.w, arkusz.h, facecolor='#eee', edgecolor='black'))
+    for i, u in enumerate(arkusz.ulozenia):
+        ax.add_patch(patches.Rectangle((u.x, u.y), u.w, u.h, facecolor='#d7ba9d', alpha=0.8, edgecolor='black'))
+        fs = 8 if min(u.w, u.h)>100 else 6; rot = 90 if u.h>u.w else 0
+        ax.text(u.x+u.w/2, u.y+u.h/2, f"#{i+1}\n{u.w:.0f}x{u.h:.0f}", ha='center', va='center', fontsize=fs, rotation=rot)
+    ax.set_xlim(0, arkusz.w); ax.set_ylim(0, arkusz.h); ax.set_aspect('equal'); ax.axis('off')
+    ax.set_title(f"Arkusz {nr+1}/{liczba} – uzysk {arkusz.uzysk:.1f}%", size=14)
+    return fig
+
+
+@mierzony("rysunek.wizualizacja")
+def rysuj_podglad_mebla(w, h, gr, n_p, ms, sw, tk):
+    plt.close('all'); fig, ax = plt.subplots(figsize=(12, 8)); ax.axis('off'); ax.set_aspect('equal')
+    ax.set_xlim(-100, w+100); ax.set_ylim(-100, h+100); ax.set_title("WIZUALIZACJA", size=18, weight='bold')
+    if "Wpuszczane" in tk: r=[(0,0,gr,h), (w-gr,0,gr,h), (gr,h-gr,w-2*gr,gr), (gr,0,w-2*gr,gr)]
+    else: r=[(0,0,w,gr), (0,h-gr,w,gr), (0,gr,gr,h-2*gr), (w-gr,gr,gr,h-2*gr)]
+    for rx,ry,rw,rh in r: ax.add_patch(patches.Rectangle((rx,ry), rw, rh, facecolor='#d7ba9d', edgecolor='black'))
+    cx = gr
+    for i in range(n_p+1):
+        if i < n_p: ax.add_patch(patches.Rectangle((cx+sw, gr), gr, h-2*gr, facecolor='gray', alpha=0.5))
+        cy = gr; m_list = ms.get(i, [])
+        ha = (h-2*gr - sum(m['wys_mm'] for m in m_list if m['wys_mode']=='fixed')) / max(1, sum(1 for m in m_list if m['wys_mode']=='auto'))
+        for idx, m in enumerate(m_list):
+            if idx>0: ax.add_patch(patches.Rectangle((cx, cy), sw, gr, facecolor='#d7ba9d', edgecolor='black')); cy+=gr
+            hm = m['wys_mm'] if m['wys_mode']=='fixed' else ha
+            if m['typ'] == "Półki":
+                g = hm/(m['detale'].get('ilosc')+1)
+                for k in range(m['detale'].get('ilosc')): ax.add_patch(patches.Rectangle((cx, cy+(k+1)*g), sw, gr, color='#8B4513'))
+            ax.add_patch(patches.Rectangle((cx, cy), sw, hm, fill=False, edgecolor='black', ls=':', alpha=0.3)); cy+=hm
+        cx += sw + gr
+    return fig
+
+
+@mierzony("rysunek.png")
+def fig_png(fig, dpi=150):
+    """Rysunek jako bajty PNG (do zapamiętania między rerunami i st.image)."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
@@ -0,0 +1,331 @@
+# serwer.py
+# Usługa HTTP (asyncio, bez zależności) dla STOLARZPRO: lista elementów, CSV, PDF, programy CNC, kosztorys
+#
+#   python serwer.py --port 8000 -j 4
+#   curl -X POST --data-binary @szafka.json localhost:8000/elementy
+#   curl -X POST --data-binary @szafka.json localhost:8000/pdf -o szafka.pdf
+#   curl -X POST --data-binary @kuchnia.json "localhost:8000/cnc?format=gcode" -o cnc.zip
+#   curl localhost:8000/stan
+#
+# Ciało żądania: projekt albo zlecenie w formacie JSON z aplikacji (jak
+# load_project_from_json). Generowanie i rysowanie liczone są w puli procesów;
+# na wolne miejsce w puli czeka najwyżej `kolejka` żądań – kolejne dostają 503
+# z Retry-After. Wyniki pamiętane są wg skrótu specyfikacji (cache.LRUCache),
+# a identyczne żądania w toku liczone są raz.
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import multiprocessing
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qsl, urlsplit
+
+from cache import POLA_GEOMETRII, LRUCache, dysk, hash_projektu
+from export_cnc import FORMATY as FORMATY_CNC
+from generator import generuj_instrukcje_tekst, normalizuj_projekt, okucia, run_generator
+from kosztorys import ilosci, wycena
+from zlecenie import hash_zlecenia, instrukcja_zlecenia, jest_zleceniem, kosztorys_zlecenia, lista_zlecenia, normalizuj_zlecenie, okucia_zlecenia, rozkroj_zlecenia
+
+
+MAX_CIALA = 4 * 2**20       # największe ciało żądania [B]
+CZAS_NAGLOWKA = 30          # czas na nagłówek żądania [s] (także bezczynne keep-alive)
+STATUSY = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class BladZadania(Exception):
+    """Błąd danych wejściowych – odpowiedź z podanym kodem HTTP."""
+
+    def __init__(self, status, komunikat):
+        super().__init__(komunikat)
+        self.status = status
+
+
+# ======================================================
+# ZADANIA (W PROCESACH ROBOCZYCH)
+# ======================================================
+
+def _specyfikacja(dane):
+    """Projekt/zlecenie -> (lista, kod, instrukcja(), okucia(), ceny)."""
+    if jest_zleceniem(dane):
+        return lista_zlecenia(dane), dane['kod_zlecenia'], lambda: instrukcja_zlecenia(dane), lambda: okucia_zlecenia(dane), dane['ceny']
+    return run_generator(dane), dane['kod_pro'], lambda: generuj_instrukcje_tekst(dane), lambda: okucia(dane), dane['ceny']
+
+
+def _elementy(dane, parametry):
+    lista, kod, *_ = _specyfikacja(dane)
+    elementy = [{**{k: el[k] for k in ("ID", "Nazwa", "Szerokość [mm]", "Wysokość [mm]", "Grubość [mm]", "Materiał", "Oklejanie")},
+                 "otwory": len(el['wiercenia'])} for el in lista]
+    return json.dumps({"projekt": kod, "elementy": elementy}, ensure_ascii=False).encode("utf-8")
+
+
+def _csv(dane, parametry):
+    buf = io.StringIO(); _specyfikacja(dane)[0].do_csv(buf)
+    return buf.getvalue().encode("utf-8-sig")
+
+
+def _pdf(dane, parametry):
+    from wektor import klucz_pdf, zbuduj_pdf
+    lista, _, instrukcja, *_ = _specyfikacja(dane); tekst = instrukcja()
+
+    def buduj():
+        buf = io.BytesIO(); zbuduj_pdf(lista, tekst, buf)
+        return buf.getvalue()
+    # Poza pamięcią usługi także na dysku – wspólny dla procesów roboczych i restartów
+    return dysk.pobierz_lub_licz(klucz_pdf(lista, tekst), buduj)
+
+
+def _cnc(dane, parametry):
+    """Pliki formatu CNC projektu w archiwum ZIP (ścieżki jak w EksporterCNC)."""
+    lista, kod, *_ = _specyfikacja(dane); fmt = FORMATY_CNC[parametry['format']]
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for sciezka, tekst in fmt.funkcja(kod, lista): z.writestr(sciezka.replace(os.sep, "/"), fmt.naglowek + tekst)
+    return buf.getvalue()
+
+
+def _kosztorys(dane, parametry):
+    lista, kod, _, okucia_szt, ceny = _specyfikacja(dane)
+    rozkroje = rozkroj_zlecenia(lista); pozycje = wycena(ilosci(lista, rozkroje, okucia_szt()), ceny)
+    return json.dumps({"projekt": kod, "materialy": kosztorys_zlecenia(lista, rozkroje, ceny), "pozycje": pozycje,
+                       "razem": round(sum(p["Wartość [zł]"] for p in pozycje), 2)}, ensure_ascii=False).encode("utf-8")
+
+
+# Ścieżka -> (funkcja, typ treści, czy zależy od cen, parametry zapytania)
+TRASY = {
+    "/elementy": (_elementy, "application/json; charset=utf-8", False, ()),
+    "/csv": (_csv, "text/csv; charset=utf-8", False, ()),
+    "/pdf": (_pdf, "application/pdf", False, ()),
+    "/cnc": (_cnc, "application/zip", False, ("format",)),
+    "/kosztorys": (_kosztorys, "application/json; charset=utf-8", True, ()),
+}
+
+
+def wykonaj(sciezka, dane, parametry):
+    """Wynik trasy jako bajty – wywoływane w procesie roboczym."""
+    return TRASY[sciezka][0](dane, parametry)
+
+
+# ======================================================
+# SPECYFIKACJA I KLUCZ WYNIKU
+# ======================================================
+
+# Wymiary sprawdzane w _sprawdz – z JSON mogą przyjść napisem, null albo NaN
+POLA_LICZBOWE = ('h_mebla', 'w_mebla', 'd_mebla', 'gr_plyty', 'il_przegrod')
+
+
+def _sprawdz(p):
+    """Te same warunki co validation.validate_korpus – bez Streamlit; najpierw typy wymiarów."""
+    for pole in POLA_LICZBOWE:
+        v = p[pole]
+        if isinstance(v, bool) or not isinstance(v, (int, float)) or not math.isfinite(v): return f"Pole {pole} musi być liczbą (jest: {v!r})."
+    gr = p['gr_plyty']
+    if p['w_mebla'] <= 2 * gr: return "Szerokość mebla jest za mała względem grubości płyt."
+    if p['h_mebla'] <= 2 * gr: return "Wysokość mebla jest za mała względem grubości płyt."
+    if p['d_mebla'] <= gr: return "Głębokość mebla jest za mała."
+    if p['il_przegrod'] < 0: return "Liczba przegród nie może być ujemna."
+    return None
+
+
+def przygotuj(cialo, sciezka, parametry):
+    """Ciało żądania -> (specyfikacja znormalizowana, klucz wyniku). BladZadania przy złych danych."""
+    try:
+        dane = json.loads(cialo)
+    except ValueError as e:
+        raise BladZadania(400, f"Niepoprawny JSON: {e}")
+    if not isinstance(dane, dict): raise BladZadania(400, "Oczekiwany obiekt JSON (projekt lub zlecenie).")
+    z_cenami = TRASY[sciezka][2]
+    try:
+        if jest_zleceniem(dane):
+            dane = normalizuj_zlecenie(dane); projekty = dane['szafki']
+            skrot = hash_zlecenia(dane) + (hash_projektu(dane, ('ceny',)) if z_cenami else "")
+        else:
+            dane = normalizuj_projekt(dane); projekty = [dane]
+            skrot = hash_projektu(dane, POLA_GEOMETRII + (('ceny',) if z_cenami else ()))
+    except (TypeError, ValueError, AttributeError, KeyError) as e:
+        raise BladZadania(400, f"Niepoprawna specyfikacja: {e}")
+    for p in projekty:
+        blad = _sprawdz(p)
+        if blad: raise BladZadania(422, f"{p['kod_pro']}: {blad}")
+    return dane, (sciezka, tuple(sorted(parametry.items())), skrot)
+
+
+# ======================================================
+# USŁUGA
+# ======================================================
+
+class Usluga:
+    """
+    Pula procesów z ograniczoną kolejką i pamięcią wyników. Żądania ponad
+    `procesy` zadań w toku czekają na miejsce (najwyżej `kolejka` naraz);
+    nadmiarowe dostają 503 zamiast rosnącej kolejki w pamięci.
+    """
+
+    def __init__(self, procesy=None, kolejka=32, pamiec_bajtow=256 * 2**20):
+        self.procesy = procesy or os.cpu_count() or 1
+        self.max_kolejka = kolejka
+        self.wyniki = LRUCache(pamiec_bajtow)
+        self.w_toku = 0
+        self.w_kolejce = 0
+        self.odrzucone = 0
+        self.obsluzone = 0
+        self._miejsca = asyncio.Semaphore(self.procesy)
+        self._liczone = {}       # klucz -> asyncio.Future (identyczne żądania w toku)
+        self._pula = self._nowa_pula()
+
+    def _nowa_pula(self):
+        # spawn: procesy robocze bez kopii pamięci pętli zdarzeń
+        return ProcessPoolExecutor(max_workers=self.procesy, mp_context=multiprocessing.get_context("spawn"))
+
+    def stan(self):
+        return {"procesy": self.procesy, "w_toku": self.w_toku, "w_kolejce": self.w_kolejce, "max_kolejka": self.max_kolejka,
+                "obsluzone": self.obsluzone, "odrzucone": self.odrzucone, "wyniki": len(self.wyniki),
+                "wyniki_bajty": self.wyniki.bajty, "trafienia": self.wyniki.trafienia, "chybienia": self.wyniki.chybienia}
+
+    async def wynik(self, klucz, dane, parametry):
+        """(bajty, z pamięci?) – z pamięci, z trwającego identycznego zadania albo z puli."""
+        gotowy = self.wyniki.pobierz(klucz)
+        if gotowy is not None: return gotowy, True
+        trwa = self._liczone.get(klucz)
+        if trwa is not None: return await asyncio.shield(trwa), True
+        if self.w_kolejce >= self.max_kolejka and self._miejsca.locked():
+            self.odrzucone += 1
+            raise BladZadania(503, "Serwer zajęty – spróbuj ponownie za chwilę.")
+        fut = self._liczone[klucz] = asyncio.get_running_loop().create_future()
+        try:
+            self.w_kolejce += 1
+            try:
+                await self._miejsca.acquire()
+            finally:
+                self.w_kolejce -= 1
+            try:
+                self.w_toku += 1
+                wynik = await asyncio.get_running_loop().run_in_executor(self._pula, wykonaj, klucz[0], dane, parametry)
+            finally:
+                self.w_toku -= 1; self._miejsca.release()
+            self.wyniki.zapisz(klucz, wynik); fut.set_result(wynik)
+            return wynik, False
+        except asyncio.CancelledError:
+            fut.cancel(); raise
+        except BrokenProcessPool as e:
+            self._pula = self._nowa_pula()   # proces roboczy zginął (np. brak pamięci) – nowa pula dla kolejnych żądań
+            fut.set_exception(e); raise
+        except BaseException as e:
+            fut.set_exception(e); raise
+        finally:
+            del self._liczone[klucz]
+            if fut.done() and not fut.cancelled(): fut.exception()   # oznacz wyjątek jako odebrany
+
+    async def odpowiedz(self, metoda, cel, cialo):
+        """(status, typ treści, bajty, nagłówki dodatkowe)."""
+        url = urlsplit(cel); parametry = dict(parse_qsl(url.query))
+        if url.path in ("/", "/stan"):
+            return 200, "application/json; charset=utf-8", json.dumps(self.stan()).encode(), {}
+        if url.path not in TRASY: raise BladZadania(404, f"Nieznana ścieżka: {url.path} (dostępne: {', '.join(TRASY)}, /stan)")
+        if metoda != "POST": raise BladZadania(405, "Wymagane POST z projektem JSON w ciele żądania.")
+        parametry = {k: parametry[k] for k in TRASY[url.path][3] if k in parametry}
+        if url.path == "/cnc" and parametry.get("format") not in FORMATY_CNC:
+            raise BladZadania(400, f"Parametr format: {', '.join(FORMATY_CNC)}")
+        dane, klucz = przygotuj(cialo, url.path, parametry)
+        try:
+            wynik, z_pamieci = await self.wynik(klucz, dane, parametry)
+        except BladZadania:
+            raise
+        except (KeyError, ValueError, TypeError) as e:
+            raise BladZadania(422, f"Błąd projektu: {type(e).__name__}: {e}")
+        return 200, TRASY[url.path][1], wynik, {"ETag": f'"{klucz[2][:32]}"', "X-Cache": "HIT" if z_pamieci else "MISS"}
+
+    # ---------- HTTP/1.1 ----------
+
+    async def obsluz_polaczenie(self, reader, writer):
+        try:
+            while True:
+                try:
+                    naglowek = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), CZAS_NAGLOWKA)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                linie = naglowek.decode("latin-1").split("\r\n")
+                try:
+                    metoda, cel, wersja = linie[0].split(" ", 2)
+                except ValueError:
+                    await self._wyslij(writer, 400, *self._blad("Niepoprawny wiersz żądania."), zamknij=True); break
+                naglowki = {k.strip().lower(): v.strip() for k, v in (l.split(":", 1) for l in linie[1:] if ":" in l)}
+                zamknij = naglowki.get("connection", "").lower() == "close" or wersja != "HTTP/1.1"
+                if "transfer-encoding" in naglowki:
+                    await self._wyslij(writer, 411, *self._blad("Wymagany nagłówek Content-Length."), zamknij=True); break
+                try:
+                    dlugosc = int(naglowki.get("content-length", "0") or 0)
+                    if dlugosc < 0: raise ValueError(dlugosc)
+                except ValueError:
+                    await self._wyslij(writer, 400, *self._blad("Niepoprawny nagłówek Content-Length."), zamknij=True); break
+                if dlugosc > MAX_CIALA:
+                    await self._wyslij(writer, 413, *self._blad(f"Ciało ponad {MAX_CIALA} B."), zamknij=True); break
+                cialo = await reader.readexactly(dlugosc) if dlugosc else b""
+                try:
+                    status, typ, dane, dodatkowe = await self.odpowiedz(metoda, cel, cialo)
+                except BladZadania as e:
+                    status = e.status; typ, dane = self._blad(str(e)); dodatkowe = {"Retry-After": "1"} if e.status == 503 else {}
+                except Exception as e:
+                    status = 500; typ, dane = self._blad(f"{type(e).__name__}: {e}"); dodatkowe = {}
+                self.obsluzone += 1
+                await self._wyslij(writer, status, typ, dane, dodatkowe, zamknij)
+                if zamknij: break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _blad(komunikat):
+        return "application/json; charset=utf-8", json.dumps({"blad": komunikat}, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    async def _wyslij(writer, status, typ, dane, dodatkowe=None, zamknij=False):
+        naglowki = {"Content-Type": typ, "Content-Length": str(len(dane)), "Connection": "close" if zamknij else "keep-alive", **(dodatkowe or {})}
+        writer.write((f"HTTP/1.1 {status} {STATUSY.get(status, '')}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in naglowki.items()) + "\r\n").encode("latin-1"))
+        writer.write(dane)
+        await writer.drain()   # wolny klient wstrzymuje tylko swoje połączenie
+
+    def zamknij(self):
+        self._pula.shutdown(cancel_futures=True)
+
+
+async def uruchom(host="127.0.0.1", port=8000, **opcje):
+    """Usługa i serwer asyncio (do testów lokalnych: port=0 – wolny port, serwer.sockets[0].getsockname())."""
+    usluga = Usluga(**opcje)
+    serwer = await asyncio.start_server(usluga.obsluz_polaczenie, host, port, limit=64 * 2**10)
+    return usluga, serwer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STOLARZPRO – usługa HTTP (lista elementów, CSV, PDF, CNC, kosztorys)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-j", "--procesy", type=int, default=None, help="procesy robocze (domyślnie: wszystkie rdzenie)")
+    parser.add_argument("--kolejka", type=int, default=32, help="żądań czekających na proces roboczy, zanim kolejne dostaną 503")
+    parser.add_argument("--pamiec-mb", type=int, default=256, help="limit pamięci wyników [MB]")
+    args = parser.parse_args(argv)
+
+    async def petla():
+        usluga, serwer = await uruchom(args.host, args.port, procesy=args.procesy, kolejka=args.kolejka, pamiec_bajtow=args.pamiec_mb * 2**20)
+        print(f"STOLARZPRO: http://{args.host}:{serwer.sockets[0].getsockname()[1]} (procesy: {usluga.procesy}, kolejka: {usluga.max_kolejka})")
+        try:
+            async with serwer: await serwer.serve_forever()
+        finally:
+            usluga.zamknij()
+
+    try:
+        asyncio.run(petla())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
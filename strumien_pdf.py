@@ -0,0 +1,210 @@
+# strumien_pdf.py
+# Zapis PDF strona po stronie (STOLARZPRO): treść strony trafia do pliku zaraz po jej narysowaniu
+#
+# reportlab (canvas, platypus) trzyma cały dokument w pamięci aż do save().
+# Tu po zamknięciu strony w pamięci zostają tylko przesunięcia obiektów (xref),
+# numery stron i znaki użyte w czcionkach – pamięć nie rośnie z treścią
+# dokumentu. Czcionki TrueType (podzbiory po 256 znaków, jak w reportlab)
+# i przezroczystości zapisywane są na końcu, we wspólnym słowniku zasobów,
+# do którego strony odwołują się numerem zarezerwowanym na początku.
+# Powtarzalna treść (np. rysunek tej samej formatki) może być zapisana raz jako
+# obiekt formy (Form XObject) i wstawiana na kolejnych stronach.
+#
+#   with StrumienPDF("dok.pdf") as pdf:              # ścieżka albo obiekt z write()
+#       pdf.strona(595, 842); pdf.tekst(...); pdf.koniec_strony()
+
+import zlib
+from math import cos, radians, sin
+
+KATALOG, STRONY, ZASOBY = 1, 2, 3   # numery obiektów zarezerwowane na początku
+KAPPA = 0.5522847498                 # koło z czterech krzywych Béziera
+
+
+def _f(v):
+    return "%.2f" % v
+
+
+def kolor_rgb(tekst):
+    """'#rrggbb' -> 'r g b' (składowe 0..1 dla operatorów rg/RG)."""
+    return " ".join(_f(int(tekst[i:i + 2], 16) / 255) for i in (1, 3, 5))
+
+
+def _nazwa_podzbioru(n):
+    return "".join(chr(65 + int(c)) for c in "%06d" % n)
+
+
+class StrumienPDF:
+    """
+    Dokument PDF pisany do pliku (ścieżka) lub strumienia (obiekt z write(),
+    np. odpowiedź HTTP) – każda strona jednym write() w koniec_strony().
+    Czcionki: nazwy zarejestrowane w reportlab (pdfmetrics.registerFont, TTF).
+    """
+
+    def __init__(self, plik, kompresja=True):
+        self._wlasny = not hasattr(plik, "write")
+        self._plik = open(plik, "wb") if self._wlasny else plik
+        self.kompresja = kompresja
+        self._przesuniecia = {}     # numer obiektu -> pozycja w pliku
+        self._nr = ZASOBY
+        self._poz = 0
+        self._kids = []
+        self._czcionki = {}         # nazwa reportlab -> [przypisania znak -> (podzbiór, kod), podzbiory, nazwy zasobów]
+        self._alfy = {}             # przezroczystość -> nazwa ExtGState
+        self._formy = {}            # nazwa formy -> numer obiektu
+        self._ops = None
+        self._ops_strony = None
+        self.strony = 0
+        self._pisz(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ, *exc):
+        if typ is None: self.zamknij()
+        elif self._wlasny: self._plik.close()
+
+    # ---------- zapis obiektów ----------
+
+    def _pisz(self, dane):
+        self._plik.write(dane); self._poz += len(dane)
+
+    def _nowy_numer(self):
+        self._nr += 1
+        return self._nr
+
+    def _obiekt(self, nr, tresc, strumien=None):
+        """Obiekt jako bajty (zapis w _zapisz_obiekty); `strumien` – dane strumienia (kompresowane)."""
+        if strumien is not None:
+            filtr = ""
+            if self.kompresja: strumien = zlib.compress(strumien); filtr = " /Filter /FlateDecode"
+            return b"%d 0 obj\n<< %s /Length %d%s >>\nstream\n%s\nendstream\nendobj\n" % (nr, tresc.encode("latin-1"), len(strumien), filtr.encode(), strumien)
+        return b"%d 0 obj\n%s\nendobj\n" % (nr, tresc.encode("latin-1"))
+
+    def _zapisz_obiekty(self, obiekty):
+        """Zapisuje [(nr, bajty)] jednym write()."""
+        poz = self._poz
+        for nr, dane in obiekty: self._przesuniecia[nr] = poz; poz += len(dane)
+        self._pisz(b"".join(d for _, d in obiekty))
+
+    # ---------- strony ----------
+
+    def strona(self, w, h):
+        self._w, self._h = w, h
+        self._ops = []
+
+    def koniec_strony(self):
+        tresc = "\n".join(self._ops).encode("latin-1"); self._ops = None
+        nr_tresci = self._nowy_numer(); nr_strony = self._nowy_numer()
+        self._zapisz_obiekty([(nr_tresci, self._obiekt(nr_tresci, "", tresc)),
+                              (nr_strony, self._obiekt(nr_strony, f"<< /Type /Page /Parent {STRONY} 0 R /MediaBox [0 0 {_f(self._w)} {_f(self._h)}] "
+                                                                  f"/Resources {ZASOBY} 0 R /Contents {nr_tresci} 0 R >>"))])
+        self._kids.append(nr_strony); self.strony += 1
+
+    # ---------- formy (treść wspólna dla wielu stron) ----------
+
+    def forma(self):
+        """Kolejne operacje rysowania trafiają do nowej formy o rozmiarze bieżącej strony (aż do koniec_formy)."""
+        self._ops_strony = self._ops; self._ops = []
+
+    def koniec_formy(self):
+        """Zapisuje formę i wraca do rysowania strony; zwraca nazwę formy (dla wstaw_forme)."""
+        tresc = "\n".join(self._ops).encode("latin-1"); self._ops = self._ops_strony; self._ops_strony = None
+        nr = self._nowy_numer(); nazwa = f"X{len(self._formy) + 1}"
+        self._zapisz_obiekty([(nr, self._obiekt(nr, f"/Type /XObject /Subtype /Form /BBox [0 0 {_f(self._w)} {_f(self._h)}] /Resources {ZASOBY} 0 R", tresc))])
+        self._formy[nazwa] = nr
+        return nazwa
+
+    def wstaw_forme(self, nazwa):
+        self._ops.append(f"q /{nazwa} Do Q")
+
+    def zamknij(self):
+        """Czcionki, zasoby, drzewo stron i tablica xref; zamyka plik, jeśli otwarty tutaj."""
+        obiekty = []; fonty = []
+        for nazwa, (_, podzbiory, nazwy) in self._czcionki.items():
+            for n, podzbior in enumerate(podzbiory): fonty.append(f"/{nazwy[n]} {self._czcionka_obiekty(nazwa, n, podzbior, obiekty)} 0 R")
+        gs = " ".join(f"/{g} << /Type /ExtGState /CA {a:g} /ca {a:g} >>" for a, g in self._alfy.items())
+        formy = " ".join(f"/{n} {nr} 0 R" for n, nr in self._formy.items())
+        obiekty.append((ZASOBY, self._obiekt(ZASOBY, f"<< /ProcSet [/PDF /Text] /Font << {' '.join(fonty)} >> /ExtGState << {gs} >> /XObject << {formy} >> >>")))
+        obiekty.append((STRONY, self._obiekt(STRONY, f"<< /Type /Pages /Count {len(self._kids)} /Kids [{' '.join(f'{k} 0 R' for k in self._kids)}] >>")))
+        obiekty.append((KATALOG, self._obiekt(KATALOG, f"<< /Type /Catalog /Pages {STRONY} 0 R >>")))
+        self._zapisz_obiekty(obiekty)
+        xref = self._poz; n = self._nr + 1
+        wpisy = [b"0000000000 65535 f \n"] + [b"%010d 00000 n \n" % self._przesuniecia[i] for i in range(1, n)]
+        self._pisz(b"xref\n0 %d\n" % n + b"".join(wpisy) + b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (n, KATALOG, xref))
+        if self._wlasny: self._plik.close()
+
+    def _czcionka_obiekty(self, nazwa, n, podzbior, obiekty):
+        """Podzbiór czcionki TTF (plik, deskryptor, ToUnicode, słownik fontu); zwraca numer słownika."""
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import makeToUnicodeCMap
+        face = pdfmetrics.getFont(nazwa).face
+        bazowa = _nazwa_podzbioru(n) + "+" + (face.name + face.subfontNameX).decode("latin-1")
+        plik = face.makeSubset(podzbior)
+        nr_pliku, nr_opisu, nr_cmap, nr_fontu = (self._nowy_numer() for _ in range(4))
+        flagi = (face.flags & ~32) | 4
+        obiekty += [
+            (nr_pliku, self._obiekt(nr_pliku, f"/Length1 {len(plik)}", plik)),
+            (nr_opisu, self._obiekt(nr_opisu, f"<< /Type /FontDescriptor /FontName /{bazowa} /Flags {flagi} /FontBBox [{' '.join(_f(v) for v in face.bbox)}] "
+                                              f"/Ascent {_f(face.ascent)} /Descent {_f(face.descent)} /CapHeight {_f(face.capHeight)} /ItalicAngle {face.italicAngle:g} "
+                                              f"/StemV {face.stemV} /MissingWidth {_f(face.defaultWidth)} /FontFile2 {nr_pliku} 0 R >>")),
+            (nr_cmap, self._obiekt(nr_cmap, "", makeToUnicodeCMap(bazowa, podzbior).encode("latin-1"))),
+            (nr_fontu, self._obiekt(nr_fontu, f"<< /Type /Font /Subtype /TrueType /BaseFont /{bazowa} /FirstChar 0 /LastChar {len(podzbior) - 1} "
+                                              f"/Widths [{' '.join(_f(face.getCharWidth(c)) for c in podzbior)}] "
+                                              f"/FontDescriptor {nr_opisu} 0 R /ToUnicode {nr_cmap} 0 R >>")),
+        ]
+        return nr_fontu
+
+    # ---------- rysowanie (współrzędne w punktach, oś Y w górę) ----------
+
+    def prostokat(self, x, y, w, h, wypelnienie=None, obrys=None, grubosc=1.0):
+        """Kolory jako 'r g b' (kolor_rgb)."""
+        ops = self._ops
+        if wypelnienie: ops.append(wypelnienie + " rg")
+        if obrys: ops.append(obrys + " RG " + _f(grubosc) + " w")
+        ops.append(f"{_f(x)} {_f(y)} {_f(w)} {_f(h)} re " + ("B" if wypelnienie and obrys else "f" if wypelnienie else "S"))
+
+    def kolo(self, x, y, r, wypelnienie=None, obrys=None, grubosc=1.0):
+        ops = self._ops; k = KAPPA * r
+        if wypelnienie: ops.append(wypelnienie + " rg")
+        if obrys: ops.append(obrys + " RG " + _f(grubosc) + " w")
+        ops.append(f"{_f(x + r)} {_f(y)} m "
+                   f"{_f(x + r)} {_f(y + k)} {_f(x + k)} {_f(y + r)} {_f(x)} {_f(y + r)} c "
+                   f"{_f(x - k)} {_f(y + r)} {_f(x - r)} {_f(y + k)} {_f(x - r)} {_f(y)} c "
+                   f"{_f(x - r)} {_f(y - k)} {_f(x - k)} {_f(y - r)} {_f(x)} {_f(y - r)} c "
+                   f"{_f(x + k)} {_f(y - r)} {_f(x + r)} {_f(y - k)} {_f(x + r)} {_f(y)} c "
+                   + ("b" if wypelnienie and obrys else "f" if wypelnienie else "s"))
+
+    def linia(self, x1, y1, x2, y2, kolor, grubosc=1.0, kreski=None, przezroczystosc=1.0):
+        op = f"q {kolor} RG {_f(grubosc)} w "
+        if kreski: op += f"[{' '.join(_f(k) for k in kreski)}] 0 d "
+        if przezroczystosc < 1:
+            g = self._alfy.get(przezroczystosc)
+            if g is None: g = self._alfy[przezroczystosc] = f"G{len(self._alfy) + 1}"
+            op += f"/{g} gs "
+        self._ops.append(op + f"{_f(x1)} {_f(y1)} m {_f(x2)} {_f(y2)} l S Q")
+
+    def tekst(self, x, y, tekst, czcionka, rozmiar, kolor="0 0 0", obrot=0):
+        """Tekst od linii bazowej w (x, y), obrócony o `obrot` stopni w lewo."""
+        if obrot: c = cos(radians(obrot)); s = sin(radians(obrot)); mac = f"{c:.4f} {s:.4f} {-s:.4f} {c:.4f} {_f(x)} {_f(y)} Tm"
+        else: mac = f"1 0 0 1 {_f(x)} {_f(y)} Tm"
+        kawalki = " ".join(f"/{nazwa} {_f(rozmiar)} Tf <{kody}> Tj" for nazwa, kody in self._kody(czcionka, tekst))
+        self._ops.append(f"BT {kolor} rg {mac} {kawalki} ET")
+
+    def _kody(self, czcionka, tekst):
+        """[(zasób fontu, kody hex)] – znaki dostają kolejne kody w podzbiorach po 256."""
+        stan = self._czcionki.get(czcionka)
+        if stan is None: stan = self._czcionki[czcionka] = [{}, [], []]
+        przypisania, podzbiory, nazwy = stan
+        wynik = []; biezacy = -1; kody = []
+        for z in tekst:
+            p = przypisania.get(z)
+            if p is None:
+                if not podzbiory or len(podzbiory[-1]) == 256:
+                    podzbiory.append([]); nazwy.append(f"F{list(self._czcionki).index(czcionka) + 1}_{len(podzbiory)}")
+                p = przypisania[z] = (len(podzbiory) - 1, len(podzbiory[-1])); podzbiory[-1].append(ord(z))
+            if p[0] != biezacy:
+                if kody: wynik.append((nazwy[biezacy], "".join(kody)))
+                biezacy = p[0]; kody = []
+            kody.append("%02X" % p[1])
+        if kody: wynik.append((nazwy[biezacy], "".join(kody)))
+        return wynik
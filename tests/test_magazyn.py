@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from magazyn import MagazynResztek, rozkroj_z_magazynu
+
+
+def test_zlecenie_w_jednej_resztce_nie_kupuje_arkusza():
+    with MagazynResztek(":memory:") as magazyn:
+        for i in range(50):
+            magazyn.dodaj("18mm KORPUS", 18, 400 + i, 150)   # za małe na formatki
+        duza = magazyn.dodaj("18mm KORPUS", 18, 2000, 1200)
+        formatki = [{"w": 720, "h": 560, "nazwa": f"F{i}"} for i in range(4)] + [{"w": 300, "h": 200, "nazwa": "M"}]
+        wynik = rozkroj_z_magazynu(magazyn, formatki, "18mm KORPUS", 18)
+        assert not wynik.kupione
+        assert [a.resztka for a in wynik.arkusze] == [duza]
+        assert not wynik.nieulozone
+        assert len(magazyn) >= 50   # małe resztki wróciły do magazynu
+
+
+def test_bez_pasujacej_resztki_nowy_arkusz_a_resztki_zostaja():
+    with MagazynResztek(":memory:") as magazyn:
+        magazyn.dodaj("18mm KORPUS", 18, 500, 300)
+        wynik = rozkroj_z_magazynu(magazyn, [{"w": 720, "h": 560, "nazwa": "F"}], "18mm KORPUS", 18)
+        assert len(wynik.kupione) == 1
+        assert magazyn.pasujace("18mm KORPUS", 18, 500, 300)
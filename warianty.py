@@ -0,0 +1,201 @@
+# warianty.py
+# Przegląd wariantów projektu STOLARZPRO: siatka wymiarów / przegród / modułów, ranking wg arkuszy, uzysku i kosztu
+#
+#   from warianty import przeglad
+#   wynik = przeglad(projekt, {'w_mebla': range(400, 1201, 50), 'h_mebla': [720, 820], 'il_przegrod': [0, 1]},
+#                    kryteria=("arkusze", "koszt"), najlepsze=20)
+#
+#   python warianty.py baza.json --w 400:1200:50 --h 720,820 --przegrody 0,1 -n 20
+#
+# Dwa etapy (branch and bound): najpierw dla każdego wariantu lista elementów
+# i dolna granica (arkusze z pola formatek z rzazem, koszt z tymi arkuszami),
+# potem pełny rozkrój w kolejności granic. Gdy granica kolejnych wariantów
+# jest gorsza niż ostatni z `najlepsze`, reszta jest odrzucana bez rozkroju.
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from constants import ARKUSZ_H, ARKUSZ_W, RZAZ
+from generator import normalizuj_projekt, okucia, run_generator_wsadowo
+from kosztorys import PLYTA, ilosci, rodzaj_materialu, wektor_cen
+from pomiary import licznik, mierzony
+from zlecenie import rozkroj_zlecenia
+
+# Parametry siatki (klucze zakresów); 'moduly' – lista zestawów modułów wstawianych do każdej sekcji
+PARAMETRY = ("w_mebla", "h_mebla", "d_mebla", "il_przegrod", "moduly")
+KRYTERIA = {"arkusze": 1, "koszt": 1, "uzysk": -1}   # kierunek: 1 – mniej lepiej, -1 – więcej lepiej
+PACZKA = 16                                          # wariantów na zadanie procesu roboczego
+
+
+@dataclass
+class Wariant:
+    parametry: dict
+    arkusze: int
+    uzysk: float       # [%] pole formatek / pole arkuszy, wszystkie materiały
+    koszt: float       # [zł] płyta w arkuszach + okleina + okucia
+
+    def klucz(self, kryteria):
+        return tuple(KRYTERIA[k] * getattr(self, k) for k in kryteria)
+
+
+@dataclass
+class WynikPrzegladu:
+    ranking: list                      # najlepsze warianty, od najlepszego
+    warianty: int = 0                  # w siatce
+    ocenione: int = 0                  # z pełnym rozkrojem
+    odrzucone: int = 0                 # po dolnej granicy, bez rozkroju
+    nieulozone: list = field(default_factory=list)   # parametry wariantów z formatką większą niż arkusz
+
+
+# ======================================================
+# SIATKA WARIANTÓW
+# ======================================================
+
+def siatka(zakresy):
+    """Wszystkie kombinacje parametrów (słowniki) – kolejność jak w PARAMETRY."""
+    nieznane = set(zakresy) - set(PARAMETRY)
+    if nieznane: raise ValueError(f"Nieznane parametry wariantów: {', '.join(sorted(nieznane))}")
+    klucze = [k for k in PARAMETRY if k in zakresy]
+    return [dict(zip(klucze, v)) for v in itertools.product(*(list(zakresy[k]) for k in klucze))]
+
+
+def projekt_wariantu(baza, parametry):
+    """Projekt bazowy z parametrami wariantu; zestaw modułów trafia do każdej sekcji."""
+    p = {**baza, **{k: v for k, v in parametry.items() if k != "moduly"}}
+    p['kod_pro'] = baza.get('kod_pro') or "WARIANT"
+    if "moduly" in parametry: p['moduly_sekcji'] = {s: parametry["moduly"] for s in range(int(p['il_przegrod']) + 1)}
+    return normalizuj_projekt(p)
+
+
+# ======================================================
+# OCENA (W PROCESACH ROBOCZYCH)
+# ======================================================
+
+def _granice(baza, czesc, opcje):
+    """Dolne granice kluczy wariantów (arkusze, koszt; uzysk – górna granica) bez rozkroju."""
+    rzaz = opcje.get('rzaz', RZAZ); aw = opcje.get('arkusz_w', ARKUSZ_W) + rzaz; ah = opcje.get('arkusz_h', ARKUSZ_H) + rzaz
+    projekty = [projekt_wariantu(baza, p) for p in czesc]; wynik = []
+    for p, lista in zip(projekty, run_generator_wsadowo(projekty)):
+        kody = np.frombuffer(lista.material.kody, dtype=lista.material.kody.typecode)
+        szer = np.frombuffer(lista.szer, dtype='i4').astype('f8'); wys = np.frombuffer(lista.wys, dtype='i4').astype('f8')
+        # Formatka z rzazem zajmuje (w+rzaz)x(h+rzaz) arkusza powiększonego o rzaz (jak nesting.rozkroj)
+        pole_z_rzazem = np.bincount(kody, weights=(szer + rzaz) * (wys + rzaz), minlength=len(lista.material.wartosci))
+        arkusze = np.ceil(pole_z_rzazem / (aw * ah) - 1e-9)
+        q = ilosci(lista, {}, okucia(p))
+        for m, n in zip(lista.material.wartosci, arkusze): q[PLYTA[rodzaj_materialu(m)]] += n * (aw - rzaz) * (ah - rzaz) / 1e6
+        pole = float(np.dot(szer, wys)) / 1e6
+        wynik.append(Wariant(czesc[len(wynik)], int(arkusze.sum()), 100.0 * pole / max(q[:3].sum(), 1e-9), float(q @ wektor_cen(p['ceny']))))
+    return wynik
+
+
+def _ocen(baza, czesc, opcje):
+    """Pełna ocena wariantów: rozkrój każdego materiału; None – formatka większa niż arkusz."""
+    projekty = [projekt_wariantu(baza, p) for p in czesc]; wynik = []
+    for parametry, p, lista in zip(czesc, projekty, run_generator_wsadowo(projekty)):
+        rozkroje = rozkroj_zlecenia(lista, **opcje)
+        if any(r.nieulozone for r in rozkroje.values()): wynik.append(None); continue
+        q = ilosci(lista, rozkroje, okucia(p)); pole_ark = sum(a.w * a.h for r in rozkroje.values() for a in r.arkusze)
+        wynik.append(Wariant(parametry, sum(r.liczba_arkuszy for r in rozkroje.values()),
+                             100.0 * lista.pole_m2() * 1e6 / max(pole_ark, 1e-9), float(q @ wektor_cen(p['ceny']))))
+    return wynik
+
+
+def _paczki(elementy, rozmiar):
+    return [elementy[i:i + rozmiar] for i in range(0, len(elementy), rozmiar)]
+
+
+# ======================================================
+# PRZEGLĄD
+# ======================================================
+
+@mierzony("warianty.przeglad")
+def przeglad(baza, zakresy, kryteria=("arkusze", "uzysk", "koszt"), najlepsze=20, procesy=None, **opcje):
+    """
+    Ranking `najlepsze` wariantów projektu `baza` z siatki `zakresy` (parametr -> wartości).
+    kryteria – porządek leksykograficzny (KRYTERIA); odcinanie po pierwszym kryterium.
+    opcje – jak w nesting.rozkroj (arkusz_w, arkusz_h, rzaz, metoda, obrot).
+    procesy=None: wszystkie rdzenie; 1 – bez puli procesów.
+    """
+    if any(k not in KRYTERIA for k in kryteria): raise ValueError(f"Nieznane kryterium (dostępne: {', '.join(KRYTERIA)})")
+    baza = normalizuj_projekt(baza); warianty = siatka(zakresy)
+    procesy = procesy or os.cpu_count() or 1
+    wynik = WynikPrzegladu([], warianty=len(warianty))
+    pula = ProcessPoolExecutor(max_workers=procesy, mp_context=multiprocessing.get_context("spawn")) if procesy > 1 else None
+    mapuj = (lambda f, czesci: pula.map(f, itertools.repeat(baza), czesci, itertools.repeat(opcje))) if pula else \
+            (lambda f, czesci: map(f, itertools.repeat(baza), czesci, itertools.repeat(opcje)))
+    try:
+        # Etap 1: granice wszystkich wariantów (generator, bez rozkroju)
+        granice = [w for czesc in mapuj(_granice, _paczki(warianty, PACZKA)) for w in czesc]
+        kolejnosc = sorted(range(len(granice)), key=lambda i: granice[i].klucz(kryteria))
+
+        # Etap 2: rozkrój w kolejności granic, rundami po `procesy` paczek
+        ranking = []; poz = 0; runda = PACZKA * procesy
+        while poz < len(kolejnosc):
+            if len(ranking) >= najlepsze and granice[kolejnosc[poz]].klucz(kryteria)[0] > ranking[najlepsze - 1].klucz(kryteria)[0]: break
+            indeksy = kolejnosc[poz:poz + runda]; poz += len(indeksy)
+            ocenione = [w for czesc in mapuj(_ocen, _paczki([warianty[i] for i in indeksy], PACZKA)) for w in czesc]
+            wynik.ocenione += len(indeksy)
+            wynik.nieulozone += [warianty[i] for i, w in zip(indeksy, ocenione) if w is None]
+            ranking = sorted(ranking + [w for w in ocenione if w is not None], key=lambda w: w.klucz(kryteria))[:najlepsze]
+    finally:
+        if pula: pula.shutdown()
+    wynik.odrzucone = len(warianty) - wynik.ocenione
+    wynik.ranking = ranking
+    licznik("warianty.ocenione", wynik.ocenione); licznik("warianty.odrzucone", wynik.odrzucone)
+    return wynik
+
+
+def _opis_modulow(moduly):
+    return " + ".join(f"{m['typ']} x{m.get('detale', {}).get('ilosc', 1)}" for m in moduly)
+
+
+def tabela(wynik):
+    """Wiersze rankingu (do st.dataframe / JSON); zestaw modułów jako krótki opis."""
+    return [{**{k: (_opis_modulow(v) if k == "moduly" else v) for k, v in w.parametry.items()},
+             "arkusze": w.arkusze, "uzysk [%]": round(w.uzysk, 2), "koszt [zł]": round(w.koszt, 2)} for w in wynik.ranking]
+
+
+# ======================================================
+# CLI
+# ======================================================
+
+def _zakres(tekst):
+    """'400:1200:50' (od:do:krok, z końcem) albo '720,820'."""
+    if ":" in tekst:
+        od, do, krok = (int(x) for x in tekst.split(":"))
+        return list(range(od, do + 1, krok))
+    return [int(x) for x in tekst.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="STOLARZPRO – przegląd wariantów projektu (ranking wg arkuszy, uzysku i kosztu)")
+    parser.add_argument("baza", help="projekt bazowy JSON (jak z aplikacji)")
+    for nazwa, klucz in (("--w", "w_mebla"), ("--h", "h_mebla"), ("--d", "d_mebla"), ("--przegrody", "il_przegrod")):
+        parser.add_argument(nazwa, type=_zakres, dest=klucz, help=f"{klucz}: od:do:krok albo lista po przecinku")
+    parser.add_argument("--moduly", help="plik JSON z listą zestawów modułów (każdy wstawiany do wszystkich sekcji)")
+    parser.add_argument("-k", "--kryteria", default="arkusze,uzysk,koszt", help=f"kolejność kryteriów: {', '.join(KRYTERIA)}")
+    parser.add_argument("-n", "--najlepsze", type=int, default=20)
+    parser.add_argument("-j", "--procesy", type=int, default=None, help="liczba procesów (domyślnie: wszystkie rdzenie)")
+    args = parser.parse_args(argv)
+
+    with open(args.baza, encoding="utf-8") as f: baza = json.load(f)
+    zakresy = {k: getattr(args, k) for k in PARAMETRY[:4] if getattr(args, k)}
+    if args.moduly:
+        with open(args.moduly, encoding="utf-8") as f: zakresy["moduly"] = json.load(f)
+    wynik = przeglad(baza, zakresy, tuple(args.kryteria.split(",")), args.najlepsze, args.procesy)
+    print(json.dumps(tabela(wynik), ensure_ascii=False, indent=1))
+    print(f"Warianty: {wynik.warianty}, z rozkrojem: {wynik.ocenione}, odrzucone bez rozkroju: {wynik.odrzucone}, "
+          f"za duże na arkusz: {len(wynik.nieulozone)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+# wektor.py
+# Rysunki dokumentacji bez Matplotlib (STOLARZPRO): formatka, tabela wierceń, instrukcja, podgląd mebla – wprost do PDF lub SVG
+#
+# Strony jak dawne figury Matplotlib z rysunki.py (układ, rozmiary czcionek, kolory i marginesy
+# przeniesione z figur Matplotlib), ale rysowane prymitywami: prostokąt, koło,
+# linia, tekst. PlotnoPDF pisze stronę po stronie (strumien_pdf, czcionki DejaVu
+# jak w Matplotlib), PlotnoSVG składa tekst SVG. Funkcje rysujące nie wiedzą, na
+# czym rysują – współrzędne stron w punktach (1/72 cala), oś Y w górę.
+
+import hashlib
+import json
+import os
+import textwrap
+from functools import lru_cache
+from importlib.util import find_spec
+from math import cos, radians, sin
+from xml.sax.saxutils import escape, quoteattr
+
+from pomiary import licznik, mierzony
+from strumien_pdf import StrumienPDF, kolor_rgb
+from wiercenia import jako_otwory, linie, sortuj
+
+
+# Wersja wyglądu stron – część klucza plików na dysku (cache.dysk); zmienić przy każdej zmianie rysunków
+WERSJA = 1
+
+A4_PION = (8.27 * 72, 11.69 * 72)     # rozmiar strony [pt]
+A4_POZIOM = (11.69 * 72, 8.27 * 72)
+PODGLAD = (10 * 72, 7 * 72)            # rysunek formatki w aplikacji (figsize=(10, 7))
+
+# Czcionki Matplotlib (DejaVu – z polskimi znakami), pliki z mpl-data bez importu Matplotlib
+CZCIONKI = {"sans": ("DejaVuSans", "DejaVuSans.ttf"), "sans_b": ("DejaVuSans-Bold", "DejaVuSans-Bold.ttf"),
+            "mono": ("DejaVuSansMono", "DejaVuSansMono.ttf")}
+RODZINY_SVG = {"sans": ('"DejaVu Sans", Verdana, sans-serif', "normal"), "sans_b": ('"DejaVu Sans", Verdana, sans-serif', "bold"),
+               "mono": ('"DejaVu Sans Mono", monospace', "normal")}
+
+# Pionowy zasięg tekstu względem linii bazowej (ułamek rozmiaru) – jak bbox tekstu w Matplotlib
+GORA_TEKSTU = 0.76
+DOL_TEKSTU = 0.208
+
+KOLOR_LINII = "#444444"
+KOLOR_FRONTU = "#d62828"
+KRESKI = (1.48, 0.64)       # linestyle '--' Matplotlib przy grubości 0.4
+
+
+def _katalog_czcionek():
+    return os.path.join(os.path.dirname(find_spec("matplotlib").origin), "mpl-data", "fonts", "ttf")
+
+
+def czcionka(rodzaj):
+    """Nazwa czcionki reportlab dla rodzaju ('sans', 'sans_b', 'mono'); rejestrowana przy pierwszym użyciu."""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    nazwa, plik = CZCIONKI[rodzaj]
+    if nazwa not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(nazwa, os.path.join(_katalog_czcionek(), plik)))
+    return nazwa
+
+
+def szerokosc(tekst, rodzaj, rozmiar):
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    return stringWidth(tekst, czcionka(rodzaj), rozmiar)
+
+
+@lru_cache(maxsize=None)
+def _kolor(tekst):
+    """Kolor PDF ('r g b') z zapisu '#rrggbb' – parsowany raz na kolor."""
+    return kolor_rgb(tekst)
+
+
+def _poczatek(szer, rozmiar, ha, va, obrot):
+    """
+    Przesunięcie linii bazowej tekstu względem punktu zaczepienia. Jak
+    w Matplotlib: ha/va dotyczą prostokąta otaczającego tekst już po obrocie.
+    """
+    c = cos(radians(obrot)); s = sin(radians(obrot))
+    naroza = [(u * c - v * s, u * s + v * c) for u in (0.0, szer) for v in (-DOL_TEKSTU * rozmiar, GORA_TEKSTU * rozmiar)]
+    xs = [p[0] for p in naroza]; ys = [p[1] for p in naroza]
+    dx = {"left": -min(xs), "center": -(min(xs) + max(xs)) / 2, "right": -max(xs)}[ha]
+    dy = 0.0 if va == "baseline" else {"bottom": -min(ys), "center": -(min(ys) + max(ys)) / 2, "top": -max(ys)}[va]
+    return dx, dy
+
+
+# ======================================================
+# PŁÓTNA
+# ======================================================
+
+class PlotnoPDF:
+    """Kolejne strony dokumentu PDF zapisywane od razu do pliku lub strumienia (strumien_pdf)."""
+
+    def __init__(self, plik):
+        self.c = StrumienPDF(plik)
+        self._formy = {}          # klucz treści -> nazwa formy w dokumencie
+        self.powtorzone = 0
+
+    def forma(self, klucz, rysuj):
+        """
+        Treść rysowana przez rysuj() – przy tym samym kluczu (np. klucz_rysunku
+        powtarzalnej półki) zapisana w dokumencie raz i wstawiana ponownie.
+        """
+        if klucz is None: return rysuj()
+        nazwa = self._formy.get(klucz)
+        if nazwa is None:
+            self.c.forma(); rysuj(); nazwa = self._formy[klucz] = self.c.koniec_formy()
+        else: self.powtorzone += 1
+        self.c.wstaw_forme(nazwa)
+
+    @property
+    def strony(self):
+        return self.c.strony
+
+    def strona(self, w, h):
+        self.c.strona(w, h)
+
+    def koniec_strony(self):
+        self.c.koniec_strony()
+
+    def zamknij(self):
+        self.c.zamknij()
+
+    def prostokat(self, x, y, w, h, wypelnienie=None, obrys=None, grubosc=1.0):
+        self.c.prostokat(x, y, w, h, wypelnienie and _kolor(wypelnienie), obrys and _kolor(obrys), grubosc)
+
+    def kolo(self, x, y, r, wypelnienie=None, obrys=None, grubosc=1.0):
+        self.c.kolo(x, y, r, wypelnienie and _kolor(wypelnienie), obrys and _kolor(obrys), grubosc)
+
+    def linia(self, x1, y1, x2, y2, kolor, grubosc=1.0, kreski=None, przezroczystosc=1.0):
+        self.c.linia(x1, y1, x2, y2, _kolor(kolor), grubosc, kreski, przezroczystosc)
+
+    def tekst(self, x, y, tekst, rozmiar, rodzaj="sans", kolor="#000000", ha="left", va="baseline", obrot=0):
+        dx, dy = _poczatek(szerokosc(tekst, rodzaj, rozmiar), rozmiar, ha, va, obrot)
+        self.c.tekst(x + dx, y + dy, tekst, czcionka(rodzaj), rozmiar, _kolor(kolor), obrot)
+
+
+class PlotnoSVG:
+    """Kolejne strony jako osobne dokumenty SVG (lista `strony`)."""
+
+    def __init__(self):
+        self.strony = []
+        self._el = []
+        self.h = 0
+
+    def strona(self, w, h):
+        self.h = h
+        self._el = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{w:.2f}pt" height="{h:.2f}pt" viewBox="0 0 {w:.2f} {h:.2f}">',
+                    '<rect width="100%" height="100%" fill="#ffffff"/>']
+
+    def koniec_strony(self):
+        self._el.append("</svg>"); self.strony.append("\n".join(self._el)); self._el = []
+
+    def zamknij(self):
+        pass
+
+    def forma(self, klucz, rysuj):
+        rysuj()
+
+    @staticmethod
+    def _styl(wypelnienie, obrys, grubosc):
+        return f'fill="{wypelnienie or "none"}"' + (f' stroke="{obrys}" stroke-width="{grubosc:g}"' if obrys else "")
+
+    def prostokat(self, x, y, w, h, wypelnienie=None, obrys=None, grubosc=1.0):
+        self._el.append(f'<rect x="{x:.2f}" y="{self.h - y - h:.2f}" width="{w:.2f}" height="{h:.2f}" {self._styl(wypelnienie, obrys, grubosc)}/>')
+
+    def kolo(self, x, y, r, wypelnienie=None, obrys=None, grubosc=1.0):
+        self._el.append(f'<circle cx="{x:.2f}" cy="{self.h - y:.2f}" r="{r:.2f}" {self._styl(wypelnienie, obrys, grubosc)}/>')
+
+    def linia(self, x1, y1, x2, y2, kolor, grubosc=1.0, kreski=None, przezroczystosc=1.0):
+        dodatki = (f' stroke-dasharray="{kreski[0]:g} {kreski[1]:g}"' if kreski else "") + (f' stroke-opacity="{przezroczystosc:g}"' if przezroczystosc < 1 else "")
+        self._el.append(f'<line x1="{x1:.2f}" y1="{self.h - y1:.2f}" x2="{x2:.2f}" y2="{self.h - y2:.2f}" stroke="{kolor}" stroke-width="{grubosc:g}"{dodatki}/>')
+
+    def tekst(self, x, y, tekst, rozmiar, rodzaj="sans", kolor="#000000", ha="left", va="baseline", obrot=0):
+        dx, dy = _poczatek(szerokosc(tekst, rodzaj, rozmiar), rozmiar, ha, va, obrot)
+        x0 = x + dx; y0 = self.h - (y + dy); rodzina, waga = RODZINY_SVG[rodzaj]
+        obr = f' transform="rotate({-obrot:g} {x0:.2f} {y0:.2f})"' if obrot else ""
+        self._el.append(f'<text x="{x0:.2f}" y="{y0:.2f}" font-family={quoteattr(rodzina)} font-weight="{waga}" font-size="{rozmiar:g}" '
+                        f'fill="{kolor}" xml:space="preserve"{obr}>{escape(tekst)}</text>')
+
+
+# ======================================================
+# STRONY
+# ======================================================
+
+def klucz_rysunku(el):
+    """Wszystko, co widać na rysunku elementu poza nagłówkiem (nazwa + ID)."""
+    n = el['Nazwa']
+    return ('element', el['Szerokość [mm]'], el['Wysokość [mm]'], jako_otwory(el['wiercenia']).tobytes(), el['orientacja'],
+            "HDF" in n, "Front" in n, "WIENIEC" in n.upper() or "PÓŁKA" in n.upper(), "Plecy" in n)
+
+
+def klucz_tabeli(el):
+    return ('tabela', jako_otwory(el['wiercenia']).tobytes())
+
+
+def rysuj_element(p, szer, wys, id_elementu, nazwa, otwory=(), orientacja_frontu="L", rozmiar=PODGLAD, naglowek=True, klucz=None):
+    """
+    Rysunek formatki z otworami, liniami trasowania, wymiarami i oznaczeniem
+    frontu (jak rysunki.rysuj_element). klucz (klucz_rysunku) – rysunek bez
+    nagłówka jako forma płótna, wspólna dla identycznych formatek.
+    """
+    W, H = rozmiar
+    p.strona(W, H)
+    p.forma(klucz, lambda: _rysunek_elementu(p, W, H, szer, wys, nazwa, otwory, orientacja_frontu))
+    if naglowek:
+        p.tekst(W / 2, H * 0.96, nazwa.upper(), 18, "sans_b", ha="center", va="top")
+        p.tekst(W / 2, H * 0.93, id_elementu, 10, "mono", "#555555", ha="center", va="top")
+    p.koniec_strony()
+
+
+def _rysunek_elementu(p, W, H, szer, wys, nazwa, otwory, orientacja_frontu):
+    kolor_tla = '#d9d9d9' if "HDF" in nazwa else '#e6ccb3'
+
+    # Obszar rysunku jak w Matplotlib: subplots_adjust + set_aspect('equal') (skala wspólna, środek)
+    mx = max(szer * 0.3, 350); my = max(wys * 0.2, 250)
+    x0, x1, y0, y1 = -mx, szer + mx, -my, wys + my
+    ax0, ax1, ay0, ay1 = 0.02 * W, 0.98 * W, 0.02 * H, 0.85 * H
+    s = min((ax1 - ax0) / (x1 - x0), (ay1 - ay0) / (y1 - y0))
+    ox = (ax0 + ax1) / 2 - s * (x0 + x1) / 2; oy = (ay0 + ay1) / 2 - s * (y0 + y1) / 2
+    X = lambda x: ox + s * x
+    Y = lambda y: oy + s * y
+
+    p.prostokat(X(0), Y(0), szer * s, wys * s, wypelnienie=kolor_tla, obrys="#000000", grubosc=2)
+
+    o = jako_otwory(otwory)
+    if len(o): ux, uy = linie(o); o = sortuj(o)
+    xs = o['x'].tolist(); ys = o['y'].tolist(); typy = o['typ'].tolist()
+    for x, y, c in zip(xs, ys, typy):
+        if c == 'blue': p.kolo(X(x), Y(y), 6 * s, "#ffffff", "#0000ff", 2)
+        elif c == 'red': p.kolo(X(x), Y(y), 4 * s, "#ff0000", "#ff0000", 1)
+        elif c == 'green': p.kolo(X(x), Y(y), (17.5 if "Front" in nazwa else 4) * s, "#ffffff", "#008000", 1.5)
+
+    # Front: pasek przy krawędzi frontowej (napis po liniach, jak kolejność warstw w Matplotlib)
+    is_h = "WIENIEC" in nazwa.upper() or "PÓŁKA" in nazwa.upper(); dist = 250
+    front = None
+    if "Plecy" not in nazwa:
+        if is_h or orientacja_frontu == 'D': p.prostokat(X(0), Y(-5), szer * s, 5 * s, KOLOR_FRONTU); front = (szer / 2, -dist, 0)
+        elif orientacja_frontu == 'L': p.prostokat(X(-5), Y(0), 5 * s, wys * s, KOLOR_FRONTU); front = (-dist, wys / 2, 90)
+        elif orientacja_frontu == 'P': p.prostokat(X(szer), Y(0), 5 * s, wys * s, KOLOR_FRONTU); front = (szer + dist, wys / 2, 270)
+
+    if len(o):
+        # Linie trasowania (przycięte do obszaru rysunku) i ich opisy
+        for yl in uy.tolist(): p.linia(X(max(-500, x0)), Y(yl), X(min(szer + 500, x1)), Y(yl), KOLOR_LINII, 0.4, KRESKI, 0.6)
+        for xl in ux.tolist(): p.linia(X(xl), Y(max(-500, y0)), X(xl), Y(min(wys + 500, y1)), KOLOR_LINII, 0.4, KRESKI, 0.6)
+        for yl in uy.tolist():
+            p.tekst(X(-25), Y(yl), f"Y:{yl:.0f}", 7, kolor=KOLOR_LINII, ha="right", va="center")
+            p.tekst(X(szer + 25), Y(yl), f"{yl:.0f}", 7, kolor=KOLOR_LINII, ha="left", va="center")
+        for xl in ux.tolist(): p.tekst(X(xl), Y(-30), f"X:{xl:.0f}", 7, kolor=KOLOR_LINII, ha="center", va="top", obrot=90)
+    if front: p.tekst(X(front[0]), Y(front[1]), "FRONT", 16, "sans_b", KOLOR_FRONTU, ha="center", va="center", obrot=front[2])
+
+    # Wymiary
+    p.tekst(X(szer / 2), Y(wys + 150), f"{szer:.0f} mm", 14, "sans_b", ha="center")
+    p.tekst(X(szer + 150), Y(wys / 2), f"{wys:.0f} mm", 14, "sans_b", ha="left", va="center", obrot=90)
+
+    # Numery otworów (kolejność jak w tabeli wierceń)
+    for x, y in zip(xs, ys): p.kolo(X(x + 12), Y(y + 12), 9 * s, "#000000", "#000000", 1)
+    for i, (x, y) in enumerate(zip(xs, ys)): p.tekst(X(x + 12), Y(y + 12), str(i + 1), 9, "sans_b", "#ffffff", ha="center", va="center")
+
+
+# Tabela wierceń: obszar jak bbox tabeli Matplotlib na domyślnych osiach A4; wiersze
+# wypełniają go jak w Matplotlib, ale nie są niższe niż MIN_WIERSZ – dłuższe tabele
+# przechodzą na kolejne strony
+MIN_WIERSZ = 16.0
+OPIS_TYPU = {"blue": "Konfirmat", "red": "Prowadnica"}
+
+
+def rysuj_tabele(p, id_e, n, otwory, naglowek=True, klucz=None):
+    """Tabela wierceń formatki (jedna lub więcej stron A4); klucz (klucz_tabeli) – jak w rysuj_element."""
+    W, H = A4_PION
+    o = sortuj(jako_otwory(otwory))
+    wiersze = [(str(i + 1), f"{x:.1f}", f"{y:.1f}", OPIS_TYPU.get(c, "Podpórka/Zawias"))
+               for i, (x, y, c) in enumerate(zip(o['x'].tolist(), o['y'].tolist(), o['typ'].tolist()))]
+    tx = 0.2025 * W; tw = 0.62 * W; ty = 0.7645 * H; th = 0.616 * H; kw = tw / 4
+    na_strone = max(1, int(th // MIN_WIERSZ) - 1)
+    wh = th / (min(len(wiersze), na_strone) + 1)
+
+    def tabela(wiersze):
+        p.tekst(W / 2, 0.95 * H, "TABELA WIERCEŃ", 16, "sans_b", ha="center")
+        if not wiersze:
+            p.tekst(0.5125 * W, 0.495 * H, "Brak otworów", 12, ha="center")
+            return
+        for r, wiersz in enumerate([("Nr", "X", "Y", "Typ")] + wiersze):
+            y = ty - (r + 1) * wh
+            tlo = "#333333" if r == 0 else ("#f4f4f4" if r % 2 == 0 else "#ffffff")
+            for k, t in enumerate(wiersz):
+                p.prostokat(tx + k * kw, y, kw, wh, tlo, "#000000", 1)
+                if r == 0: p.tekst(tx + (k + 0.5) * kw, y + wh / 2, t, 10, "sans_b", "#ffffff", ha="center", va="center")
+                else: p.tekst(tx + (k + 0.9) * kw, y + wh / 2, t, 10, ha="right", va="center")
+
+    for start in range(0, max(1, len(wiersze)), na_strone):
+        p.strona(W, H)
+        p.forma(klucz and (klucz, start), lambda: tabela(wiersze[start:start + na_strone]))
+        if naglowek:
+            p.tekst(W / 2, 0.92 * H, f"Element: {n}", 12, ha="center")
+            p.tekst(W / 2, 0.90 * H, f"ID: {id_e}", 10, "mono", "#555555", ha="center")
+        p.koniec_strony()
+
+
+def rysuj_instrukcje(p, tekst):
+    """Instrukcja montażu (czcionka stała, zawijanie do 85 znaków, kolejne strony w razie potrzeby)."""
+    W, H = A4_PION
+    wiersze = "\n".join(textwrap.fill(l, 85) for l in tekst.split('\n')).split('\n')
+    x = 0.16375 * W; y0 = 0.8415 * H - 0.917 * 10; krok = 11.55
+    na_strone = int((y0 - 0.11 * H) // krok) + 1
+    for start in range(0, len(wiersze), na_strone):
+        p.strona(W, H)
+        for j, w in enumerate(wiersze[start:start + na_strone]):
+            if w: p.tekst(x, y0 - j * krok, w, 10, "mono")
+        p.koniec_strony()
+
+
+# ======================================================
+# DOKUMENT PDF / SVG
+# ======================================================
+
+@mierzony("pdf")
+def zbuduj_pdf(lista_elementow, tekst_instrukcji, plik, postep=None):
+    """
+    Pełna dokumentacja (rysunek + tabela wierceń każdego elementu, na końcu
+    instrukcja) do pliku (ścieżka) lub strumienia `plik` – jeden przebieg, bez
+    procesów roboczych; każda strona zapisywana zaraz po narysowaniu.
+    Identyczne formatki (te same wymiary, wiercenia, orientacja – np.
+    powtarzalne półki, dna szuflad) rysowane są raz: strona to wspólna forma
+    PDF z rysunkiem i własny nagłówek (nazwa + ID).
+    postep(gotowe, wszystkie) – wywoływane po każdym elemencie.
+    """
+    p = PlotnoPDF(plik); n = len(lista_elementow)
+    for i, el in enumerate(lista_elementow):
+        rozmiar = A4_POZIOM if el['Szerokość [mm]'] > el['Wysokość [mm]'] else A4_PION
+        rysuj_element(p, el['Szerokość [mm]'], el['Wysokość [mm]'], el['ID'], el['Nazwa'], el['wiercenia'], el['orientacja'], rozmiar, klucz=klucz_rysunku(el))
+        if len(el['wiercenia']): rysuj_tabele(p, el['ID'], el['Nazwa'], el['wiercenia'], klucz=klucz_tabeli(el))
+        if postep: postep(i + 1, n)
+    rysuj_instrukcje(p, tekst_instrukcji)
+    p.zamknij()
+    licznik("pdf.strony", p.strony); licznik("pdf.rysunki_powtorzone", p.powtorzone)
+
+
+def klucz_pdf(lista_elementow, tekst_instrukcji):
+    """Klucz dokumentu zbuduj_pdf w cache.dysk: wersja rysunków, zawartość listy i instrukcji."""
+    return ("pdf", WERSJA, lista_elementow.skrot(), hashlib.sha256(tekst_instrukcji.encode("utf-8")).hexdigest())
+
+
+@mierzony("rysunek.svg")
+def element_svg(el, rozmiar=PODGLAD):
+    """Rysunek formatki (z nagłówkiem) jako tekst SVG – podgląd w aplikacji."""
+    p = PlotnoSVG()
+    rysuj_element(p, el['Szerokość [mm]'], el['Wysokość [mm]'], el['ID'], el['Nazwa'], el['wiercenia'], el['orientacja'], rozmiar)
+    return p.strony[0]
+
+
+# ======================================================
+# WIZUALIZACJA MEBLA (SVG)
+# ======================================================
+# Podgląd z zakładki WIZUALIZACJA bez Matplotlib: warstwa korpusu (boki, wieńce,
+# przegrody) zależy tylko od wymiarów, a fragment sekcji – od jej modułów i
+# wymiarów wnęki. Obie pamiętane (lru_cache), więc po zmianie modułów jednej
+# sekcji składany jest tylko jej fragment; reszta to sklejenie gotowych tekstów.
+# Fragment sekcji rysowany od x=0 i przesuwany (translate) – te same moduły
+# w kilku sekcjach to jeden wpis w pamięci. Współrzędne fragmentów w mm, oś Y
+# w dół (y_svg = h - y); grubość linii i kreski dziedziczone z grupy nadrzędnej,
+# przeliczone ze skali rysunku – fragmenty od skali nie zależą.
+
+WIZUALIZACJA = (12 * 72, 8 * 72)   # figsize=(12, 8) [pt] – rysunek wpisany w ten prostokąt (bbox_inches='tight')
+PASEK_TYTULU = 40                  # [pt]
+KOLOR_PLYTY = "#d7ba9d"
+KOLOR_POLKI = "#8B4513"
+
+
+def _prostokat_mm(h, x, y, w, wys, styl):
+    return f'<rect x="{x:.1f}" y="{h - y - wys:.1f}" width="{w:.1f}" height="{wys:.1f}" {styl}/>'
+
+
+@lru_cache(maxsize=64)
+def _warstwa_korpusu(w, h, gr, n_p, sw, tk):
+    """Boki, wieńce i przegrody (jak rysuj_podglad_mebla) – tekst SVG."""
+    if "Wpuszczane" in tk: r = [(0, 0, gr, h), (w-gr, 0, gr, h), (gr, h-gr, w-2*gr, gr), (gr, 0, w-2*gr, gr)]
+    else: r = [(0, 0, w, gr), (0, h-gr, w, gr), (0, gr, gr, h-2*gr), (w-gr, gr, gr, h-2*gr)]
+    el = [_prostokat_mm(h, *p, f'fill="{KOLOR_PLYTY}" stroke="#000000"') for p in r]
+    el += [_prostokat_mm(h, gr + i*(sw+gr) + sw, gr, gr, h-2*gr, 'fill="#808080" fill-opacity="0.5"') for i in range(n_p)]
+    return "".join(el)
+
+
+@lru_cache(maxsize=256)
+def _warstwa_sekcji(h, gr, sw, moduly_json):
+    """Moduły jednej sekcji od x=0: (wieńce środkowe i półki, obrysy modułów – linią przerywaną) jako tekst SVG."""
+    m_list = json.loads(moduly_json); plyty = []; ramki = []
+    ha = (h-2*gr - sum(m['wys_mm'] for m in m_list if m['wys_mode'] == 'fixed')) / max(1, sum(1 for m in m_list if m['wys_mode'] == 'auto'))
+    cy = gr
+    for idx, m in enumerate(m_list):
+        if idx > 0: plyty.append(_prostokat_mm(h, 0, cy, sw, gr, f'fill="{KOLOR_PLYTY}" stroke="#000000"')); cy += gr
+        hm = m['wys_mm'] if m['wys_mode'] == 'fixed' else ha
+        if m['typ'] == "Półki":
+            n = m['detale'].get('ilosc'); g = hm/(n+1)
+            plyty += [_prostokat_mm(h, 0, cy+(k+1)*g, sw, gr, f'fill="{KOLOR_POLKI}"') for k in range(n)]
+        ramki.append(_prostokat_mm(h, 0, cy, sw, hm, 'fill="none" stroke="#000000"')); cy += hm
+    return "".join(plyty), "".join(ramki)
+
+
+@mierzony("rysunek.wizualizacja_svg")
+def podglad_mebla_svg(w, h, gr, n_p, ms, sw, tk):
+    """
+    Podgląd mebla (zakładka WIZUALIZACJA) jako tekst SVG – te same argumenty
+    i ten sam rysunek co rysunki.rysuj_podglad_mebla.
+    """
+    skala = min(WIZUALIZACJA[0] / (w + 200), (WIZUALIZACJA[1] - PASEK_TYTULU) / (h + 200))   # pt/mm, jak aspect='equal'
+    W = (w + 200) * skala; H = (h + 200) * skala + PASEK_TYTULU
+    plyty = []; ramki = []
+    for i in range(n_p + 1):
+        p, r = _warstwa_sekcji(h, gr, sw, json.dumps(ms.get(i, []), sort_keys=True))
+        przes = f'<g transform="translate({gr + i*(sw+gr):.1f} 0)">'
+        plyty.append(przes + p + "</g>"); ramki.append(przes + r + "</g>")
+    rodzina, _ = RODZINY_SVG["sans_b"]
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{W:.1f}pt" height="{H:.1f}pt" viewBox="0 0 {W:.1f} {H:.1f}">'
+            f'<rect width="100%" height="100%" fill="#ffffff"/>'
+            f'<text x="{W/2:.1f}" y="{PASEK_TYTULU - 12}" text-anchor="middle" font-family={quoteattr(rodzina)} font-weight="bold" font-size="18">WIZUALIZACJA</text>'
+            f'<g transform="translate({100*skala:.2f} {PASEK_TYTULU + 100*skala:.2f}) scale({skala:.5f})" stroke-width="{1/skala:.2f}">'
+            f'{_warstwa_korpusu(w, h, gr, n_p, sw, tk)}{"".join(plyty)}'
+            f'<g stroke-opacity="0.3" stroke-dasharray="{1/skala:.2f} {1.65/skala:.2f}">{"".join(ramki)}</g></g></svg>')
@@ -0,0 +1,86 @@
+# wiercenia.py
+# Tablice otworów (NumPy) dla STOLARZPRO
+
+import numpy as np
+
+from constants import FI_OTWOROW, GL_OTWOROW
+
+
+# Jeden otwór: współrzędne na formatce [mm], typ ('blue' konfirmat,
+# 'red' prowadnica, 'green' podpórka/zawias), średnica i głębokość [mm]
+OTWOR_DTYPE = np.dtype([('x', 'f8'), ('y', 'f8'), ('typ', 'U5'), ('fi', 'f4'), ('gl', 'f4')])
+
+BRAK_OTWOROW = np.empty(0, dtype=OTWOR_DTYPE)
+BRAK_OTWOROW.flags.writeable = False
+
+
+# Kody typów dla obliczeń wektorowych: 0 'blue', 1 'red', 2 'green'
+TYPY = np.array(list(FI_OTWOROW), dtype='U5')
+FI_TYPOW = np.array(list(FI_OTWOROW.values()), dtype='f4')
+GL_TYPOW = np.array([GL_OTWOROW[t] for t in FI_OTWOROW], dtype='f4')
+
+
+def _kolejnosc(x, y, grupa=None):
+    """Indeksy porządku po Y, X (stabilnie), a najpierw po grupie, jeśli podano."""
+    if grupa is None: return np.lexsort((x, y))
+    if not y.size: return np.empty(0, dtype='i8')
+    # Grupa i Y w jednym kluczu (przedziały Y grup się nie nakładają) – dwa klucze zamiast trzech
+    y0 = y.min(); return np.lexsort((x, grupa * (y.max() - y0 + 1.0) + (y - y0)))
+
+
+def z_kodow(x, y, kod, grupa=None, gl=None):
+    """
+    Tablica otworów z wektorów x, y i kodów typu, od razu posortowana po Y, X
+    (a najpierw po numerze grupy, np. płyty, jeśli podano). Głębokość gl
+    (wektor) – domyślnie wg typu z GL_OTWOROW.
+    """
+    kolej = _kolejnosc(x, y, grupa); kod = kod[kolej]
+    o = np.empty(kolej.size, dtype=OTWOR_DTYPE)
+    o['x'] = x[kolej]; o['y'] = y[kolej]; o['typ'] = TYPY[kod]; o['fi'] = FI_TYPOW[kod]
+    o['gl'] = GL_TYPOW[kod] if gl is None else gl[kolej]
+    return o
+
+
+def z_wzorow(wzory, kod, y, grupa=None):
+    """
+    Jak z_kodow, ale X, typ, średnica i głębokość z gotowej tablicy wzorów
+    (OTWOR_DTYPE) wg kodu – jedno pobranie rekordów zamiast osobnych pól.
+    """
+    kolej = _kolejnosc(wzory['x'][kod], y, grupa)
+    o = wzory[kod[kolej]]; o['y'] = y[kolej]
+    return o
+
+
+def otwory(x, y, typ):
+    """Tablica otworów z wektorów x, y (typ – jeden dla wszystkich albo wektor)."""
+    x = np.asarray(x, dtype='f8'); y = np.asarray(y, dtype='f8')
+    x, y, typ = np.broadcast_arrays(x, y, np.asarray(typ, dtype='U5'))
+    o = np.empty(x.shape[0], dtype=OTWOR_DTYPE)
+    o['x'] = x; o['y'] = y; o['typ'] = typ
+    o['fi'] = 0.0; o['gl'] = 0.0
+    for t, fi in FI_OTWOROW.items():
+        m = o['typ'] == t; o['fi'][m] = fi; o['gl'][m] = GL_OTWOROW[t]
+    return o
+
+
+def jako_otwory(o):
+    """Przyjmuje tablicę OTWOR_DTYPE albo listę krotek (x, y, typ) ze starszego kodu."""
+    if isinstance(o, np.ndarray) and o.dtype == OTWOR_DTYPE: return o
+    if len(o) == 0: return BRAK_OTWOROW
+    x, y, typ = zip(*((r[0], r[1], r[2] if len(r) > 2 else 'red') for r in o))
+    return otwory(x, y, list(typ))
+
+
+def sortuj(o):
+    """Kolejność numeracji na rysunkach i w tabelach: po Y, potem po X (stabilnie)."""
+    return o[np.lexsort((o['x'], o['y']))]
+
+
+def polacz(*tablice):
+    """Łączy otwory kilku wzorców (np. przegroda z dwóch sekcji) w jedną posortowaną tablicę."""
+    return sortuj(np.concatenate(tablice))
+
+
+def linie(o):
+    """Unikalne współrzędne X i Y (linie trasowania), rosnąco."""
+    return np.unique(o['x']), np.unique(o['y'])
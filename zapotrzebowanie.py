@@ -0,0 +1,117 @@
+# zapotrzebowanie.py
+# Zapotrzebowanie materiałowe wielu projektów (lista zakupów) dla STOLARZPRO
+#
+#   python batch.py miesiac.jsonl --zapotrzebowanie  -> zapotrzebowanie.csv dla całego wsadu
+#
+# Na materiał (np. '18mm KORPUS', '3mm HDF'): liczba formatek, pole formatek,
+# arkusze z rozkroju (nowe, bez resztek z magazynu) i metry bieżące okleiny
+# krawędzi tych formatek; do tego okucia (konfirmaty, wkręty, prowadnice,
+# zawiasy) z generator.okucia. Sumy liczone kolumnowo: kody materiałów listy
+# elementów -> np.bincount, okucia – macierz projekty x pozycje. Częściowe
+# wyniki (np. z procesów roboczych batch.py) łączy Zapotrzebowanie.dolacz.
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from elementy import ListaElementow
+from kosztorys import POZYCJE, mb_okleiny
+from zlecenie import rozkroj_zlecenia
+
+
+# Kolumny na materiał (kolejność wektora w Zapotrzebowanie.materialy)
+KOLUMNY_MATERIALU = ("formatki", "plyta_m2", "arkusze", "arkusze_m2", "okleina_mb")
+OKUCIA = tuple(p[:3] for p in POZYCJE[4:])   # (klucz, nazwa, jednostka)
+KOLUMNY_CSV = ("pozycja", "material", "ilosc", "jedn")
+
+
+@dataclass
+class Zapotrzebowanie:
+    projekty: int = 0
+    materialy: dict = field(default_factory=dict)   # materiał -> wektor KOLUMNY_MATERIALU
+    okucia: np.ndarray = field(default_factory=lambda: np.zeros(len(OKUCIA)))
+
+    def dolacz(self, inne):
+        """Dodaje inne zapotrzebowanie (np. kolejny projekt wsadu) do tego."""
+        self.projekty += inne.projekty
+        for m, v in inne.materialy.items():
+            if m in self.materialy: self.materialy[m] = self.materialy[m] + v
+            else: self.materialy[m] = v.copy()
+        self.okucia = self.okucia + inne.okucia
+        return self
+
+    def tabela_materialow(self):
+        """Wiersz na materiał (do st.dataframe / CSV), w kolejności nazw."""
+        return [{"Materiał": m, "Formatki": int(v[0]), "Formatki [m2]": round(v[1], 3), "Arkusze": int(v[2]),
+                 "Arkusze [m2]": round(v[3], 3), "Okleina [mb]": round(v[4], 2)} for m, v in sorted(self.materialy.items())]
+
+    def wiersze(self):
+        """Płaska lista zakupów (KOLUMNY_CSV): płyta w m2 i arkuszach, okleina wg materiału, okucia."""
+        wynik = []
+        for m, v in sorted(self.materialy.items()):
+            wynik += [{"pozycja": "Płyta", "material": m, "ilosc": round(v[1], 3), "jedn": "m2"},
+                      {"pozycja": "Arkusze", "material": m, "ilosc": int(v[2]), "jedn": "szt"}]
+            if v[4]: wynik.append({"pozycja": "Okleina", "material": m, "ilosc": round(v[4], 2), "jedn": "mb"})
+        wynik += [{"pozycja": nazwa, "material": "", "ilosc": int(q), "jedn": jedn} for (_, nazwa, jedn), q in zip(OKUCIA, self.okucia)]
+        return wynik
+
+
+# ======================================================
+# AGREGACJA
+# ======================================================
+
+def _wg_materialu(lista):
+    """Formatki, pole [m2] i okleina [mb] na materiał listy: macierz (materiały x 3) z np.bincount po kodach."""
+    n = len(lista.material.wartosci)
+    if not len(lista): return np.zeros((n, 3))
+    kody = np.frombuffer(lista.material.kody, dtype=lista.material.kody.typecode)
+    pole = np.frombuffer(lista.szer, dtype='i4').astype('f8') * np.frombuffer(lista.wys, dtype='i4') / 1e6
+    return np.column_stack([np.bincount(kody, minlength=n), np.bincount(kody, weights=pole, minlength=n),
+                            np.bincount(kody, weights=mb_okleiny(lista), minlength=n)])
+
+
+def _okucia(lista_okuc):
+    """Suma okuć projektów: macierz (projekty x OKUCIA) zsumowana po wierszach."""
+    q = np.array([[o.get(k, 0) for k, *_ in OKUCIA] for o in lista_okuc], dtype='f8').reshape(-1, len(OKUCIA))
+    return q.sum(axis=0)
+
+
+def _arkusze(rozkroje):
+    """Materiał -> (nowe arkusze, ich pole [m2])."""
+    return {m: (len(w.kupione), sum(a.w * a.h for a in w.kupione) / 1e6) for m, w in rozkroje.items()}
+
+
+def zapotrzebowanie_listy(lista, okucia_szt, rozkroje=None, **opcje):
+    """
+    Zapotrzebowanie jednego projektu lub zlecenia. rozkroje – gotowy wynik
+    rozkroj_zlecenia (np. z kosztorysu, także z magazynem resztek); brak – liczony
+    tu (opcje jak w nesting.rozkroj).
+    """
+    if rozkroje is None: rozkroje = rozkroj_zlecenia(lista, **opcje)
+    return _zloz(lista, _arkusze(rozkroje), _okucia([okucia_szt]), 1)
+
+
+def zapotrzebowanie(listy, lista_okuc, wspolny=False, **opcje):
+    """
+    Zapotrzebowanie wielu projektów (listy elementów i ich okucia w tej samej
+    kolejności). Pola i okleina – jedno przejście po połączonej liście. Arkusze:
+    każdy projekt rozkrawany osobno (jak w warsztacie), wspolny=True – wszystkie
+    formatki materiału na wspólnych arkuszach (dolna granica zakupu).
+    """
+    lista = ListaElementow.polacz(listy)
+    if wspolny:
+        arkusze = _arkusze(rozkroj_zlecenia(lista, **opcje))
+    else:
+        arkusze = {}
+        for l in listy:
+            for m, (n, pole) in _arkusze(rozkroj_zlecenia(l, **opcje)).items():
+                n0, pole0 = arkusze.get(m, (0, 0.0)); arkusze[m] = (n0 + n, pole0 + pole)
+    return _zloz(lista, arkusze, _okucia(lista_okuc), len(listy))
+
+
+def _zloz(lista, arkusze, okucia_suma, projekty):
+    materialy = {}
+    for m, (n, pole, mb) in zip(lista.material.wartosci, _wg_materialu(lista)):
+        n_ark, pole_ark = arkusze.get(m, (0, 0.0))
+        materialy[m] = np.array([n, pole, n_ark, pole_ark, mb])
+    return Zapotrzebowanie(projekty, materialy, okucia_suma)
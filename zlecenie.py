@@ -0,0 +1,148 @@
+# zlecenie.py
+# Zlecenie z wieloma szafkami (np. kuchnia): wspólna lista elementów, rozkrój i koszt dla STOLARZPRO
+#
+# Format JSON zlecenia:
+#   {"kod_zlecenia": "KUCHNIA", "ceny": {...}, "szafki": [projekt, projekt, ...]}
+# gdzie projekt to specyfikacja jednej szafki w formacie export_project_to_json.
+# Kod szafki (kod_pro) jest prefiksem ID jej elementów, więc w zleceniu
+# kody są unikalne. Rozkrój liczony jest dla całego zlecenia naraz – formatki
+# różnych szafek dzielą arkusze tego samego materiału.
+
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import hash_projektu
+from elementy import ListaElementow
+from generator import DOMYSLNY_PROJEKT, generuj_instrukcje_tekst, normalizuj_projekt, okucia, run_generator_wsadowo
+from kosztorys import okleina_materialow, rodzaj_materialu, suma_okuc
+from nesting import formatki_listy, rozkroj
+from pomiary import mierzony
+
+
+# Poniżej tylu szafek generowanie w jednym procesie (wektorowo) jest szybsze niż start puli
+PROG_PULI = 1000
+
+
+# ======================================================
+# SPECYFIKACJA ZLECENIA
+# ======================================================
+
+def jest_zleceniem(data):
+    return isinstance(data, dict) and 'szafki' in data
+
+
+def _kod(tekst):
+    return str(tekst).upper().replace(" ", "_")
+
+
+def normalizuj_zlecenie(data):
+    """
+    Zwraca kompletne zlecenie; pojedynczy projekt -> zlecenie z jedną szafką.
+    Ceny są wspólne dla zlecenia. Powtórzone kody szafek dostają sufiks _2, _3...
+    """
+    if not jest_zleceniem(data): data = {'kod_zlecenia': data.get('kod_pro'), 'ceny': data.get('ceny'), 'szafki': [data]}
+    ceny = {**DOMYSLNY_PROJEKT['ceny'], **(data.get('ceny') or {})}
+    szafki = []; uzyte = set()
+    for s in data['szafki']:
+        p = normalizuj_projekt(s); kod = p['kod_pro']; n = 1
+        while _kod(p['kod_pro']) in uzyte: n += 1; p['kod_pro'] = f"{kod}_{n}"
+        uzyte.add(_kod(p['kod_pro'])); p['ceny'] = ceny
+        szafki.append(p)
+    return {'kod_zlecenia': data.get('kod_zlecenia') or "ZLECENIE", 'ceny': ceny, 'szafki': szafki}
+
+
+def hash_zlecenia(zlecenie):
+    """Skrót geometrii wszystkich szafek (w kolejności zlecenia)."""
+    return hashlib.sha256("".join(hash_projektu(p) for p in zlecenie['szafki']).encode("ascii")).hexdigest()
+
+
+# ======================================================
+# LISTA ELEMENTÓW
+# ======================================================
+
+@mierzony("zlecenie.generacja")
+def generuj_szafki(zlecenie, procesy=1):
+    """
+    Listy elementów szafek w kolejności zlecenia. Wiercenia wszystkich szafek
+    liczone jednym przebiegiem (run_generator_wsadowo); duże zlecenia
+    dzielone są na części liczone w puli procesów (procesy=None: wszystkie rdzenie).
+    """
+    szafki = zlecenie['szafki']
+    procesy = procesy or os.cpu_count() or 1
+    if procesy == 1 or len(szafki) < PROG_PULI: return run_generator_wsadowo(szafki)
+    rozmiar = -(-len(szafki) // procesy)
+    czesci = [szafki[i:i + rozmiar] for i in range(0, len(szafki), rozmiar)]
+    # spawn: bezpieczne także z wątkami serwera Streamlit
+    with ProcessPoolExecutor(max_workers=procesy, mp_context=multiprocessing.get_context("spawn")) as pula:
+        return [lista for czesc in pula.map(run_generator_wsadowo, czesci) for lista in czesc]
+
+
+def lista_zlecenia(zlecenie, listy=None, procesy=1):
+    """Wspólna lista elementów zlecenia (ID z prefiksem kodu szafki)."""
+    return ListaElementow.polacz(listy if listy is not None else generuj_szafki(zlecenie, procesy))
+
+
+def okucia_zlecenia(zlecenie):
+    return suma_okuc(okucia(p) for p in zlecenie['szafki'])
+
+
+def instrukcja_zlecenia(zlecenie):
+    return "\n\n".join(generuj_instrukcje_tekst(p) for p in zlecenie['szafki'])
+
+
+# ======================================================
+# ROZKRÓJ I KOSZT
+# ======================================================
+
+def materialy(lista):
+    """Materiały płytowe listy (np. '18mm KORPUS', '3mm HDF') – każdy rozkrawany osobno."""
+    return sorted(set(lista.material.wartosci))
+
+
+def grubosc_materialu(lista, material):
+    """Grubość [mm] pierwszej formatki materiału (0 – brak formatek)."""
+    nr = lista.numery("material", material)
+    return float(lista.gr[int(nr[0])]) if len(nr) else 0.0
+
+
+@mierzony("zlecenie.rozkroj")
+def rozkroj_zlecenia(lista, material=None, magazyn=None, zrodlo="", **opcje):
+    """
+    Rozkrój całego zlecenia: materiał -> WynikRozkroju (opcje jak w nesting.rozkroj).
+    magazyn – MagazynResztek: najpierw resztki, odpady wracają do magazynu (magazyn.py).
+    """
+    wynik = {}
+    for m in ([material] if material else materialy(lista)):
+        if magazyn is None: wynik[m] = rozkroj(formatki_listy(lista, m), **opcje)
+        else:
+            from magazyn import rozkroj_z_magazynu
+            wynik[m] = rozkroj_z_magazynu(magazyn, formatki_listy(lista, m), m, grubosc_materialu(lista, m), zrodlo, **opcje)
+    return wynik
+
+
+def arkusze_osobno(listy, material, **opcje):
+    """Liczba arkuszy, gdy każda szafka rozkrawana jest osobno (do porównania z rozkrojem wspólnym)."""
+    return sum(rozkroj(formatki_listy(l, material), **opcje).liczba_arkuszy for l in listy)
+
+
+def cena_materialu(material, ceny):
+    """Cena płyty [zł/m2] z cennika projektu wg rodzaju materiału."""
+    return ceny[rodzaj_materialu(material)]
+
+
+def kosztorys_zlecenia(lista, rozkroje, ceny):
+    """
+    Wiersz na materiał: pole formatek, zużyte arkusze (nowe kupowane w całości;
+    resztki z magazynu – osobno, bez kosztu), uzysk, okleina i koszt płyty.
+    """
+    wiersze = []; okleina = okleina_materialow(lista)
+    for m, wynik in rozkroje.items():
+        pole_ark = sum(a.w * a.h for a in wynik.kupione) / 1e6
+        wiersze.append({"Materiał": m, "Formatki [m2]": round(lista.pole_m2(m), 3), "Arkusze": len(wynik.kupione),
+                        "Resztki": wynik.liczba_arkuszy - len(wynik.kupione),
+                        "Arkusze [m2]": round(pole_ark, 3), "Uzysk [%]": round(wynik.uzysk, 1),
+                        "Okleina [mb]": round(okleina.get(m, 0.0), 2),
+                        "Koszt [zł]": round(pole_ark * cena_materialu(m, ceny), 2)})
+    return wiersze